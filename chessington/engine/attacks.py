@@ -0,0 +1,130 @@
+"""
+Attack maps kept up to date as pieces are placed and removed, so that whether a square is attacked, and by what,
+can be answered without generating any moves. For every square the map holds the squares attacked by the piece
+standing there, the squares of the pieces attacking it, and how many pieces of each player attack it.
+
+Placing or removing a piece only changes its own attacks and those of the sliding pieces whose lines pass through
+its square, and for those only the part of the line beyond the square is looked at again.
+"""
+
+from chessington.engine.data import Player, BOARD_SIZE
+from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King
+from chessington.engine.tables import RAYS, ORTHOGONAL_STEPS, DIAGONAL_STEPS, KNIGHT_TARGETS, KING_TARGETS, \
+    PAWN_CAPTURES
+
+SQUARE_COUNT = BOARD_SIZE * BOARD_SIZE
+
+# The lines each sliding piece attacks along, as tuples of square indices outwards from each square
+SLIDER_LINES = {
+    piece_type: [tuple(tuple(square.index for square in RAYS[step][index]) for step in steps)
+                 for index in range(SQUARE_COUNT)]
+    for piece_type, steps in ((Rook, ORTHOGONAL_STEPS), (Bishop, DIAGONAL_STEPS),
+                              (Queen, ORTHOGONAL_STEPS + DIAGONAL_STEPS))
+}
+
+# The squares a pawn, knight or king attacks, which do not depend on the other pieces
+FIXED_TARGETS = {
+    Knight: [tuple(square.index for square in targets) for targets in KNIGHT_TARGETS],
+    King: [tuple(square.index for square in targets) for targets in KING_TARGETS],
+}
+PAWN_TARGETS = {player: [tuple(square.index for square in targets) for targets in PAWN_CAPTURES[player]]
+                for player in Player}
+
+# For a square on a line from an origin, the squares further along that line, by the indices of the two squares
+BEYOND = [dict() for _ in range(SQUARE_COUNT)]
+for _origin in range(SQUARE_COUNT):
+    for _line in SLIDER_LINES[Queen][_origin]:
+        for _position, _index in enumerate(_line):
+            BEYOND[_origin][_index] = _line[_position + 1:]
+
+
+class AttackMap:
+    """
+    The attacks of every piece on a board. The board tells the map about each piece placed or removed, after
+    making the change to its squares.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.targets = [None] * SQUARE_COUNT
+        self.attackers = [set() for _ in range(SQUARE_COUNT)]
+        self.counts = {player: [0] * SQUARE_COUNT for player in Player}
+        for player in Player:
+            for piece in board.get_pieces(player):
+                self._add_attacks(piece, board.find_piece(piece).index)
+
+    def copy(self, board):
+        """
+        A copy of the map for a board that has been sharing it with a fork.
+        """
+        fork = AttackMap.__new__(AttackMap)
+        fork.board = board
+        fork.targets = [set(targets) if targets is not None else None for targets in self.targets]
+        fork.attackers = [set(attackers) for attackers in self.attackers]
+        fork.counts = {player: list(counts) for player, counts in self.counts.items()}
+        return fork
+
+    def placed(self, piece, index):
+        # The new piece blocks the lines of any sliding piece attacking its square
+        for origin in self.attackers[index]:
+            if self._is_slider(origin):
+                for target in BEYOND[origin][index]:
+                    self._drop(origin, target)
+                    if self._occupied(target):
+                        break
+        self._add_attacks(piece, index)
+
+    def removed(self, piece, index):
+        self._remove_attacks(piece, index)
+        # Any sliding piece attacking the square now sees past it
+        for origin in self.attackers[index]:
+            if self._is_slider(origin):
+                for target in BEYOND[origin][index]:
+                    self._attack(origin, target)
+                    if self._occupied(target):
+                        break
+
+    def _add_attacks(self, piece, index):
+        self.targets[index] = set()
+        piece_type = type(piece)
+        if piece_type is Pawn:
+            targets = PAWN_TARGETS[piece.player][index]
+        elif piece_type in FIXED_TARGETS:
+            targets = FIXED_TARGETS[piece_type][index]
+        else:
+            targets = []
+            for line in SLIDER_LINES[piece_type][index]:
+                for target in line:
+                    targets.append(target)
+                    if self._occupied(target):
+                        break
+        for target in targets:
+            self._attack(index, target, piece.player)
+
+    def _remove_attacks(self, piece, index):
+        counts = self.counts[piece.player]
+        for target in self.targets[index]:
+            self.attackers[target].discard(index)
+            counts[target] -= 1
+        self.targets[index] = None
+
+    def _attack(self, origin, target, player=None):
+        player = player or self._piece(origin).player
+        self.targets[origin].add(target)
+        self.attackers[target].add(origin)
+        self.counts[player][target] += 1
+
+    def _drop(self, origin, target):
+        self.targets[origin].discard(target)
+        self.attackers[target].discard(origin)
+        self.counts[self._piece(origin).player][target] -= 1
+
+    def _piece(self, index):
+        return self.board.board[index // BOARD_SIZE][index % BOARD_SIZE]
+
+    def _occupied(self, index):
+        return self.board.board[index // BOARD_SIZE][index % BOARD_SIZE] is not None
+
+    def _is_slider(self, index):
+        return type(self._piece(index)) in SLIDER_LINES
+
@@ -0,0 +1,99 @@
+"""
+Working out moves in the background, away from a GUI's event loop. Calculations run in a separate process and the
+caller polls for their results between events, so a window keeps responding while the computer thinks.
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from chessington.engine import tablebase
+from chessington.engine.book import open_book
+from chessington.engine.search import search
+
+
+def legal_destinations(board, square):
+    """
+    The squares the piece on the given square can legally move to.
+    """
+    return sorted({move.to_square for move in board.legal_moves() if move.from_square == square})
+
+
+def best_move(board, think_time, book_path=None, stop_event=None):
+    """
+    The move the engine chooses after thinking for the given number of seconds, or less if the stop event is set.
+    If an opening book is given and has the position, a move from the book is played straight away instead, as is
+    the endgame tablebase's move in the endings it covers. A book that cannot be read is ignored, and the move
+    searched for as usual.
+    """
+    if book_path is not None:
+        try:
+            move = open_book(book_path).choose(board)
+        except OSError:
+            move = None
+        if move is not None:
+            return move
+    move = tablebase.best_move(board)
+    if move is not None:
+        return move
+    return search(board, time_limit=think_time, stop_event=stop_event).best_move
+
+
+class BackgroundWorker:
+    """
+    Runs one job at a time in the background. Submitting a new job cancels the previous one if it has not started,
+    and its result is thrown away if it has, so only the latest job's result is ever returned. A job that has
+    started can only be cut short if it was submitted as stoppable, in which case it is passed a stop_event that
+    is set when it is cancelled.
+    """
+
+    def __init__(self, executor=None):
+        self._executor = executor if executor is not None else ProcessPoolExecutor(max_workers=1)
+        self._manager = None
+        self._kind = None
+        self._future = None
+        self._stop_event = None
+
+    @property
+    def busy_with(self):
+        """
+        The kind of job currently in progress, or None.
+        """
+        return self._kind
+
+    def submit(self, kind, function, *args, stoppable=False):
+        """
+        Starts calling the function with the given arguments, tagging the job with the given kind.
+        """
+        self.cancel()
+        self._kind = kind
+        if stoppable:
+            # The worker process can only see an event shared through a manager
+            if self._manager is None:
+                self._manager = multiprocessing.Manager()
+            self._stop_event = self._manager.Event()
+            self._future = self._executor.submit(function, *args, stop_event=self._stop_event)
+        else:
+            self._future = self._executor.submit(function, *args)
+
+    def cancel(self):
+        if self._future is not None:
+            self._future.cancel()
+        if self._stop_event is not None:
+            self._stop_event.set()
+        self._kind, self._future, self._stop_event = None, None, None
+
+    def poll(self):
+        """
+        The kind and result of the current job if it has finished, or None if it is still going or there is no job.
+        """
+        if self._future is None or not self._future.done():
+            return None
+        kind, future = self._kind, self._future
+        self._kind, self._future, self._stop_event = None, None, None
+        return kind, future.result()
+
+    def shutdown(self):
+        self.cancel()
+        self._executor.shutdown(wait=False)
+        if self._manager is not None:
+            self._manager.shutdown()
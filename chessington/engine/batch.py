@@ -0,0 +1,176 @@
+"""
+Evaluating many positions at once with NumPy. Positions are turned into bit planes, an array of shape (N, 12, 64)
+holding a 1 wherever each of the twelve kinds of piece stands, and every score is then worked out for the whole
+batch with array operations instead of a loop over each board's pieces.
+
+The planes are in the order of encoding.PIECE_CODES (white's pawns, knights, bishops, rooks, queen and king, then
+black's), and each plane is indexed by square.index. NumPy is an optional dependency, installed with the
+'analysis' extra.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from chessington.engine.data import Player, BOARD_SIZE
+from chessington.engine.encoding import PIECE_CODES, POSITION_BYTES, MAX_PIECES
+from chessington.engine.evaluation import PIECE_VALUES, PIECE_SQUARE_TABLES
+from chessington.engine.pieces import Knight, Bishop, Rook, Queen, King
+from chessington.engine.tables import ORTHOGONAL_STEPS, DIAGONAL_STEPS, KNIGHT_JUMPS
+
+PLANE_COUNT = len(PIECE_CODES)
+SQUARE_COUNT = BOARD_SIZE * BOARD_SIZE
+
+# Centipawns for each move a piece could make, in the mobility score
+MOBILITY_WEIGHT = 4
+
+# The value of a piece of each plane on each square, counted for white and against black
+_SIGNS = {Player.WHITE: 1, Player.BLACK: -1}
+MATERIAL_VALUES = np.zeros(PLANE_COUNT, dtype=np.int32)
+PIECE_SQUARE_VALUES = np.zeros((PLANE_COUNT, SQUARE_COUNT), dtype=np.int32)
+for (_player, _piece_type), _plane in PIECE_CODES.items():
+    _table = np.array(PIECE_SQUARE_TABLES[_piece_type], dtype=np.int32)
+    if _player == Player.BLACK:
+        # Black's tables are white's with the rows reversed
+        _table = _table[np.arange(SQUARE_COUNT) ^ 56]
+    MATERIAL_VALUES[_plane] = _SIGNS[_player] * PIECE_VALUES[_piece_type]
+    PIECE_SQUARE_VALUES[_plane] = _SIGNS[_player] * _table
+
+# The scores of a batch of positions, each an array with one score per position, from the point of view of the
+# player whose turn it is. Material plus piece-square is the same as evaluation.evaluate gives
+BatchScores = namedtuple('BatchScores', 'material piece_square mobility total')
+
+
+def to_planes(boards):
+    """
+    The bit planes of the boards, as an array of shape (N, 12, 64).
+    """
+    boards = list(boards)
+    positions, planes, squares = [], [], []
+    for position, board in enumerate(boards):
+        for player in Player:
+            for piece in board.get_pieces(player):
+                positions.append(position)
+                planes.append(PIECE_CODES[(player, type(piece))])
+                squares.append(board.find_piece(piece).index)
+    result = np.zeros((len(boards), PLANE_COUNT, SQUARE_COUNT), dtype=np.uint8)
+    result[positions, planes, squares] = 1
+    return result
+
+
+def white_to_move(boards):
+    """
+    Whether it is white's turn in each of the boards, as an array of booleans.
+    """
+    return np.array([board.current_player == Player.WHITE for board in boards], dtype=bool)
+
+
+def planes_from_encoded(data):
+    """
+    The bit planes, and whose turn it is, for positions packed back to back by encoding.encode_all, without
+    making a board for any of them.
+    """
+    if len(data) % POSITION_BYTES:
+        raise ValueError('Data is not a whole number of positions')
+    records = np.frombuffer(data, dtype=np.uint8).reshape(-1, POSITION_BYTES)
+
+    # The occupancy is a big-endian 64-bit integer whose bit square.index is set for each occupied square
+    occupied = np.unpackbits(records[:, 7::-1], axis=1, bitorder='little').astype(bool)
+    nibbles = np.empty((len(records), MAX_PIECES), dtype=np.uint8)
+    nibbles[:, 0::2] = records[:, 8:24] >> 4
+    nibbles[:, 1::2] = records[:, 8:24] & 15
+
+    # The pieces are listed in order of square, so each occupied square's piece is the next one along
+    piece_numbers = np.cumsum(occupied, axis=1) - 1
+    codes = np.take_along_axis(nibbles, np.clip(piece_numbers, 0, MAX_PIECES - 1), axis=1)
+    positions, squares = np.nonzero(occupied)
+    planes = np.zeros((len(records), PLANE_COUNT, SQUARE_COUNT), dtype=np.uint8)
+    planes[positions, codes[positions, squares], squares] = 1
+    return planes, (records[:, 24] & 1) == 0
+
+
+def material(planes):
+    """
+    The material balance of each position, from white's point of view.
+    """
+    return planes.sum(axis=2, dtype=np.int32) @ MATERIAL_VALUES
+
+
+def piece_square(planes):
+    """
+    The piece-square table balance of each position, from white's point of view.
+    """
+    return np.einsum('nps,ps->n', planes.astype(np.int32), PIECE_SQUARE_VALUES)
+
+
+def mobility(planes):
+    """
+    How many more moves white's pieces could make than black's in each position, counting every knight, bishop,
+    rook, queen and king move onto an empty square or an opponent's piece. Pawns, pins and checks are left out.
+    """
+    boards = planes.reshape(-1, PLANE_COUNT, BOARD_SIZE, BOARD_SIZE).astype(bool)
+    occupied = boards.any(axis=1)
+    balance = np.zeros(len(planes), dtype=np.int32)
+    for player in Player:
+        own = _pieces(boards, player, *PIECE_VALUES)
+        moves = _jump_moves(_pieces(boards, player, Knight), own, KNIGHT_JUMPS) \
+            + _jump_moves(_pieces(boards, player, King), own, ORTHOGONAL_STEPS + DIAGONAL_STEPS) \
+            + _slide_moves(_pieces(boards, player, Rook, Queen), own, occupied, ORTHOGONAL_STEPS) \
+            + _slide_moves(_pieces(boards, player, Bishop, Queen), own, occupied, DIAGONAL_STEPS)
+        balance += _SIGNS[player] * moves
+    return balance
+
+
+def evaluate_planes(planes, white_to_move):
+    """
+    The scores of positions given as bit planes, with whose turn it is in each.
+    """
+    signs = np.where(white_to_move, 1, -1).astype(np.int32)
+    material_scores = signs * material(planes)
+    piece_square_scores = signs * piece_square(planes)
+    mobility_scores = signs * mobility(planes)
+    return BatchScores(material_scores, piece_square_scores, mobility_scores,
+                       material_scores + piece_square_scores + MOBILITY_WEIGHT * mobility_scores)
+
+
+def evaluate_batch(boards):
+    """
+    The scores of the boards' positions.
+    """
+    boards = list(boards)
+    return evaluate_planes(to_planes(boards), white_to_move(boards))
+
+
+def _pieces(boards, player, *piece_types):
+    return np.any([boards[:, PIECE_CODES[(player, piece_type)]] for piece_type in piece_types], axis=0)
+
+
+def _shift(squares, row_step, col_step):
+    """
+    Moves everything on a batch of 8x8 boards by the given step, dropping whatever goes off the edge.
+    """
+    shifted = np.zeros_like(squares)
+    rows = slice(max(row_step, 0), BOARD_SIZE + min(row_step, 0))
+    cols = slice(max(col_step, 0), BOARD_SIZE + min(col_step, 0))
+    source_rows = slice(max(-row_step, 0), BOARD_SIZE + min(-row_step, 0))
+    source_cols = slice(max(-col_step, 0), BOARD_SIZE + min(-col_step, 0))
+    shifted[:, rows, cols] = squares[:, source_rows, source_cols]
+    return shifted
+
+
+def _jump_moves(pieces, own, steps):
+    return sum((_shift(pieces, *step) & ~own).sum(axis=(1, 2), dtype=np.int32) for step in steps)
+
+
+def _slide_moves(pieces, own, occupied, steps):
+    # Two pieces sliding the same way can never reach the same square, as the one behind is blocked by the other
+    moves = np.zeros(len(pieces), dtype=np.int32)
+    for step in steps:
+        front = pieces
+        for _ in range(BOARD_SIZE - 1):
+            front = _shift(front, *step)
+            moves += (front & ~own).sum(axis=(1, 2), dtype=np.int32)
+            front = front & ~occupied
+            if not front.any():
+                break
+    return moves
@@ -0,0 +1,140 @@
+"""
+A bitboard-backed variant of the chess board. As well as the pieces themselves, it keeps one 64-bit integer per
+piece type and player, with bit square.index set for each occupied square, so that occupancy questions, and
+whether a square is attacked and by what, are answered with a few integer operations rather than by looking at
+Piece objects. It keeps no attack map, so nothing needs updating for attacks as pieces move.
+"""
+
+from chessington.engine.board import Board
+from chessington.engine.data import Player, Square, BOARD_SIZE
+from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King
+from chessington.engine.tables import RAYS, ORTHOGONAL_STEPS, DIAGONAL_STEPS, KNIGHT_TARGETS, KING_TARGETS, \
+    PAWN_CAPTURES
+
+PIECE_TYPES = [Pawn, Knight, Bishop, Rook, Queen, King]
+
+
+def square_bit(square):
+    """
+    The single bit representing the given square.
+    """
+    return 1 << square.index
+
+
+def _mask(squares):
+    mask = 0
+    for square in squares:
+        mask |= 1 << square.index
+    return mask
+
+
+# Attack masks by square index. A pawn of a player attacks a square from the squares that the other player's pawn
+# would attack from it
+KNIGHT_MASKS = [_mask(targets) for targets in KNIGHT_TARGETS]
+KING_MASKS = [_mask(targets) for targets in KING_TARGETS]
+PAWN_ATTACKER_MASKS = [[_mask(targets) for targets in PAWN_CAPTURES[player.opponent()]] for player in Player]
+
+# The squares along each direction from each square, for the directions running towards higher indices, where the
+# nearest piece along a ray is its lowest set bit, and those running towards lower indices, where it is the highest
+_INCREASING_STEPS = [step for step in ORTHOGONAL_STEPS + DIAGONAL_STEPS if step[0] * BOARD_SIZE + step[1] > 0]
+INCREASING_RAYS = [[(_mask(RAYS[step][index]), step in ORTHOGONAL_STEPS) for step in _INCREASING_STEPS]
+                   for index in range(BOARD_SIZE * BOARD_SIZE)]
+DECREASING_RAYS = [[(_mask(RAYS[step][index]), step in ORTHOGONAL_STEPS)
+                    for step in ORTHOGONAL_STEPS + DIAGONAL_STEPS if step not in _INCREASING_STEPS]
+                   for index in range(BOARD_SIZE * BOARD_SIZE)]
+
+# The bitboards are kept in a list, white's six followed by black's, with each piece type at its offset among a
+# player's six. Lists indexed by side are used rather than dicts keyed by player, as hashing an enum member is slow
+TYPE_OFFSETS = {piece_type: offset for offset, piece_type in enumerate(PIECE_TYPES)}
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(len(PIECE_TYPES))
+
+
+def _side(player):
+    return 0 if player is Player.WHITE else 1
+
+
+class BitBoard(Board):
+    """
+    A chess board that mirrors its pieces into per-piece-type bitboards and per-player occupancy sets, and answers
+    attack queries from them.
+    """
+
+    def __init__(self, player, board_state):
+        self.bitboards = [0] * (2 * len(PIECE_TYPES))
+        self.occupancy = [0, 0]
+        super().__init__(player, board_state)
+
+    @property
+    def occupied(self):
+        """
+        The set of all occupied squares.
+        """
+        return self.occupancy[0] | self.occupancy[1]
+
+    def pieces_mask(self, player, piece_type):
+        """
+        The set of squares holding the given player's pieces of the given type.
+        """
+        return self.bitboards[_side(player) * len(PIECE_TYPES) + TYPE_OFFSETS[piece_type]]
+
+    def _copy_index(self):
+        super()._copy_index()
+        self.bitboards = list(self.bitboards)
+        self.occupancy = list(self.occupancy)
+
+    def _add_to_index(self, piece, square):
+        super()._add_to_index(piece, square)
+        bit = square_bit(square)
+        side = _side(piece.player)
+        self.bitboards[side * len(PIECE_TYPES) + TYPE_OFFSETS[type(piece)]] |= bit
+        self.occupancy[side] |= bit
+
+    def _remove_from_index(self, piece, square):
+        super()._remove_from_index(piece, square)
+        bit = ~square_bit(square)
+        side = _side(piece.player)
+        self.bitboards[side * len(PIECE_TYPES) + TYPE_OFFSETS[type(piece)]] &= bit
+        self.occupancy[side] &= bit
+
+    def is_attacked(self, square, by_player):
+        return bool(self._attackers_mask(square.index, by_player))
+
+    def attackers(self, square):
+        mask = self._attackers_mask(square.index, Player.WHITE) | self._attackers_mask(square.index, Player.BLACK)
+        found = []
+        while mask:
+            bit = mask & -mask
+            found.append(Square.from_index(bit.bit_length() - 1))
+            mask ^= bit
+        return found
+
+    def _attackers_mask(self, index, player):
+        side = _side(player)
+        base = side * len(PIECE_TYPES)
+        bitboards = self.bitboards
+        attackers = KNIGHT_MASKS[index] & bitboards[base + KNIGHT] | KING_MASKS[index] & bitboards[base + KING] \
+            | PAWN_ATTACKER_MASKS[side][index] & bitboards[base + PAWN]
+        queens = bitboards[base + QUEEN]
+        rooks = bitboards[base + ROOK] | queens
+        bishops = bitboards[base + BISHOP] | queens
+        if not rooks | bishops:
+            return attackers
+        occupied = self.occupancy[0] | self.occupancy[1]
+        for ray, orthogonal in INCREASING_RAYS[index]:
+            blockers = ray & occupied
+            if blockers:
+                attackers |= blockers & -blockers & (rooks if orthogonal else bishops)
+        for ray, orthogonal in DECREASING_RAYS[index]:
+            blockers = ray & occupied
+            if blockers:
+                attackers |= 1 << blockers.bit_length() - 1 & (rooks if orthogonal else bishops)
+        return attackers
+
+    def square_is_empty(self, square):
+        return not (self.occupancy[0] | self.occupancy[1]) >> square.index & 1
+
+    def has_enemy(self, square):
+        return self.in_board(square) and bool(self.occupancy[1 - _side(self.current_player)] >> square.index & 1)
+
+    def has_friend(self, square):
+        return self.in_board(square) and bool(self.occupancy[_side(self.current_player)] >> square.index & 1)
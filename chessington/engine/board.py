@@ -1,16 +1,27 @@
 """
-A module providing a representation of a chess board. The rules of chess are not implemented - 
-this is just a "dumb" board that will let you move pieces around as you like.
+A module providing a representation of a chess board. Pieces can be moved around on it as you like, while
+legal_moves lists the moves the rules of chess actually allow.
 """
 
+import copy
 from collections import namedtuple
 from enum import Enum, auto
 
-from chessington.engine.data import Player, Square
+from chessington.engine.data import BOARD_SIZE, Player, Square, Move, WHITE_KINGSIDE, WHITE_QUEENSIDE, \
+    BLACK_KINGSIDE, BLACK_QUEENSIDE, ALL_CASTLING_RIGHTS, CASTLING_FLAGS
 from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King
+from chessington.engine import movegen, notation, tablebase, zobrist
+from chessington.engine.attacks import AttackMap
 import sys
 
-BOARD_SIZE = 8
+# The castling rights lost once a piece moves from, or is captured on, each of these squares
+CASTLING_SQUARE_RIGHTS = {Square.at(0, 4): WHITE_KINGSIDE | WHITE_QUEENSIDE, Square.at(0, 7): WHITE_KINGSIDE,
+                          Square.at(0, 0): WHITE_QUEENSIDE, Square.at(7, 4): BLACK_KINGSIDE | BLACK_QUEENSIDE,
+                          Square.at(7, 7): BLACK_KINGSIDE, Square.at(7, 0): BLACK_QUEENSIDE}
+
+# Everything needed to take back a move made with Board.make_move
+UndoRecord = namedtuple('UndoRecord', 'move moving_piece captured_piece captured_square rook rook_from rook_to '
+                                      'promoted_piece en_passant halfmove_clock castling_rights')
 
 class Board:
     """
@@ -21,14 +32,66 @@ class Board:
         self.current_player = Player.WHITE
         self.board = board_state
         self.en_passant = None
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
+        self._castling_rights = ALL_CASTLING_RIGHTS
+
+        # The records of the moves that can be taken back, as a linked list of (record, rest) pairs, most recent
+        # first, so a fork can share it
+        self._undo_stack = None
+
+        # Rows of the board shared with a fork, as a bit per row, which must be copied before they are changed
+        self._shared_rows = 0
+
+        # Whether the piece index and attack map are shared with a fork, and must be copied before they are changed
+        self._shared_index = False
+
+        # The attacks of every piece, kept up to date from the first time they are asked about
+        self._attack_map = None
+
+        # Index of every piece on the board, so pieces can be located without scanning the board
+        self._squares = {}
+        self._pieces = {Player.WHITE: {}, Player.BLACK: {}}
+        self._piece_key = 0
+        for row in range(BOARD_SIZE):
+            for col in range(BOARD_SIZE):
+                piece = self.board[row][col]
+                if piece is not None:
+                    self._add_to_index(piece, Square.at(row, col))
+
+    @staticmethod
+    def empty(backend='list'):
+        return Board._board_class(backend)(Player.WHITE, Board._create_empty_board())
+
+    @staticmethod
+    def at_starting_position(backend='list'):
+        return Board._board_class(backend)(Player.WHITE, Board._create_starting_board())
 
     @staticmethod
-    def empty():
-        return Board(Player.WHITE, Board._create_empty_board())
+    def from_fen(fen, backend='list'):
+        """
+        Creates a board with the position described in Forsyth-Edwards Notation.
+        """
+        return notation.load_fen(Board.empty(backend), fen)
+
+    def to_fen(self):
+        """
+        Describes the position in Forsyth-Edwards Notation.
+        """
+        return notation.to_fen(self)
 
     @staticmethod
-    def at_starting_position():
-        return Board(Player.WHITE, Board._create_starting_board())
+    def _board_class(backend):
+        """
+        Picks the board implementation for the given backend: 'list' for the plain list-of-lists board,
+        or 'bitboard' for one that also tracks occupancy as 64-bit integers.
+        """
+        if backend == 'list':
+            return Board
+        if backend == 'bitboard':
+            from chessington.engine.bitboard import BitBoard
+            return BitBoard
+        raise ValueError('Unknown board backend: ' + str(backend))
 
     @staticmethod
     def _create_empty_board():
@@ -57,9 +120,145 @@ class Board:
 
     def set_piece(self, square, piece):
         """
-        Places the piece at the given position on the board.
+        Places the piece at the given position on the board. Any piece already on that square is removed,
+        and if the piece is already elsewhere on the board it is lifted from its old square.
         """
-        self.board[square.row][square.col] = piece
+        existing = self.board[square.row][square.col]
+        if existing is piece:
+            return
+        if existing is not None:
+            self._remove(square)
+        if piece is not None:
+            current_square = self._squares.get(piece)
+            if current_square is not None:
+                self._remove(current_square)
+            self._put(square, piece)
+
+    def _put(self, square, piece):
+        self._writable_row(square.row)[square.col] = piece
+        self._add_to_index(piece, square)
+
+    def _remove(self, square):
+        piece = self.board[square.row][square.col]
+        self._writable_row(square.row)[square.col] = None
+        self._remove_from_index(piece, square)
+
+    def _writable_row(self, row):
+        if self._shared_rows & 1 << row:
+            self.board[row] = list(self.board[row])
+            self._shared_rows &= ~(1 << row)
+        return self.board[row]
+
+    def fork(self):
+        """
+        An independent copy of the board, including the moves that can be taken back, made in constant time. The
+        two boards share the rows of the board, the piece index and the attack map, and whichever changes one of
+        them first copies it. The moves that can be taken back are a linked list that is never changed in place,
+        so both boards simply share it. Pieces hold nothing but their player, so they are shared too.
+        """
+        fork = copy.copy(self)
+        fork.board = list(self.board)
+        self._shared_rows = fork._shared_rows = (1 << BOARD_SIZE) - 1
+        self._shared_index = fork._shared_index = True
+        return fork
+
+    def __copy__(self):
+        board = type(self).__new__(type(self))
+        board.__dict__.update(self.__dict__)
+        return board
+
+    def __getstate__(self):
+        # Pickling the linked list of undo records would recurse once per move, so it is sent as a list instead
+        state = dict(self.__dict__)
+        records = []
+        node = self._undo_stack
+        while node is not None:
+            record, node = node
+            records.append(record)
+        state['_undo_stack'] = records
+        return state
+
+    def __setstate__(self, state):
+        records = state.pop('_undo_stack')
+        self.__dict__.update(state)
+        self._undo_stack = None
+        for record in reversed(records):
+            self._undo_stack = (record, self._undo_stack)
+
+    def snapshot(self):
+        """
+        A fork of the board to keep as a record of the current position, however this board changes afterwards.
+        """
+        return self.fork()
+
+    def _copy_index(self):
+        self._squares = dict(self._squares)
+        self._pieces = {player: {piece_type: list(pieces) for piece_type, pieces in pieces_by_type.items()}
+                        for player, pieces_by_type in self._pieces.items()}
+        if self._attack_map is not None:
+            self._attack_map = self._attack_map.copy(self)
+        self._shared_index = False
+
+    def _add_to_index(self, piece, square):
+        if self._shared_index:
+            self._copy_index()
+        self._squares[piece] = square
+        self._pieces[piece.player].setdefault(type(piece), []).append(piece)
+        self._piece_key ^= zobrist.piece_key(piece, square)
+        if self._attack_map is not None:
+            self._attack_map.placed(piece, square.index)
+
+    def _remove_from_index(self, piece, square):
+        if self._shared_index:
+            self._copy_index()
+        del self._squares[piece]
+        self._pieces[piece.player][type(piece)].remove(piece)
+        self._piece_key ^= zobrist.piece_key(piece, square)
+        if self._attack_map is not None:
+            self._attack_map.removed(piece, square.index)
+
+    @property
+    def zobrist_key(self):
+        """
+        A 64-bit hash of the position. The part for the pieces is updated as they are placed and removed; the side
+        to move, castling rights and en passant file are each looked up directly.
+        """
+        return self._piece_key ^ zobrist.state_key(self.current_player, self.castling_rights(), self.en_passant_col())
+
+    def castling_rights(self):
+        """
+        The castling rights each player still has, as a combination of the castling flags. A right is lost once
+        the king or the rook involved moves, and cannot be used while either of them is off its starting square.
+        """
+        rights = 0
+        for flag, player, rook_col in CASTLING_FLAGS:
+            if not self._castling_rights & flag:
+                continue
+            home_row = 0 if player == Player.WHITE else BOARD_SIZE - 1
+            king = self.get_piece(Square.at(home_row, 4))
+            rook = self.get_piece(Square.at(home_row, rook_col))
+            if isinstance(king, King) and king.player == player and isinstance(rook, Rook) and rook.player == player:
+                rights |= flag
+        return rights
+
+    def set_castling_rights(self, rights):
+        """
+        Replaces the castling rights with the given combination of castling flags.
+        """
+        self._castling_rights = rights
+
+    def en_passant_col(self):
+        """
+        The column of the pawn that can be captured en passant, if the current player has a pawn able to do so.
+        """
+        if self.en_passant is None:
+            return None
+        for col in (self.en_passant.col - 1, self.en_passant.col + 1):
+            if 0 <= col < BOARD_SIZE:
+                piece = self.get_piece(Square.at(self.en_passant.row, col))
+                if isinstance(piece, Pawn) and piece.player == self.current_player:
+                    return self.en_passant.col
+        return None
 
     def get_piece(self, square):
         """
@@ -85,16 +284,66 @@ class Board:
                     return True
         return False
 
+    def is_attacked(self, square, by_player):
+        """
+        Whether any of the given player's pieces attack the square.
+        """
+        return self._attacks().counts[by_player][square.index] > 0
+
+    def attackers(self, square):
+        """
+        The squares of the pieces, of either player, attacking the square.
+        """
+        return [Square.from_index(index) for index in sorted(self._attacks().attackers[square.index])]
+
+    def _attacks(self):
+        if self._attack_map is None:
+            self._attack_map = AttackMap(self)
+        return self._attack_map
+
     def find_piece(self, piece_to_find):
         """
-        Searches for the given piece on the board and returns its square.
+        Looks up the square of the given piece on the board.
         """
-        for row in range(BOARD_SIZE):
-            for col in range(BOARD_SIZE):
-                if self.board[row][col] is piece_to_find:
-                    return Square.at(row, col)
-        raise Exception('The supplied piece is not on the board')
+        square = self._squares.get(piece_to_find)
+        if square is None:
+            raise Exception('The supplied piece is not on the board')
+        return square
+
+    def get_pieces(self, player, piece_type=None):
+        """
+        Lists the pieces the given player has on the board, optionally only those of the given type.
+        """
+        pieces_by_type = self._pieces[player]
+        if piece_type is not None:
+            return list(pieces_by_type.get(piece_type, ()))
+        return [piece for pieces in pieces_by_type.values() for piece in pieces]
+
+
+    def legal_moves(self):
+        """
+        Lists every legal move for the player whose turn it is.
+        """
+        return movegen.legal_moves(self)
+
+    def is_check(self):
+        """
+        Whether the king of the player whose turn it is is in check.
+        """
+        return movegen.is_check(self)
+
+    def is_checkmate(self):
+        return self.is_check() and not self.legal_moves()
 
+    def is_stalemate(self):
+        return not self.is_check() and not self.legal_moves()
+
+    def probe_tablebase(self):
+        """
+        The endgame tablebase's result for the player whose turn it is, or None if the position is not one of the
+        endings whose tables have been loaded.
+        """
+        return tablebase.probe(self)
 
     def move_piece(self, from_square, to_square):
         """
@@ -103,15 +352,75 @@ class Board:
         moving_piece = self.get_piece(from_square)
         if moving_piece is not None and moving_piece.player == self.current_player:
             self.checkmate(to_square)
-            moving_piece.has_moved = True
-            self.set_piece(to_square, moving_piece)
+            promotion = self.ask_promotion(moving_piece, to_square)
+            self.make_move(Move(from_square, to_square, promotion))
+
+    def make_move(self, move):
+        """
+        Plays the given move for the piece on its starting square, including any capture, castling, en passant or
+        promotion it involves. Nothing is printed or asked for, and the move can be taken back with unmake_move.
+        """
+        from_square, to_square, promotion = move
+        moving_piece = self.get_piece(from_square)
+
+        captured_square = to_square
+        if isinstance(moving_piece, Pawn) and from_square.col != to_square.col and self.square_is_empty(to_square):
+            captured_square = Square.at(from_square.row, to_square.col)
+        captured_piece = self.get_piece(captured_square)
+
+        rook, rook_from, rook_to = self.castling_rook(moving_piece, from_square, to_square)
+
+        promoted_piece = None
+        if isinstance(moving_piece, Pawn) and to_square.row in (0, BOARD_SIZE - 1):
+            promoted_piece = (promotion or Queen)(moving_piece.player)
+
+        self._undo_stack = (UndoRecord(
+            move, moving_piece, captured_piece, captured_square, rook, rook_from, rook_to, promoted_piece,
+            self.en_passant, self.halfmove_clock, self._castling_rights), self._undo_stack)
+
+        if captured_piece is not None:
+            self.set_piece(captured_square, None)
+        if promoted_piece is not None:
             self.set_piece(from_square, None)
-            self.handle_castling(moving_piece, from_square, to_square)
-            self.handle_en_passant_capture(moving_piece, to_square)
-            #Location of square a pawn has double stepped to, i.e en passant may be possible
-            self.en_passant = self.record_double_move(moving_piece, from_square, to_square)
-            self.handle_promotion(moving_piece, to_square)
-            self.current_player = self.current_player.opponent()
+            self.set_piece(to_square, promoted_piece)
+        else:
+            self.set_piece(to_square, moving_piece)
+        if rook is not None:
+            self.set_piece(rook_to, rook)
+        lost_rights = CASTLING_SQUARE_RIGHTS.get(from_square, 0) | CASTLING_SQUARE_RIGHTS.get(to_square, 0)
+        self._castling_rights &= ~lost_rights
+        #Location of square a pawn has double stepped to, i.e en passant may be possible
+        self.en_passant = self.record_double_move(moving_piece, from_square, to_square)
+        if captured_piece is not None or isinstance(moving_piece, Pawn):
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+        if self.current_player == Player.BLACK:
+            self.fullmove_number += 1
+        self.current_player = self.current_player.opponent()
+
+    def unmake_move(self):
+        """
+        Takes back the last move made, restoring the board exactly as it was before it.
+        """
+        if self._undo_stack is None:
+            raise IndexError('There is no move to take back')
+        record, self._undo_stack = self._undo_stack
+        from_square, to_square, _ = record.move
+        self.current_player = self.current_player.opponent()
+        if self.current_player == Player.BLACK:
+            self.fullmove_number -= 1
+        self.en_passant = record.en_passant
+        self.halfmove_clock = record.halfmove_clock
+        self._castling_rights = record.castling_rights
+        if record.rook is not None:
+            self.set_piece(record.rook_from, record.rook)
+        if record.promoted_piece is not None:
+            self.set_piece(to_square, None)
+        self.set_piece(from_square, record.moving_piece)
+        if record.captured_piece is not None:
+            self.set_piece(record.captured_square, record.captured_piece)
+
     #Identifies if a pawn has double stepped. If so, it returns the location of the square it has moved to
     def record_double_move(self, moving_piece, from_square, to_square):
         if isinstance(moving_piece,Pawn):
@@ -119,51 +428,22 @@ class Board:
                 return to_square
         return None
 
-    #Checks moving piece is a pawn gets the previous 'en passant' double step made by another pawn
-    def handle_en_passant_capture(self, moving_piece, to_square):
-        if self.en_passant is None:
-            return
-        if not isinstance(moving_piece, Pawn):
-            return
-        if to_square.col == self.en_passant.col:
-            if to_square.row == 2 or to_square.row == 5:
-                self.set_piece(self.en_passant, None)
-
-
-    def handle_castling(self, moving_piece, from_square, to_square):
-        if isinstance(moving_piece, King):
-            if abs(from_square.col - to_square.col) > 1:
-                if to_square.row == 0:
-                    if to_square.col == 2:
-                        self.set_piece(Square.at(0,0), None)
-                        self.set_piece(Square.at(0,3), Rook(self.current_player))
-                    elif to_square.col == 6:
-                        self.set_piece(Square.at(0, 7), None)
-                        self.set_piece(Square.at(0, 5), Rook(self.current_player))
-                elif to_square.row == 7:
-                    if to_square.col == 2:
-                        self.set_piece(Square.at(7, 0), None)
-                        self.set_piece(Square.at(7, 3), Rook(self.current_player))
-                    elif to_square.col == 6:
-                        self.set_piece(Square.at(7, 7), None)
-                        self.set_piece(Square.at(7, 5), Rook(self.current_player))
-        return
-
-    def handle_promotion(self, moving_piece, to_square):
+    #Finds the rook that moves alongside a castling king, and the squares it moves between
+    def castling_rook(self, moving_piece, from_square, to_square):
+        if isinstance(moving_piece, King) and abs(from_square.col - to_square.col) > 1:
+            if to_square.col == 2:
+                rook_from, rook_to = Square.at(to_square.row, 0), Square.at(to_square.row, 3)
+            else:
+                rook_from, rook_to = Square.at(to_square.row, 7), Square.at(to_square.row, 5)
+            return self.get_piece(rook_from), rook_from, rook_to
+        return None, None, None
+
+    def ask_promotion(self, moving_piece, to_square):
         if isinstance(moving_piece, Pawn):
             if to_square.row == 0 or to_square.row == 7:
                 piece = input("Select piece to promote pawn to: 'Q', 'K', 'R' or 'B'.")
-                if piece == 'Q':
-                    self.set_piece(to_square, Queen(self.current_player))
-                elif piece == 'K':
-                    self.set_piece(to_square, Knight(self.current_player))
-                elif piece == 'R':
-                    self.set_piece(to_square, Rook(self.current_player))
-                elif piece == 'B':
-                    self.set_piece(to_square, Bishop(self.current_player))
-                else:
-                    self.set_piece(to_square, Queen(self.current_player))
-        return
+                return {'Q': Queen, 'K': Knight, 'R': Rook, 'B': Bishop}.get(piece, Queen)
+        return None
 
     def checkmate(self, to_square):
         if isinstance(self.get_piece(to_square), King):
@@ -0,0 +1,186 @@
+"""
+An opening book: the moves played from well-known positions, so the computer can reply at once early in the game
+instead of searching. The book is a file of fixed-size records sorted by the position's Zobrist key:
+
+    8 bytes   the Zobrist key of the position
+    2 bytes   the move, packed as by the transposition table
+    2 bytes   the move's weight, how strongly it is preferred over the other moves from the position
+
+A book is read by mapping the file into memory and binary searching it, so opening one costs almost nothing and
+every process reading the same book shares a single copy of it through the operating system's page cache.
+"""
+
+import argparse
+import functools
+import mmap
+import random
+import struct
+import sys
+from collections import defaultdict, namedtuple
+
+from chessington.engine.board import Board
+from chessington.engine.data import Player
+from chessington.engine.pgn import read_games, parse_san
+from chessington.engine.transposition import encode_move, decode_move
+
+RECORD = struct.Struct('>QHH')
+MAX_WEIGHT = (1 << 16) - 1
+
+# How much a move counts for when building from games, by whether the player who made it won, drew or lost
+RESULT_WEIGHTS = {'win': 2, 'draw': 1, 'loss': 0}
+
+# A move found in the book, and how strongly it is preferred
+BookEntry = namedtuple('BookEntry', 'move weight')
+
+
+class BookBuilder:
+    """
+    Collects moves and their weights position by position, then writes them out as a sorted book file.
+    """
+
+    def __init__(self):
+        self._weights = defaultdict(int)
+
+    def __len__(self):
+        return len(self._weights)
+
+    def add(self, board, move, weight=1):
+        """
+        Adds weight to the move from the board's position.
+        """
+        if weight > 0:
+            self._weights[(board.zobrist_key, encode_move(move))] += weight
+
+    def add_game(self, game, max_plies=20):
+        """
+        Adds the first moves of a game read from PGN, weighted by how the game went for the player making them.
+        Games set up from a position, and any moves after one that cannot be read, are left out.
+        """
+        if 'FEN' in game.headers:
+            return
+        board = Board.at_starting_position()
+        for san in game.moves[:max_plies]:
+            try:
+                move = parse_san(board, san)
+            except ValueError:
+                return
+            self.add(board, move, RESULT_WEIGHTS[_outcome(game.result, board.current_player)])
+            board.make_move(move)
+
+    def write(self, path):
+        """
+        Writes the book, sorted by key, returning the number of records written. Each position's weights are scaled
+        down together if any is too large to store.
+        """
+        by_key = defaultdict(list)
+        for (key, move_code), weight in self._weights.items():
+            by_key[key].append((move_code, weight))
+        with open(path, 'wb') as book_file:
+            for key in sorted(by_key):
+                moves = sorted(by_key[key])
+                scale = max(weight for _, weight in moves) / MAX_WEIGHT
+                for move_code, weight in moves:
+                    if scale > 1:
+                        weight = max(int(weight / scale), 1)
+                    book_file.write(RECORD.pack(key, move_code, weight))
+        return len(self._weights)
+
+
+class OpeningBook:
+    """
+    A book file opened for reading. Only the pages of the file that are searched are ever read from disk.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as book_file:
+            size = book_file.seek(0, 2)
+            # An empty file cannot be mapped, but is still a valid (empty) book
+            self._data = mmap.mmap(book_file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        self._count = size // RECORD.size
+
+    def __len__(self):
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+    def entries(self, board):
+        """
+        The book's moves from the board's position, skipping any that are not legal there in case two positions
+        share a key.
+        """
+        key = board.zobrist_key
+        found = []
+        index = self._first_index(key)
+        while index < self._count:
+            record_key, move_code, weight = RECORD.unpack_from(self._data, index * RECORD.size)
+            if record_key != key:
+                break
+            found.append(BookEntry(decode_move(move_code), weight))
+            index += 1
+        if not found:
+            return []
+        legal_moves = set(board.legal_moves())
+        return [entry for entry in found if entry.move in legal_moves]
+
+    def choose(self, board, chooser=random):
+        """
+        A move from the book for the board's position, picked at random in proportion to the weights, or None if
+        the position is not in the book.
+        """
+        entries = self.entries(board)
+        if not entries:
+            return None
+        return chooser.choices([entry.move for entry in entries], [entry.weight for entry in entries])[0]
+
+    def _first_index(self, key):
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if RECORD.unpack_from(self._data, middle * RECORD.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+
+@functools.lru_cache(maxsize=None)
+def open_book(path):
+    """
+    The book at the given path, opened once per process and kept open for reuse.
+    """
+    return OpeningBook(path)
+
+
+def _outcome(result, player):
+    if result == '1/2-1/2':
+        return 'draw'
+    if result == '1-0':
+        return 'win' if player == Player.WHITE else 'loss'
+    if result == '0-1':
+        return 'win' if player == Player.BLACK else 'loss'
+    return 'draw'
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Build an opening book from a file of games in PGN.')
+    parser.add_argument('pgn', help='file of games to build the book from')
+    parser.add_argument('book', help='file to write the book to')
+    parser.add_argument('--plies', type=int, default=20, help='number of moves of each game to include')
+    options = parser.parse_args(args)
+
+    builder = BookBuilder()
+    games = 0
+    for game in read_games(options.pgn):
+        builder.add_game(game, options.plies)
+        games += 1
+    records = builder.write(options.book)
+    print('Games: {}, moves written: {}'.format(games, records), file=sys.stderr)
@@ -5,6 +5,8 @@ Data classes for easy representation of concepts such as a square on the board o
 from collections import namedtuple
 from enum import Enum, auto
 
+BOARD_SIZE = 8
+
 class Player(Enum):
     """
     The two players in a game of chess.
@@ -17,14 +19,51 @@ class Player(Enum):
         else: return Player.WHITE
 
 
+# Flags for each castling right, and the player and rook column each one belongs to
+WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE = 1, 2, 4, 8
+ALL_CASTLING_RIGHTS = WHITE_KINGSIDE | WHITE_QUEENSIDE | BLACK_KINGSIDE | BLACK_QUEENSIDE
+CASTLING_FLAGS = [(WHITE_KINGSIDE, Player.WHITE, 7), (WHITE_QUEENSIDE, Player.WHITE, 0),
+                  (BLACK_KINGSIDE, Player.BLACK, 7), (BLACK_QUEENSIDE, Player.BLACK, 0)]
+
+
 class Square(namedtuple('Square', 'row col')):
     """
-    An immutable pair (row, col) representing the coordinates of a square.
+    An immutable pair (row, col) representing the coordinates of a square. The 64 squares on the board are created
+    once and shared, so they can be compared and hashed cheaply; squares off the board are created as needed.
     """
 
+    __slots__ = ()
+
     @staticmethod
     def at(row, col):
         """
-        Creates a square at the given row and column.
+        The square at the given row and column.
         """
-        return Square(row=row, col=col)
\ No newline at end of file
+        if 0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE:
+            return _SQUARES[row * BOARD_SIZE + col]
+        return Square(row=row, col=col)
+
+    @staticmethod
+    def from_index(index):
+        """
+        The square with the given index, from 0 for (0, 0) to 63 for (7, 7).
+        """
+        return _SQUARES[index]
+
+    @property
+    def index(self):
+        """
+        The position of the square in a flat array of the board, counting along each row from 0 at (0, 0) to 63
+        at (7, 7).
+        """
+        return self.row * BOARD_SIZE + self.col
+
+
+_SQUARES = [Square(row, col) for row in range(BOARD_SIZE) for col in range(BOARD_SIZE)]
+
+
+class Move(namedtuple('Move', 'from_square to_square promotion', defaults=(None,))):
+    """
+    An immutable move of a piece between two squares. For a pawn reaching the far side of the board, promotion
+    holds the type of piece it becomes.
+    """
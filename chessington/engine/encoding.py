@@ -0,0 +1,87 @@
+"""
+A compact, fixed-width binary encoding of chess positions, for storing and sending large numbers of them.
+
+Each position takes POSITION_BYTES bytes:
+    8 bytes   a bit per square saying whether it is occupied, bit square.index for each square
+    16 bytes  a 4-bit code for each occupied square's piece, in the order of the squares
+    1 byte    the side to move in bit 0, and the castling rights flags in bits 1 to 4
+    1 byte    one more than the column of a pawn that can be captured en passant, or 0 if there is none
+The move counters are not included.
+"""
+
+import struct
+
+from chessington.engine.board import Board
+from chessington.engine.data import Player, Square
+from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King
+
+POSITION_BYTES = 26
+MAX_PIECES = 32
+
+PIECE_CODES = {(player, piece_type): code
+               for code, (player, piece_type) in enumerate((player, piece_type) for player in Player
+                                                           for piece_type in [Pawn, Knight, Bishop, Rook, Queen, King])}
+CODE_PIECES = {code: piece for piece, code in PIECE_CODES.items()}
+
+_LAYOUT = struct.Struct('>Q16sBB')
+
+
+def encode(board):
+    """
+    The board's position, packed into POSITION_BYTES bytes.
+    """
+    occupancy = 0
+    codes = []
+    for index in range(64):
+        piece = board.get_piece(Square.from_index(index))
+        if piece is not None:
+            occupancy |= 1 << index
+            codes.append(PIECE_CODES[(piece.player, type(piece))])
+    if len(codes) > MAX_PIECES:
+        raise ValueError('Too many pieces to encode: {}'.format(len(codes)))
+    codes += [0] * (MAX_PIECES - len(codes))
+    packed_codes = bytes(codes[i] << 4 | codes[i + 1] for i in range(0, MAX_PIECES, 2))
+
+    flags = (board.current_player == Player.BLACK) | board.castling_rights() << 1
+    en_passant = board.en_passant.col + 1 if board.en_passant is not None else 0
+    return _LAYOUT.pack(occupancy, packed_codes, flags, en_passant)
+
+
+def decode(data, backend='list'):
+    """
+    The board for a position packed by encode.
+    """
+    occupancy, packed_codes, flags, en_passant = _LAYOUT.unpack(data)
+    board = Board.empty(backend)
+    piece_number = 0
+    for index in range(64):
+        if occupancy >> index & 1:
+            code = packed_codes[piece_number // 2] >> (4 if piece_number % 2 == 0 else 0) & 15
+            player, piece_type = CODE_PIECES[code]
+            board.set_piece(Square.from_index(index), piece_type(player))
+            piece_number += 1
+
+    board.current_player = Player.BLACK if flags & 1 else Player.WHITE
+    board.set_castling_rights(flags >> 1 & 15)
+    if en_passant:
+        # The pawn that can be taken en passant belongs to the player who has just moved
+        board.en_passant = Square.at(3 if board.current_player == Player.BLACK else 4, en_passant - 1)
+    return board
+
+
+def encode_all(boards):
+    """
+    Packs many positions back to back into a single bytes object.
+    """
+    return b''.join(encode(board) for board in boards)
+
+
+def decode_all(data, backend='list'):
+    """
+    Unpacks each of the positions packed back to back by encode_all, one board at a time.
+    """
+    if len(data) % POSITION_BYTES:
+        raise ValueError('Data is not a whole number of positions')
+    view = memoryview(data)
+    for offset in range(0, len(data), POSITION_BYTES):
+        yield decode(view[offset:offset + POSITION_BYTES], backend)
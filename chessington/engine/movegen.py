@@ -0,0 +1,170 @@
+"""
+Generation of every legal move for the player whose turn it is. Rather than trying each move and seeing whether it
+leaves the king capturable, the squares attacked by the opponent, the pieces giving check and the pieces pinned
+against the king are worked out once, and each piece's moves are filtered against them. Attacks and checks are
+looked up in the board's attack map.
+"""
+
+from chessington.engine.data import BOARD_SIZE, Move, Square
+from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King
+from chessington.engine.tables import RAYS, ORTHOGONAL_STEPS, DIAGONAL_STEPS
+
+PROMOTION_TYPES = [Queen, Rook, Bishop, Knight]
+
+# The sliding pieces that attack along each direction
+SLIDERS = {step: (Rook, Queen) for step in ORTHOGONAL_STEPS}
+SLIDERS.update({step: (Bishop, Queen) for step in DIAGONAL_STEPS})
+
+
+def is_check(board):
+    """
+    Whether the king of the player whose turn it is is under attack.
+    """
+    king_square = _king_square(board, board.current_player)
+    return king_square is not None and board.is_attacked(king_square, board.current_player.opponent())
+
+
+def legal_moves(board):
+    """
+    Every legal move for the player whose turn it is.
+    """
+    player = board.current_player
+    enemy = player.opponent()
+    king_square = _king_square(board, player)
+    if king_square is None:
+        return _unchecked_moves(board, player)
+
+    checking = [square for square in board.attackers(king_square) if board.get_piece(square).player == enemy]
+    # The king cannot escape a sliding piece by stepping back along the line it is checked on
+    shadowed = {_step_beyond(square, king_square) for square in checking
+                if type(board.get_piece(square)) in (Bishop, Rook, Queen)}
+    king = board.get_piece(king_square)
+    moves = [Move(king_square, square) for square in king.get_available_moves(board)
+             if abs(square.col - king_square.col) < 2 and square not in shadowed
+             and not board.is_attacked(square, enemy)]
+    if len(checking) > 1:
+        return moves
+    if not checking:
+        moves += _castling_moves(board, king, king_square)
+
+    # With a single checker, other pieces must capture it or step in between it and the king
+    allowed = None
+    if checking:
+        allowed = {checking[0]}
+        if not isinstance(board.get_piece(checking[0]), (Knight, Pawn)):
+            allowed.update(_between(king_square, checking[0]))
+    pins = _pins(board, player, king_square)
+
+    for piece in board.get_pieces(player):
+        if piece is king:
+            continue
+        from_square = board.find_piece(piece)
+        pin_line = pins.get(from_square)
+        is_pawn = isinstance(piece, Pawn)
+        for to_square in piece.get_available_moves(board):
+            if pin_line is not None and to_square not in pin_line:
+                continue
+            if is_pawn and to_square.col != from_square.col and board.get_piece(to_square) is None:
+                # En passant: the captured pawn may be the checker, and both pawns leave the row at once
+                captured_square = Square.at(from_square.row, to_square.col)
+                if allowed is not None and to_square not in allowed and captured_square not in allowed:
+                    continue
+                if _en_passant_exposes_king(board, player, king_square, from_square, captured_square):
+                    continue
+            elif allowed is not None and to_square not in allowed:
+                continue
+            _add_moves(moves, piece, from_square, to_square)
+    return moves
+
+
+def _unchecked_moves(board, player):
+    moves = []
+    for piece in board.get_pieces(player):
+        from_square = board.find_piece(piece)
+        for to_square in piece.get_available_moves(board):
+            _add_moves(moves, piece, from_square, to_square)
+    return moves
+
+
+def _add_moves(moves, piece, from_square, to_square):
+    if isinstance(piece, Pawn) and to_square.row in (0, 7):
+        moves.extend(Move(from_square, to_square, promotion) for promotion in PROMOTION_TYPES)
+    else:
+        moves.append(Move(from_square, to_square))
+
+
+def _castling_moves(board, king, king_square):
+    moves = []
+    enemy = king.player.opponent()
+    for to_square in king.castling_moves(board, king_square):
+        step = 1 if to_square.col > king_square.col else -1
+        passed_square = Square.at(king_square.row, king_square.col + step)
+        if not board.is_attacked(passed_square, enemy) and not board.is_attacked(to_square, enemy):
+            moves.append(Move(king_square, to_square))
+    return moves
+
+
+def _pins(board, player, king_square):
+    """
+    Maps the square of each piece pinned against the king to the squares it may still move to.
+    """
+    pins = {}
+    for step, ray in _rays(king_square.index):
+        pinned = None
+        for index, square in enumerate(ray):
+            piece = board.get_piece(square)
+            if piece is None:
+                continue
+            if pinned is None and piece.player == player:
+                pinned = square
+                continue
+            if pinned is not None and _is(piece, player.opponent(), SLIDERS[step]):
+                pins[pinned] = set(ray[:index + 1])
+            break
+    return pins
+
+
+def _en_passant_exposes_king(board, player, king_square, from_square, captured_square):
+    if king_square.row != from_square.row:
+        return False
+    step = (0, 1) if captured_square.col > king_square.col else (0, -1)
+    for square in RAYS[step][king_square.index]:
+        if square == from_square or square == captured_square:
+            continue
+        piece = board.get_piece(square)
+        if piece is not None:
+            return _is(piece, player.opponent(), SLIDERS[step])
+    return False
+
+
+def _between(square, other):
+    row_step = (other.row > square.row) - (other.row < square.row)
+    col_step = (other.col > square.col) - (other.col < square.col)
+    squares = []
+    for ray_square in RAYS[(row_step, col_step)][square.index]:
+        if ray_square == other:
+            break
+        squares.append(ray_square)
+    return squares
+
+
+def _step_beyond(square, other):
+    """
+    The square one step past the other square on the line from the first, or None if that is off the board.
+    """
+    row = other.row + (other.row > square.row) - (other.row < square.row)
+    col = other.col + (other.col > square.col) - (other.col < square.col)
+    return Square.at(row, col) if 0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE else None
+
+
+def _rays(index):
+    return [(step, RAYS[step][index]) for step in ORTHOGONAL_STEPS + DIAGONAL_STEPS]
+
+
+def _king_square(board, player):
+    kings = board.get_pieces(player, King)
+    return board.find_piece(kings[0]) if kings else None
+
+
+def _is(piece, player, piece_types):
+    return piece is not None and piece.player == player and type(piece) in piece_types
@@ -0,0 +1,145 @@
+"""
+Reading and writing chess notation: square names such as 'e4', moves written as a pair of squares such as 'e2e4',
+and whole positions in Forsyth-Edwards Notation (FEN).
+"""
+
+from chessington.engine.data import Player, Square, Move
+from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King
+
+FILES = 'abcdefgh'
+PIECE_LETTERS = {Pawn: 'p', Knight: 'n', Bishop: 'b', Rook: 'r', Queen: 'q', King: 'k'}
+LETTER_PIECES = {letter: piece_type for piece_type, letter in PIECE_LETTERS.items()}
+CASTLING_LETTERS = 'KQkq'
+
+STARTING_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+
+
+def square_name(square):
+    """
+    The name of the square, e.g. 'e4' for Square.at(3, 4).
+    """
+    return FILES[square.col] + str(square.row + 1)
+
+
+def parse_square(name):
+    """
+    The square with the given name.
+    """
+    if len(name) != 2 or name[0] not in FILES or name[1] not in '12345678':
+        raise ValueError('Not a square: ' + repr(name))
+    return Square.at(int(name[1]) - 1, FILES.index(name[0]))
+
+
+def move_to_uci(move):
+    """
+    The move written as its pair of squares, followed by the promotion piece if there is one, e.g. 'e7e8q'.
+    """
+    name = square_name(move.from_square) + square_name(move.to_square)
+    if move.promotion is not None:
+        name += PIECE_LETTERS[move.promotion]
+    return name
+
+
+def move_from_uci(text):
+    """
+    The move written as a pair of squares by move_to_uci.
+    """
+    if len(text) not in (4, 5):
+        raise ValueError('Not a move: ' + repr(text))
+    promotion = None
+    if len(text) == 5:
+        promotion = LETTER_PIECES.get(text[4])
+        if promotion in (None, Pawn, King):
+            raise ValueError('Not a promotion piece: ' + repr(text[4]))
+    return Move(parse_square(text[:2]), parse_square(text[2:4]), promotion)
+
+
+def legal_move_from_uci(board, text):
+    """
+    The legal move on the board written as a pair of squares. A pawn reaching the far side of the board without a
+    promotion piece given is promoted to a queen. Raises a ValueError if the move is not legal.
+    """
+    move = move_from_uci(text)
+    legal_moves = board.legal_moves()
+    if move not in legal_moves and move.promotion is None:
+        move = Move(move.from_square, move.to_square, Queen)
+    if move not in legal_moves:
+        raise ValueError('Illegal move: ' + text)
+    return move
+
+
+def load_fen(board, fen):
+    """
+    Sets up an empty board with the position described by the FEN.
+    """
+    fields = fen.split()
+    if len(fields) < 4:
+        raise ValueError('Incomplete FEN: ' + repr(fen))
+    ranks = fields[0].split('/')
+    if len(ranks) != 8:
+        raise ValueError('FEN does not have 8 ranks: ' + repr(fen))
+
+    for rank, pieces in enumerate(ranks):
+        row, col = 7 - rank, 0
+        for letter in pieces:
+            if letter.isdigit():
+                col += int(letter)
+                continue
+            piece_type = LETTER_PIECES.get(letter.lower())
+            if piece_type is None or col > 7:
+                raise ValueError('Bad FEN rank: ' + repr(pieces))
+            board.set_piece(Square.at(row, col), piece_type(Player.WHITE if letter.isupper() else Player.BLACK))
+            col += 1
+        if col != 8:
+            raise ValueError('Bad FEN rank: ' + repr(pieces))
+
+    if fields[1] not in ('w', 'b'):
+        raise ValueError('Bad side to move: ' + repr(fields[1]))
+    board.current_player = Player.WHITE if fields[1] == 'w' else Player.BLACK
+
+    rights = 0
+    for index, letter in enumerate(CASTLING_LETTERS):
+        if letter in fields[2]:
+            rights |= 1 << index
+    board.set_castling_rights(rights)
+
+    # FEN gives the square passed over by a double-stepping pawn, while the board records where that pawn landed
+    board.en_passant = None
+    if fields[3] != '-':
+        passed_square = parse_square(fields[3])
+        board.en_passant = Square.at(3 if passed_square.row == 2 else 4, passed_square.col)
+
+    board.halfmove_clock = int(fields[4]) if len(fields) > 4 else 0
+    board.fullmove_number = int(fields[5]) if len(fields) > 5 else 1
+    return board
+
+
+def to_fen(board):
+    """
+    Describes the board's position in FEN.
+    """
+    ranks = []
+    for row in range(7, -1, -1):
+        rank, empty = '', 0
+        for col in range(8):
+            piece = board.get_piece(Square.at(row, col))
+            if piece is None:
+                empty += 1
+                continue
+            if empty:
+                rank, empty = rank + str(empty), 0
+            letter = PIECE_LETTERS[type(piece)]
+            rank += letter.upper() if piece.player == Player.WHITE else letter
+        ranks.append(rank + (str(empty) if empty else ''))
+
+    rights = board.castling_rights()
+    castling = ''.join(letter for index, letter in enumerate(CASTLING_LETTERS) if rights & (1 << index)) or '-'
+
+    en_passant = '-'
+    if board.en_passant is not None:
+        passed_row = 2 if board.en_passant.row == 3 else 5
+        en_passant = square_name(Square.at(passed_row, board.en_passant.col))
+
+    side = 'w' if board.current_player == Player.WHITE else 'b'
+    return ' '.join(['/'.join(ranks), side, castling, en_passant,
+                     str(board.halfmove_clock), str(board.fullmove_number)])
@@ -0,0 +1,64 @@
+"""
+Perft: counting the positions reachable from a board in a given number of moves. The counts for well known
+positions are published, which makes perft both a check that the move rules are right and a benchmark of how
+quickly moves can be generated.
+"""
+
+import argparse
+import time
+
+from chessington.engine.board import Board
+from chessington.engine.notation import move_to_uci, STARTING_FEN
+
+
+def perft(board, depth):
+    """
+    The number of move sequences of the given length that can be played from the board's position.
+    """
+    if depth == 0:
+        return 1
+    moves = board.legal_moves()
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        board.make_move(move)
+        nodes += perft(board, depth - 1)
+        board.unmake_move()
+    return nodes
+
+
+def divide(board, depth):
+    """
+    The perft count below each legal move from the board's position, which narrows down where counts differ.
+    """
+    counts = {}
+    for move in board.legal_moves():
+        board.make_move(move)
+        counts[move] = perft(board, depth - 1)
+        board.unmake_move()
+    return counts
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Count the positions reachable from a position.')
+    parser.add_argument('depth', type=int, nargs='?', default=4, help='number of moves to look ahead')
+    parser.add_argument('--divide', action='store_true', help='show the count below each move')
+    parser.add_argument('--fen', default=STARTING_FEN, help='position to start from, in FEN')
+    parser.add_argument('--backend', default='list', help="board representation, 'list' or 'bitboard'")
+    options = parser.parse_args(args)
+
+    board = Board.from_fen(options.fen, backend=options.backend)
+    start = time.perf_counter()
+    if options.divide:
+        counts = divide(board, options.depth)
+        for move, count in sorted(counts.items(), key=lambda item: move_to_uci(item[0])):
+            print('{}: {}'.format(move_to_uci(move), count))
+        nodes = sum(counts.values())
+    else:
+        nodes = perft(board, options.depth)
+    elapsed = time.perf_counter() - start
+
+    print('Nodes: {}'.format(nodes))
+    print('Time: {:.3f}s'.format(elapsed))
+    print('Nodes/second: {:.0f}'.format(nodes / elapsed if elapsed > 0 else 0))
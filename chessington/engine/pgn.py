@@ -0,0 +1,130 @@
+"""
+Reading games in Portable Game Notation (PGN). Games are read one at a time from a file, so archives of any size
+can be processed in constant memory, and their moves in Standard Algebraic Notation (SAN) are replayed on a board
+without any interaction.
+"""
+
+import re
+from collections import namedtuple
+
+from chessington.engine.board import Board
+from chessington.engine.notation import parse_square, LETTER_PIECES
+from chessington.engine.pieces import Pawn, King
+
+RESULTS = {'1-0', '0-1', '1/2-1/2', '*'}
+
+# A game read from PGN: its tag pairs, its moves in SAN and its result
+Game = namedtuple('Game', 'headers moves result')
+
+_HEADER = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+_SAN = re.compile(r'^([NBRQK])?([a-h])?([1-8])?(x)?([a-h][1-8])(?:=?([NBRQ]))?$')
+
+
+def read_games(source):
+    """
+    Yields each game in the PGN, reading the given file object or file path a line at a time.
+    """
+    if isinstance(source, str):
+        with open(source, encoding='utf-8', errors='replace') as pgn_file:
+            yield from read_games(pgn_file)
+        return
+
+    headers, movetext = {}, []
+    for line in source:
+        line = line.strip()
+        if line.startswith('[') and not _in_comment(movetext):
+            if movetext:
+                yield _parse_game(headers, movetext)
+                headers, movetext = {}, []
+            match = _HEADER.match(line)
+            if match:
+                headers[match.group(1)] = match.group(2).replace('\\"', '"').replace('\\\\', '\\')
+        elif line and not line.startswith('%'):
+            movetext.append(line)
+    if headers or movetext:
+        yield _parse_game(headers, movetext)
+
+
+def replay(game, backend='list'):
+    """
+    Plays through the game, yielding the move played and the board after it for each move. The same board is
+    updated and yielded each time. Raises a ValueError at the first move that is not legal.
+    """
+    board = Board.from_fen(game.headers['FEN'], backend) if 'FEN' in game.headers else Board.at_starting_position(backend)
+    for san in game.moves:
+        move = parse_san(board, san)
+        board.make_move(move)
+        yield move, board
+
+
+def positions(source, backend='list'):
+    """
+    Yields the board after every move of every game in the PGN, as with replay.
+    """
+    for game in read_games(source):
+        for _, board in replay(game, backend):
+            yield board
+
+
+def parse_san(board, san):
+    """
+    The legal move on the board written in SAN, e.g. 'Nbd7', 'exd6', 'e8=Q+' or 'O-O'.
+    """
+    text = san.rstrip('+#!?')
+    legal_moves = board.legal_moves()
+    if text in ('O-O', '0-0', 'O-O-O', '0-0-0'):
+        col_step = 2 if len(text) == 3 else -2
+        candidates = [move for move in legal_moves
+                      if isinstance(board.get_piece(move.from_square), King)
+                      and move.to_square.col - move.from_square.col == col_step]
+    else:
+        match = _SAN.match(text)
+        if match is None:
+            raise ValueError('Not a SAN move: ' + repr(san))
+        letter, from_file, from_rank, _, to_name, promotion_letter = match.groups()
+        piece_type = LETTER_PIECES[letter.lower()] if letter else Pawn
+        to_square = parse_square(to_name)
+        promotion = LETTER_PIECES[promotion_letter.lower()] if promotion_letter else None
+        candidates = [move for move in legal_moves
+                      if move.to_square == to_square and move.promotion == promotion
+                      and type(board.get_piece(move.from_square)) is piece_type
+                      and (from_file is None or move.from_square.col == ord(from_file) - ord('a'))
+                      and (from_rank is None or move.from_square.row == int(from_rank) - 1)]
+    if len(candidates) != 1:
+        raise ValueError('{} move: {}'.format('Ambiguous' if candidates else 'Illegal', san))
+    return candidates[0]
+
+
+def _parse_game(headers, movetext):
+    moves, result = [], headers.get('Result', '*')
+    for token in _tokens(' '.join(movetext)):
+        if token in RESULTS:
+            result = token
+        else:
+            moves.append(token)
+    return Game(headers, moves, result)
+
+
+def _tokens(text):
+    """
+    Splits movetext into moves and results, leaving out comments, variations, move numbers and annotations.
+    """
+    text = re.sub(r'\{[^}]*\}|;[^\n]*', ' ', text)
+    depth, kept = 0, []
+    for char in text:
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth = max(depth - 1, 0)
+        elif depth == 0:
+            kept.append(char)
+    for token in ''.join(kept).split():
+        token = re.sub(r'^\d+\.+', '', token)
+        if token and not token.startswith('$') and not token.strip('.').isdigit():
+            yield token
+
+
+def _in_comment(movetext):
+    # A '[' at the start of a line inside a brace comment is not a new game's header
+    text = ' '.join(movetext)
+    return text.count('{') > text.count('}')
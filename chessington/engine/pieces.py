@@ -4,17 +4,25 @@ Definitions of each of the different chess pieces.
 
 from abc import ABC, abstractmethod
 
-from chessington.engine.data import Player, Square
+from chessington.engine.data import Player, Square, CASTLING_FLAGS
+from chessington.engine.tables import RAYS, ROOK_RAYS, BISHOP_RAYS, QUEEN_RAYS, KNIGHT_TARGETS, \
+    KING_TARGETS, PAWN_PUSHES, PAWN_CAPTURES, PAWN_DIRECTIONS
+
+STEPS = {'forward_step': (1, 0), 'backward_step': (-1, 0), 'left_step': (0, -1), 'right_step': (0, 1),
+         'forward_left_diagonal': (1, -1), 'forward_right_diagonal': (1, 1), 'backward_left_diagonal': (-1, -1),
+         'backward_right_diagonal': (-1, 1)}
 
 
 class Piece(ABC):
     """
-    An abstract base class from which all pieces inherit.
+    An abstract base class from which all pieces inherit. A piece only knows which player it belongs to; anything
+    about its history, such as whether it can still castle, is kept by the board.
     """
 
+    __slots__ = ('player',)
+
     def __init__(self, player):
         self.player = player
-        self.has_moved = False
 
     @abstractmethod
     def get_available_moves(self, board):
@@ -34,30 +42,41 @@ class Piece(ABC):
         return board.find_piece(self)
 
     def direction(self):
-        return {Player.WHITE: 1, Player.BLACK: -1}[self.player]
+        return PAWN_DIRECTIONS[self.player]
 
     def steps(self, board, move, limit):
+        row_step, col_step = STEPS[move]
+        direction = self.direction()
+        ray = RAYS[(row_step * direction, col_step * direction)][self.position(board).index]
         if limit:
-            move_limit = 1
-        elif not limit:
-            move_limit = 7
-        current_square = self.position(board)
+            ray = ray[:1]
+        return self.slide(board, (ray,))
+
+    def slide(self, board, rays):
+        """
+        Squares along each ray up to and including the first piece met, unless that piece is a friendly one.
+        """
+        moves = []
+        for ray in rays:
+            for square in ray:
+                piece = board.get_piece(square)
+                if piece is None:
+                    moves.append(square)
+                    continue
+                if piece.player != self.player:
+                    moves.append(square)
+                break
+        return moves
+
+    def jump(self, board, targets):
+        """
+        Those target squares that are not occupied by a friendly piece.
+        """
         moves = []
-        step = {'forward_step': [1, 0], 'backward_step': [-1, 0], 'left_step': [0, -1], 'right_step': [0, 1], \
-                'forward_left_diagonal': [1, -1], 'forward_right_diagonal': [1, 1], 'backward_left_diagonal': [-1, -1], \
-                'backward_right_diagonal': [-1, 1]}
-        xy = step[move]
-        for i in range(1, move_limit + 1):
-            next_square = Square.at(current_square.row + (self.direction() * i * xy[0]),
-                                    current_square.col + (self.direction() * i * xy[1]))
-            if board.in_board(next_square):
-                if board.square_is_empty(next_square):
-                    moves.append(next_square)
-                elif board.has_enemy(next_square):
-                    moves.append(next_square)
-                    break
-                elif board.has_friend(next_square):
-                    break
+        for square in targets:
+            piece = board.get_piece(square)
+            if piece is None or piece.player != self.player:
+                moves.append(square)
         return moves
 
 
@@ -66,30 +85,27 @@ class Pawn(Piece):
     A class representing a chess pawn.
     """
 
+    __slots__ = ()
+
     def get_available_moves(self, board):
         moves = []
-        forward_step = self.steps(board, 'forward_step', limit=True)[0]
-        if not board.has_enemy(forward_step):
-            moves.append(forward_step)
         current_square = self.position(board)
-        start_row = {Player.WHITE: 1, Player.BLACK: 6}[self.player]
-        if current_square.row == start_row:
-            double_step = Square.at(current_square.row + (2 * self.direction()), current_square.col)
-            if board.square_is_empty(double_step):
-                moves.append(double_step)
+        for square in PAWN_PUSHES[self.player][current_square.index]:
+            if not board.square_is_empty(square):
+                break
+            moves.append(square)
         moves += self.attackable_squares(board, current_square)
         return moves
 
     def attackable_squares(self, board, current_square):
-        left_diagonal = Square.at(current_square.row + self.direction(), current_square.col - 1)
-        left_en_passant = Square.at(current_square.row, current_square.col - 1)
-        right_diagonal = Square.at(current_square.row + self.direction(), current_square.col + 1)
-        right_en_passant = Square.at(current_square.row, current_square.col + 1)
         attack_moves = []
-        if board.has_enemy(left_diagonal) or board.en_passant == left_en_passant:
-            attack_moves.append(left_diagonal)
-        if board.has_enemy(right_diagonal) or board.en_passant == right_en_passant:
-            attack_moves.append(right_diagonal)
+        for square in PAWN_CAPTURES[self.player][current_square.index]:
+            piece = board.get_piece(square)
+            if piece is not None:
+                if piece.player != self.player:
+                    attack_moves.append(square)
+            elif board.en_passant == Square.at(current_square.row, square.col):
+                attack_moves.append(square)
         return attack_moves
 
 
@@ -98,23 +114,10 @@ class Knight(Piece):
     A class representing a chess knight.
     """
 
+    __slots__ = ()
+
     def get_available_moves(self, board):
-        current_square = self.position(board)
-        moves = [
-            Square.at(current_square.row + 2, current_square.col - 1),
-            Square.at(current_square.row + 2, current_square.col + 1),
-            Square.at(current_square.row - 2, current_square.col - 1),
-            Square.at(current_square.row - 2, current_square.col + 1),
-            Square.at(current_square.row + 1, current_square.col - 2),
-            Square.at(current_square.row - 1, current_square.col - 2),
-            Square.at(current_square.row + 1, current_square.col + 2),
-            Square.at(current_square.row - 1, current_square.col + 2)
-        ]
-        valid_moves = []
-        for move in moves:
-            if board.in_board(move):
-                valid_moves.append(move)
-        return valid_moves
+        return self.jump(board, KNIGHT_TARGETS[self.position(board).index])
 
 
 class Bishop(Piece):
@@ -122,13 +125,10 @@ class Bishop(Piece):
     A class representing a chess bishop.
     """
 
+    __slots__ = ()
+
     def get_available_moves(self, board):
-        moves = self.steps(board, 'forward_left_diagonal', limit=False) + self.steps(board, 'forward_right_diagonal',
-                                                                                     limit=False) \
-                + self.steps(board, 'backward_left_diagonal', limit=False) + self.steps(board,
-                                                                                        'backward_right_diagonal',
-                                                                                        limit=False)
-        return moves
+        return self.slide(board, BISHOP_RAYS[self.position(board).index])
 
 
 class Rook(Piece):
@@ -136,35 +136,38 @@ class Rook(Piece):
     A class representing a chess rook.
     """
 
+    __slots__ = ()
+
     def get_available_moves(self, board):
-        moves = self.steps(board, 'forward_step', limit=False) + self.steps(board, 'backward_step', limit=False) \
-                + self.steps(board, 'left_step', limit=False) + self.steps(board, 'right_step', limit=False)
-        return moves
+        return self.slide(board, ROOK_RAYS[self.position(board).index])
 
     def castling(self, board, castling):
         current_square = self.position(board)
-        if castling == 'left':
-            if self.has_moved == False:
+        if self.can_castle(board, current_square):
+            if castling == 'left':
                 board.move_piece(current_square, Square.at(current_square.row, current_square.col + 2))
-        elif castling == 'right':
-            if self.has_moved == False:
+            elif castling == 'right':
                 board.move_piece(current_square, Square.at(current_square.row, current_square.col - 2))
 
+    def can_castle(self, board, current_square):
+        """
+        Whether the board still gives this rook, on its current square, a right to castle.
+        """
+        rights = board.castling_rights()
+        home_row = {Player.WHITE: 0, Player.BLACK: 7}[self.player]
+        return any(rights & flag and player == self.player and current_square == Square.at(home_row, rook_col)
+                   for flag, player, rook_col in CASTLING_FLAGS)
+
 
 class Queen(Piece):
     """
     A class representing a chess queen.
     """
 
+    __slots__ = ()
+
     def get_available_moves(self, board):
-        moves = self.steps(board, 'forward_step', limit=False) + self.steps(board, 'backward_step', limit=False) \
-                + self.steps(board, 'left_step', limit=False) + self.steps(board, 'right_step', limit=False) \
-                + self.steps(board, 'forward_left_diagonal', limit=False) + self.steps(board, 'forward_right_diagonal',
-                                                                                       limit=False) \
-                + self.steps(board, 'backward_left_diagonal', limit=False) + self.steps(board,
-                                                                                        'backward_right_diagonal',
-                                                                                        limit=False)
-        return moves
+        return self.slide(board, QUEEN_RAYS[self.position(board).index])
 
 
 class King(Piece):
@@ -172,33 +175,26 @@ class King(Piece):
     A class representing a chess king.
     """
 
+    __slots__ = ()
+
     def get_available_moves(self, board):
-        moves = self.steps(board, 'forward_step', limit=True) + self.steps(board, 'backward_step', limit=True) \
-                + self.steps(board, 'left_step', limit=True) + self.steps(board, 'right_step', limit=True) \
-                + self.steps(board, 'forward_left_diagonal', limit=True) + self.steps(board, 'forward_right_diagonal',
-                                                                                      limit=True) \
-                + self.steps(board, 'backward_left_diagonal', limit=True) + self.steps(board, 'backward_right_diagonal',
-                                                                                       limit=True)
-        if self.has_moved == False:
-            current_square = self.position(board)
-            left_squares = [Square.at(current_square.row, current_square.col - 3),
-                            Square.at(current_square.row, current_square.col - 2), \
-                            Square.at(current_square.row, current_square.col - 1),
-                            Square.at(current_square.row, current_square.col + 1), \
-                            Square.at(current_square.row, current_square.col + 2)]
-            right_squares = [Square.at(current_square.row, current_square.col + 1),
-                             Square.at(current_square.row, current_square.col + 2)]
-            empty = True
-            for square in left_squares:
-                if not board.square_is_empty(square):
-                    empty = False
-            if empty:
-                moves.append(Square.at(current_square.row, current_square.col - 2))
-            empty = True
-            for square in right_squares:
-                if not board.square_is_empty(square):
-                    empty = False
-            if empty:
-                moves.append(Square.at(current_square.row, current_square.col + 2))
+        current_square = self.position(board)
+        return self.jump(board, KING_TARGETS[current_square.index]) + self.castling_moves(board, current_square)
 
+    def castling_moves(self, board, current_square):
+        """
+        The squares the king can castle to: the board must still give it the right to, with nothing in between it
+        and the rook.
+        """
+        home_row = {Player.WHITE: 0, Player.BLACK: 7}[self.player]
+        if current_square != Square.at(home_row, 4):
+            return []
+        rights = board.castling_rights()
+        moves = []
+        for flag, player, rook_col in CASTLING_FLAGS:
+            if player != self.player or not rights & flag:
+                continue
+            between_cols = range(1, 4) if rook_col == 0 else range(5, 7)
+            if all(board.square_is_empty(Square.at(home_row, col)) for col in between_cols):
+                moves.append(Square.at(home_row, 2 if rook_col == 0 else 6))
         return moves
@@ -0,0 +1,111 @@
+"""
+Replaying and checking large numbers of recorded games at once. Each game is a line of moves written as pairs of
+squares, such as 'e2e4 e7e5 g1f3'. The games are shared out in chunks across a pool of processes, and the result of
+each game is streamed back as soon as it is ready.
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+
+from chessington.engine.board import Board
+from chessington.engine.notation import legal_move_from_uci
+
+# The outcome of replaying a game: its position in the input, how many of its moves were played, the position it
+# reached in FEN, and why it stopped early (or None if every move was legal)
+GameResult = namedtuple('GameResult', 'index moves_played final_fen error')
+
+# Summary figures for a replay run
+ReplayStats = namedtuple('ReplayStats', 'games moves errors elapsed')
+
+
+def replay_game(index, line):
+    """
+    Plays the moves of one game from the starting position, stopping at the first one that is not legal. A pawn
+    reaching the far side of the board without a promotion piece given is promoted to a queen.
+    """
+    board = Board.at_starting_position()
+    moves_played = 0
+    for text in line.split():
+        try:
+            move = legal_move_from_uci(board, text)
+        except ValueError as error:
+            return GameResult(index, moves_played, board.to_fen(), str(error))
+        board.make_move(move)
+        moves_played += 1
+    return GameResult(index, moves_played, board.to_fen(), None)
+
+
+def replay_games(lines, workers=None, chunk_size=100, ordered=True):
+    """
+    Replays each game in the given lines across a pool of processes, yielding a GameResult per game. Blank lines are
+    skipped but still counted when numbering the games. In ordered mode the results come back in input order;
+    otherwise each chunk's results come back as soon as that chunk is done. Only a few chunks per worker are read
+    ahead, so the input can be much larger than memory.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(lines, chunk_size)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight_limit = 2 * workers
+        pending = deque(pool.submit(_replay_chunk, chunk) for chunk in islice(chunks, in_flight_limit))
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                done = [future for future in pending if future in finished]
+                for future in done:
+                    pending.remove(future)
+            for future in done:
+                yield from future.result()
+                for chunk in islice(chunks, 1):
+                    pending.append(pool.submit(_replay_chunk, chunk))
+
+
+def replay_file(path, output=sys.stdout, workers=None, chunk_size=100, ordered=True):
+    """
+    Replays every game in the file, writing one tab-separated line per game (its number, the moves played, 'ok'
+    or the error, and the final position) to the output, and returns the summary statistics.
+    """
+    start = time.perf_counter()
+    games = moves = errors = 0
+    with open(path) as games_file:
+        for result in replay_games(games_file, workers, chunk_size, ordered):
+            games += 1
+            moves += result.moves_played
+            errors += result.error is not None
+            output.write('{}\t{}\t{}\t{}\n'.format(result.index, result.moves_played, result.error or 'ok',
+                                                   result.final_fen))
+    return ReplayStats(games, moves, errors, time.perf_counter() - start)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Replay and check a file of games, one game per line.')
+    parser.add_argument('path', help='file of games, each a line of moves such as "e2e4 e7e5"')
+    parser.add_argument('--workers', type=int, default=None, help='number of processes (default: one per CPU)')
+    parser.add_argument('--chunk-size', type=int, default=100, help='number of games sent to a process at a time')
+    parser.add_argument('--unordered', action='store_true', help='write results as soon as they are ready')
+    options = parser.parse_args(args)
+
+    stats = replay_file(options.path, sys.stdout, options.workers, options.chunk_size, not options.unordered)
+    rate = (lambda count: count / stats.elapsed if stats.elapsed > 0 else 0)
+    print('Games: {} ({} with errors), moves: {}, time: {:.3f}s, {:.0f} games/second, {:.0f} moves/second'.format(
+        stats.games, stats.errors, stats.moves, stats.elapsed, rate(stats.games), rate(stats.moves)),
+        file=sys.stderr)
+
+
+def _replay_chunk(chunk):
+    return [replay_game(index, line) for index, line in chunk]
+
+
+def _chunks(lines, chunk_size):
+    numbered = ((index, line) for index, line in enumerate(lines) if line.strip())
+    while True:
+        chunk = list(islice(numbered, chunk_size))
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,316 @@
+"""
+Choosing a move for the computer. A negamax alpha-beta search looks one move deeper on each iteration, keeping
+the result of the last iteration to finish once its time or node budget runs out.
+"""
+
+import argparse
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from chessington.engine.board import Board
+from chessington.engine.data import Square
+from chessington.engine.evaluation import evaluate, PIECE_VALUES
+from chessington.engine.pieces import Pawn
+from chessington.engine.transposition import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+
+MATE_SCORE = 100000
+INFINITY = MATE_SCORE + 1
+MAX_DEPTH = 64
+
+# How many nodes are searched between looks at the clock
+CLOCK_CHECK_INTERVAL = 128
+
+# The outcome of a search: the move to play, its score for the player to move, how deep the search finished,
+# the line of play expected to follow, the nodes searched and the seconds taken
+SearchResult = namedtuple('SearchResult', 'best_move score depth pv nodes elapsed')
+
+
+class SearchTimeout(Exception):
+    """
+    Raised within a search when its budget is used up, abandoning the iteration in progress.
+    """
+
+
+class Searcher:
+    """
+    Searches a board for the best move for the player whose turn it is, within a depth, time and node budget.
+    The board is left as it was found. If root moves are given, only those moves are considered. The search also
+    ends soon after the stop event (anything with an is_set method) is set, and the result of each finished
+    iteration is passed to on_iteration.
+    """
+
+    def __init__(self, board, max_depth=MAX_DEPTH, time_limit=None, node_limit=None, table=None, root_moves=None,
+                 stop_event=None, on_iteration=None):
+        self.board = board
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.table = table
+        self.root_moves = root_moves
+        self.stop_event = stop_event
+        self.on_iteration = on_iteration
+        self.nodes = 0
+        self.iterations = []
+        self._deadline = None
+
+    def search(self):
+        start = time.perf_counter()
+        if self.time_limit is not None:
+            self._deadline = start + self.time_limit
+        self.nodes = 0
+        self.iterations = []
+        if self.table is not None:
+            self.table.new_search()
+
+        moves = self.root_moves if self.root_moves is not None else self.board.legal_moves()
+        if not moves:
+            score = -MATE_SCORE if self.board.is_check() else 0
+            return SearchResult(None, score, 0, [], 0, time.perf_counter() - start)
+
+        result = SearchResult(moves[0], 0, 0, [moves[0]], 0, 0.0)
+        pv = []
+        for depth in range(1, self.max_depth + 1):
+            try:
+                score, pv = self._negamax(depth, -INFINITY, INFINITY, 0, pv)
+            except SearchTimeout:
+                break
+            result = SearchResult(pv[0], score, depth, pv, self.nodes, time.perf_counter() - start)
+            self.iterations.append(result)
+            if self.on_iteration is not None:
+                self.on_iteration(result)
+            if abs(score) > MATE_SCORE - MAX_DEPTH:
+                break
+        return result._replace(nodes=self.nodes, elapsed=time.perf_counter() - start)
+
+    def _count_node(self):
+        self.nodes += 1
+        if self.node_limit is not None and self.nodes > self.node_limit:
+            raise SearchTimeout()
+        if self.nodes % CLOCK_CHECK_INTERVAL == 0:
+            if self._deadline is not None and time.perf_counter() > self._deadline:
+                raise SearchTimeout()
+            if self.stop_event is not None and self.stop_event.is_set():
+                raise SearchTimeout()
+
+    def _negamax(self, depth, alpha, beta, ply, pv):
+        """
+        The score of the position to the given depth, along with the line of moves leading to it. Moves from the
+        previous iteration's line are tried first.
+        """
+        self._count_node()
+        if depth == 0:
+            return self._quiesce(alpha, beta), []
+
+        key = None
+        first_move = pv[0] if pv else None
+        if self.table is not None:
+            key = self.table.hash_position(self.board)
+            entry = self.table.probe(key)
+            if entry is not None:
+                first_move = first_move or entry.move
+                score = _score_from_table(entry.score, ply)
+                if ply > 0 and entry.depth >= depth:
+                    line = [entry.move] if entry.move is not None else []
+                    if entry.bound == EXACT \
+                            or entry.bound == LOWER_BOUND and score >= beta \
+                            or entry.bound == UPPER_BOUND and score <= alpha:
+                        return min(max(score, alpha), beta), line
+
+        if ply == 0 and self.root_moves is not None:
+            moves = self.root_moves
+        else:
+            moves = self.board.legal_moves()
+        if not moves:
+            return (-MATE_SCORE + ply if self.board.is_check() else 0), []
+
+        original_alpha = alpha
+        best_pv = []
+        for move in self._order(moves, first_move):
+            child_pv = pv[1:] if pv and move == pv[0] else []
+            self.board.make_move(move)
+            try:
+                score, line = self._negamax(depth - 1, -beta, -alpha, ply + 1, child_pv)
+            finally:
+                self.board.unmake_move()
+            score = -score
+            if score > alpha:
+                alpha = score
+                best_pv = [move] + line
+                if alpha >= beta:
+                    break
+
+        if self.table is not None:
+            bound = LOWER_BOUND if alpha >= beta else EXACT if alpha > original_alpha else UPPER_BOUND
+            self.table.store(key, depth, _score_to_table(alpha, ply), bound, best_pv[0] if best_pv else None)
+        return alpha, best_pv
+
+    def _quiesce(self, alpha, beta):
+        """
+        Plays out captures until the position is quiet, so that the search never stops in the middle of an exchange.
+        """
+        standing_score = evaluate(self.board)
+        if standing_score >= beta:
+            return beta
+        alpha = max(alpha, standing_score)
+        captures = [move for move in self.board.legal_moves() if self._is_capture(move)]
+        for move in self._order(captures, None):
+            self._count_node()
+            self.board.make_move(move)
+            try:
+                score = -self._quiesce(-beta, -alpha)
+            finally:
+                self.board.unmake_move()
+            if score >= beta:
+                return beta
+            alpha = max(alpha, score)
+        return alpha
+
+    def _is_capture(self, move):
+        return self._captured_piece(move) is not None or move.promotion is not None
+
+    def _captured_piece(self, move):
+        """
+        The piece the move takes, if any, including a pawn taken en passant by a pawn moving diagonally onto an
+        empty square.
+        """
+        victim = self.board.get_piece(move.to_square)
+        if victim is None and move.from_square.col != move.to_square.col \
+                and isinstance(self.board.get_piece(move.from_square), Pawn):
+            victim = self.board.get_piece(Square.at(move.from_square.row, move.to_square.col))
+        return victim
+
+    def _order(self, moves, first_move):
+        """
+        Sorts moves so the likeliest best are tried first: the given move, then captures of the most valuable
+        pieces by the least valuable ones, then everything else.
+        """
+        def priority(move):
+            if move == first_move:
+                return -INFINITY
+            victim = self._captured_piece(move)
+            if victim is None:
+                return 0
+            attacker = self.board.get_piece(move.from_square)
+            return PIECE_VALUES[type(attacker)] - 10 * PIECE_VALUES[type(victim)] - 1
+        return sorted(moves, key=priority)
+
+
+def _score_to_table(score, ply):
+    # Mate scores are stored as distances from the position, not from the root of the search
+    if score > MATE_SCORE - MAX_DEPTH:
+        return score + ply
+    if score < -MATE_SCORE + MAX_DEPTH:
+        return score - ply
+    return score
+
+
+def _score_from_table(score, ply):
+    if score > MATE_SCORE - MAX_DEPTH:
+        return score - ply
+    if score < -MATE_SCORE + MAX_DEPTH:
+        return score + ply
+    return score
+
+
+def search(board, max_depth=MAX_DEPTH, time_limit=None, node_limit=None, table=None, workers=1, stop_event=None,
+           on_iteration=None, executor=None):
+    """
+    Finds the best move for the player whose turn it is, searching until the depth is reached, the time (in
+    seconds) or node budget runs out, or the stop event is set. Results are cached in the transposition table, if
+    one is given. With more than one worker, the search is shared across that many processes by parallel_search,
+    in the executor if one is given.
+    """
+    if workers > 1:
+        table_mb = table.size * 16 / (1024 * 1024) if table is not None else None
+        return parallel_search(board, workers, max_depth, time_limit, node_limit, table_mb, executor, stop_event,
+                               on_iteration)
+    return Searcher(board, max_depth, time_limit, node_limit, table, stop_event=stop_event,
+                    on_iteration=on_iteration).search()
+
+
+def parallel_search(board, workers, max_depth=MAX_DEPTH, time_limit=None, node_limit=None, table_mb=None,
+                    executor=None, stop_event=None, on_iteration=None):
+    """
+    Searches with the root moves split between worker processes, each deepening its own share of the moves with
+    its own transposition table. The answer is the best move at the deepest iteration every worker finished, and
+    is the only result passed to on_iteration. The node budget is divided between the workers, and a process pool
+    is created unless one is given as the executor. The time limit counts from this call, so the time taken to
+    start the workers is part of it. To be able to stop the workers, the stop event must be one that can be shared
+    between processes, such as one from a multiprocessing manager.
+    """
+    start = time.perf_counter()
+    moves = board.legal_moves()
+    if not moves:
+        return Searcher(board, max_depth).search()
+
+    # The workers' clocks cannot be compared with this process's performance counter, so they are given a deadline
+    # by the wall clock
+    deadline = time.time() + time_limit if time_limit is not None else None
+    shares = [moves[worker::workers] for worker in range(min(workers, len(moves)))]
+    worker_node_limit = node_limit // len(shares) if node_limit is not None else None
+    jobs = [(board, share, max_depth, deadline, worker_node_limit, table_mb, stop_event) for share in shares]
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=len(shares)) as pool:
+            worker_iterations = list(pool.map(_search_share, jobs))
+    else:
+        worker_iterations = list(executor.map(_search_share, jobs))
+
+    nodes = sum(iterations[-1].nodes for iterations in worker_iterations if iterations)
+    # A share that stopped deepening on finding a mate has its result settled at every deeper iteration too
+    depth = min(min(_settled_depth(iterations, max_depth) for iterations in worker_iterations),
+                max(len(iterations) for iterations in worker_iterations))
+    if depth == 0:
+        return SearchResult(moves[0], 0, 0, [moves[0]], nodes, time.perf_counter() - start)
+    best = max((iterations[min(depth, len(iterations)) - 1] for iterations in worker_iterations),
+               key=lambda result: result.score)
+    result = best._replace(depth=depth, nodes=nodes, elapsed=time.perf_counter() - start)
+    if on_iteration is not None:
+        on_iteration(result)
+    return result
+
+
+def _settled_depth(iterations, max_depth):
+    if iterations and abs(iterations[-1].score) > MATE_SCORE - MAX_DEPTH:
+        return max_depth
+    return len(iterations)
+
+
+# Each worker process's transposition table, kept from one search to the next as allocating it takes longer than
+# a short search
+_worker_tables = {}
+
+
+def _search_share(job):
+    board, moves, max_depth, deadline, node_limit, table_mb, stop_event = job
+    table = None
+    if table_mb is not None:
+        table = _worker_tables.get(table_mb)
+        if table is None:
+            table = _worker_tables.setdefault(table_mb, TranspositionTable(table_mb))
+    time_limit = max(deadline - time.time(), 0) if deadline is not None else None
+    searcher = Searcher(board, max_depth, time_limit, node_limit, table, root_moves=moves, stop_event=stop_event)
+    searcher.search()
+    return searcher.iterations
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Time a search from the starting position.')
+    parser.add_argument('depth', type=int, nargs='?', default=4, help='number of moves to look ahead')
+    parser.add_argument('--workers', type=int, default=1, help='number of processes to search with')
+    parser.add_argument('--hash', type=float, default=16, help='transposition table size in megabytes')
+    options = parser.parse_args(args)
+
+    board = Board.at_starting_position()
+    serial = search(board, max_depth=options.depth, table=TranspositionTable(options.hash))
+    _report('Serial', serial)
+    if options.workers > 1:
+        parallel = parallel_search(board, options.workers, max_depth=options.depth, table_mb=options.hash)
+        _report('Parallel ({} workers)'.format(options.workers), parallel)
+        print('Speedup: {:.2f}x'.format(serial.elapsed / parallel.elapsed))
+
+
+def _report(name, result):
+    print('{}: depth {}, score {}, {} nodes in {:.3f}s ({:.0f} nodes/second)'.format(
+        name, result.depth, result.score, result.nodes, result.elapsed,
+        result.nodes / result.elapsed if result.elapsed > 0 else 0))
@@ -0,0 +1,393 @@
+"""
+Endgame tablebases: every position of king and queen, king and rook, or king and pawn against a bare king, solved
+by retrograde analysis. Starting from the checkmates, the analysis works backwards a move at a time, so each
+position is known to be won, drawn or lost for the player to move, and how many moves (counted in plies) it takes
+to force mate.
+
+Tables are built from the side with the extra piece's point of view, called white here; positions where black has
+the piece are looked up with the board turned round. Symmetry keeps the tables small. Without a pawn the board can
+be rotated and reflected so that the stronger king is always in the a1-d1-d4 triangle, and with one it can be
+reflected so the pawn is always on the queenside. Each table holds one signed byte of result and one byte of
+distance per placement of the three pieces, for each player to move.
+"""
+
+import argparse
+import os
+import sys
+import time
+from array import array
+from collections import defaultdict, namedtuple
+
+from chessington.engine.data import Player, BOARD_SIZE
+from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King
+from chessington.engine.tables import KING_TARGETS, PAWN_CAPTURES, ROOK_RAYS, QUEEN_RAYS
+
+WIN, DRAW, LOSS = 1, 0, -1
+WHITE_TO_MOVE, BLACK_TO_MOVE = 0, 1
+
+# The piece the stronger side has in each ending, by the ending's name
+ENDINGS = {'KQK': Queen, 'KRK': Rook, 'KPK': Pawn}
+ENDING_NAMES = {piece_type: name for name, piece_type in ENDINGS.items()}
+
+# The outcome of a position for the player to move, and the number of plies to mate (0 for a draw)
+TablebaseResult = namedtuple('TablebaseResult', 'wdl dtm')
+
+SQUARES = range(BOARD_SIZE * BOARD_SIZE)
+
+# Move tables by square index, as sets of square indices
+KING_MOVES = [frozenset(square.index for square in targets) for targets in KING_TARGETS]
+PAWN_ATTACKS = [frozenset(square.index for square in targets) for targets in PAWN_CAPTURES[Player.WHITE]]
+SLIDER_RAYS = {piece_type: [[[square.index for square in ray] for ray in rays[index]] for index in SQUARES]
+               for piece_type, rays in ((Rook, ROOK_RAYS), (Queen, QUEEN_RAYS))}
+SLIDER_REACH = {piece_type: [frozenset(square for ray in rays[index] for square in ray) for index in SQUARES]
+                for piece_type, rays in SLIDER_RAYS.items()}
+
+# The squares strictly between two squares on a line, by the indices of the two squares
+BETWEEN = [[frozenset() for _ in SQUARES] for _ in SQUARES]
+for _from in SQUARES:
+    for _ray in SLIDER_RAYS[Queen][_from]:
+        for _position, _square in enumerate(_ray):
+            BETWEEN[_from][_square] = frozenset(_ray[:_position])
+
+
+def _transform(row_flip, col_flip, transpose):
+    def apply(index):
+        row, col = divmod(index, BOARD_SIZE)
+        if transpose:
+            row, col = col, row
+        if row_flip:
+            row = BOARD_SIZE - 1 - row
+        if col_flip:
+            col = BOARD_SIZE - 1 - col
+        return row * BOARD_SIZE + col
+    return tuple(apply(index) for index in SQUARES)
+
+
+# The eight symmetries of the board, identity first, as lookup tables from square index to square index
+SYMMETRIES = [_transform(row_flip, col_flip, transpose)
+              for transpose in (False, True) for row_flip in (False, True) for col_flip in (False, True)]
+MIRROR = SYMMETRIES[1]
+TRIANGLE = [index for index in SQUARES if index // BOARD_SIZE <= index % BOARD_SIZE < BOARD_SIZE // 2]
+KING_SYMMETRIES = [[symmetry for symmetry in SYMMETRIES if symmetry[index] in TRIANGLE] for index in SQUARES]
+PAWN_SQUARES = [index for index in SQUARES if 0 < index // BOARD_SIZE < BOARD_SIZE - 1
+                and index % BOARD_SIZE < BOARD_SIZE // 2]
+
+
+class Tablebase:
+    """
+    The solved positions of one ending. A placement is given as the square indices of the white king, white's
+    piece and the black king, for either player to move.
+    """
+
+    def __init__(self, piece_type, wdl=None, dtm=None):
+        self.piece_type = piece_type
+        self.name = ENDING_NAMES[piece_type]
+        if piece_type is Pawn:
+            self.king_squares, self.piece_squares = list(SQUARES), PAWN_SQUARES
+        else:
+            self.king_squares, self.piece_squares = TRIANGLE, list(SQUARES)
+        self._king_slots = {square: slot for slot, square in enumerate(self.king_squares)}
+        self._piece_slots = {square: slot for slot, square in enumerate(self.piece_squares)}
+        size = 2 * len(self.king_squares) * len(self.piece_squares) * len(SQUARES)
+        self.wdl = wdl if wdl is not None else array('b', bytes(size))
+        self.dtm = dtm if dtm is not None else array('B', bytes(size))
+
+    def canonical(self, white_king, piece, black_king):
+        """
+        The placement turned by whichever symmetry gives it the squares the table is indexed by.
+        """
+        if self.piece_type is Pawn:
+            symmetry = MIRROR if piece % BOARD_SIZE >= BOARD_SIZE // 2 else SYMMETRIES[0]
+            return symmetry[white_king], symmetry[piece], symmetry[black_king]
+        symmetries = KING_SYMMETRIES[white_king]
+        if len(symmetries) == 1:
+            symmetry = symmetries[0]
+            return symmetry[white_king], symmetry[piece], symmetry[black_king]
+        # With the king on a diagonal, two symmetries put it in the triangle, so the smaller result is chosen to
+        # keep every position and its mirror image in the same place
+        return min((symmetry[white_king], symmetry[piece], symmetry[black_king]) for symmetry in symmetries)
+
+    def index(self, to_move, white_king, piece, black_king):
+        """
+        Where the placement is stored, once turned to its canonical squares.
+        """
+        white_king, piece, black_king = self.canonical(white_king, piece, black_king)
+        return self._index(to_move, white_king, piece, black_king)
+
+    def probe(self, to_move, white_king, piece, black_king):
+        index = self.index(to_move, white_king, piece, black_king)
+        return TablebaseResult(self.wdl[index], self.dtm[index])
+
+    def placements(self):
+        """
+        Every canonical placement of the three pieces on different squares, legal or not.
+        """
+        for white_king in self.king_squares:
+            for piece in self.piece_squares:
+                if piece == white_king:
+                    continue
+                for black_king in SQUARES:
+                    if black_king != white_king and black_king != piece \
+                            and self.canonical(white_king, piece, black_king) == (white_king, piece, black_king):
+                        yield white_king, piece, black_king
+
+    def save(self, directory):
+        with open(os.path.join(directory, self.name.lower() + '.tb'), 'wb') as table_file:
+            self.wdl.tofile(table_file)
+            self.dtm.tofile(table_file)
+
+    @staticmethod
+    def load(directory, piece_type):
+        table = Tablebase(piece_type)
+        size = len(table.wdl)
+        with open(os.path.join(directory, table.name.lower() + '.tb'), 'rb') as table_file:
+            wdl, dtm = array('b'), array('B')
+            wdl.fromfile(table_file, size)
+            dtm.fromfile(table_file, size)
+        return Tablebase(piece_type, wdl, dtm)
+
+    def _index(self, to_move, white_king, piece, black_king):
+        return ((to_move * len(self.king_squares) + self._king_slots[white_king]) * len(self.piece_squares)
+                + self._piece_slots[piece]) * len(SQUARES) + black_king
+
+
+def generate(piece_type, promotion_tables=None):
+    """
+    Solves every position of the ending with the given piece. The pawn ending needs the queen and rook tables, to
+    know how its promotions turn out.
+    """
+    table = Tablebase(piece_type)
+    wdl, dtm = table.wdl, table.dtm
+    attacks = _attack_test(piece_type)
+
+    # Checkmates are the positions lost in 0 plies
+    frontier = []
+    for white_king, piece, black_king in table.placements():
+        if _legal(piece_type, BLACK_TO_MOVE, white_king, piece, black_king, attacks) \
+                and attacks(piece, black_king, white_king) \
+                and not _black_moves(white_king, piece, black_king, attacks):
+            index = table._index(BLACK_TO_MOVE, white_king, piece, black_king)
+            wdl[index] = LOSS
+            frontier.append((white_king, piece, black_king))
+
+    # Promotions win as quickly as the queen or rook ending they lead to, so are found when that distance is reached
+    promotions = defaultdict(list)
+    if piece_type is Pawn:
+        for white_king, piece, black_king in table.placements():
+            if piece // BOARD_SIZE == BOARD_SIZE - 2 and piece + BOARD_SIZE not in (white_king, black_king) \
+                    and _legal(piece_type, WHITE_TO_MOVE, white_king, piece, black_king, attacks):
+                distances = [promoted.probe(BLACK_TO_MOVE, white_king, piece + BOARD_SIZE, black_king)
+                             for promoted in promotion_tables]
+                losses = [result.dtm for result in distances if result.wdl == LOSS]
+                if losses:
+                    promotions[min(losses) + 1].append((white_king, piece, black_king))
+
+    plies = 0
+    while frontier or any(level > plies for level in promotions):
+        found = []
+        if plies % 2 == 0:
+            # Any move into a position lost for black wins for white
+            for white_king, piece, black_king in frontier:
+                for position in _white_unmoves(piece_type, white_king, piece, black_king, attacks):
+                    if _resolve(table, WHITE_TO_MOVE, position, WIN, plies + 1):
+                        found.append(position)
+            for position in promotions.pop(plies + 1, []):
+                if _resolve(table, WHITE_TO_MOVE, position, WIN, plies + 1):
+                    found.append(position)
+        else:
+            # A position is lost for black once every one of its moves leads to a win for white
+            for white_king, piece, black_king in frontier:
+                for position in _black_unmoves(white_king, piece, black_king):
+                    if table.probe(BLACK_TO_MOVE, *position).wdl == DRAW \
+                            and _all_moves_lose(table, position, attacks) \
+                            and _resolve(table, BLACK_TO_MOVE, position, LOSS, plies + 1):
+                        found.append(position)
+        frontier = [table.canonical(*position) for position in found]
+        plies += 1
+    return table
+
+
+def _resolve(table, to_move, position, wdl, dtm):
+    index = table.index(to_move, *position)
+    if table.wdl[index] != DRAW:
+        return False
+    table.wdl[index] = wdl
+    table.dtm[index] = dtm
+    return True
+
+
+def _attack_test(piece_type):
+    """
+    A function telling whether white's piece attacks a square, with the white king as the only possible blocker.
+    """
+    if piece_type is Pawn:
+        return lambda piece, square, white_king: square in PAWN_ATTACKS[piece]
+    reach = SLIDER_REACH[piece_type]
+    return lambda piece, square, white_king: square in reach[piece] and white_king not in BETWEEN[piece][square]
+
+
+def _legal(piece_type, to_move, white_king, piece, black_king, attacks):
+    if black_king in KING_MOVES[white_king]:
+        return False
+    if piece_type is Pawn and not 0 < piece // BOARD_SIZE < BOARD_SIZE - 1:
+        return False
+    return to_move == BLACK_TO_MOVE or not attacks(piece, black_king, white_king)
+
+
+def _black_moves(white_king, piece, black_king, attacks):
+    """
+    The black king's legal moves, as the squares it can go to. Taking white's piece is among them if it is not
+    defended.
+    """
+    return [square for square in KING_MOVES[black_king]
+            if square != white_king and square not in KING_MOVES[white_king]
+            and (square == piece or not attacks(piece, square, white_king))]
+
+
+def _all_moves_lose(table, position, attacks):
+    white_king, piece, black_king = position
+    moves = _black_moves(white_king, piece, black_king, attacks)
+    if not moves or piece in moves:
+        return False
+    return all(table.probe(WHITE_TO_MOVE, white_king, piece, square).wdl == WIN for square in moves)
+
+
+def _white_unmoves(piece_type, white_king, piece, black_king, attacks):
+    """
+    The positions with white to move from which white could have reached this one.
+    """
+    occupied = (white_king, piece, black_king)
+    for square in KING_MOVES[white_king]:
+        if square not in occupied and black_king not in KING_MOVES[square] \
+                and not attacks(piece, black_king, square):
+            yield square, piece, black_king
+    if piece_type is Pawn:
+        origins = []
+        if piece - BOARD_SIZE not in occupied:
+            origins.append(piece - BOARD_SIZE)
+            if piece // BOARD_SIZE == 3 and piece - 2 * BOARD_SIZE not in occupied:
+                origins.append(piece - 2 * BOARD_SIZE)
+        origins = [square for square in origins if square // BOARD_SIZE > 0]
+    else:
+        origins = []
+        for ray in SLIDER_RAYS[piece_type][piece]:
+            for square in ray:
+                if square in occupied:
+                    break
+                origins.append(square)
+    for square in origins:
+        if not attacks(square, black_king, white_king):
+            yield white_king, square, black_king
+
+
+def _black_unmoves(white_king, piece, black_king):
+    """
+    The positions with black to move from which black could have reached this one.
+    """
+    for square in KING_MOVES[black_king]:
+        if square != white_king and square != piece and square not in KING_MOVES[white_king]:
+            yield white_king, piece, square
+
+
+_TABLES = {}
+
+
+def load_tables(directory):
+    """
+    Loads whichever tables have been saved in the directory, returning the names of the endings loaded. Only loaded
+    tables, or ones already generated in this process, are probed.
+    """
+    loaded = []
+    for piece_type in ENDINGS.values():
+        if os.path.exists(os.path.join(directory, ENDING_NAMES[piece_type].lower() + '.tb')):
+            _TABLES[piece_type] = Tablebase.load(directory, piece_type)
+            loaded.append(ENDING_NAMES[piece_type])
+    return loaded
+
+
+def get_table(piece_type):
+    """
+    The table for the ending with the given piece, generated the first time it is needed unless already loaded.
+    """
+    if piece_type not in _TABLES:
+        promotion_tables = [get_table(Queen), get_table(Rook)] if piece_type is Pawn else None
+        _TABLES[piece_type] = generate(piece_type, promotion_tables)
+    return _TABLES[piece_type]
+
+
+def probe(board):
+    """
+    The result of the board's position for the player to move, or None if it is not one the loaded tables cover.
+    Generating a table takes seconds, so one that has not been loaded is never generated here. Bare kings, and a
+    lone bishop or knight against a king, are drawn without needing a table.
+    """
+    if board.castling_rights():
+        return None
+    pieces = {player: [(piece, board.find_piece(piece)) for piece in board.get_pieces(player)] for player in Player}
+    if sum(len(player_pieces) for player_pieces in pieces.values()) > 3:
+        return None
+    # Positions without exactly one king each are not chess positions the tables could hold
+    if any(sum(isinstance(piece, King) for piece, _ in pieces[player]) != 1 for player in Player):
+        return None
+    strong = max(Player, key=lambda player: len(pieces[player]))
+    others = [(piece, square) for piece, square in pieces[strong] if not isinstance(piece, King)]
+    if not others:
+        return TablebaseResult(DRAW, 0)
+    piece, piece_square = others[0]
+    if isinstance(piece, (Knight, Bishop)):
+        return TablebaseResult(DRAW, 0)
+    table = _TABLES.get(type(piece))
+    if table is None:
+        return None
+
+    # Black's positions are looked up as white's, with the board turned round
+    flip = 0 if strong == Player.WHITE else (BOARD_SIZE - 1) * BOARD_SIZE
+    white_king = _king_square(pieces[strong]).index ^ flip
+    black_king = _king_square(pieces[strong.opponent()]).index ^ flip
+    to_move = WHITE_TO_MOVE if board.current_player == strong else BLACK_TO_MOVE
+    return table.probe(to_move, white_king, piece_square.index ^ flip, black_king)
+
+
+def best_move(board):
+    """
+    The quickest winning move, or a drawing move, or the slowest losing move, by the tables. None if the board's
+    position is not one the loaded tables cover or there are no legal moves.
+    """
+    if probe(board) is None:
+        return None
+    best, best_rank = None, None
+    for move in board.legal_moves():
+        board.make_move(move)
+        try:
+            result = probe(board)
+        finally:
+            board.unmake_move()
+        # The result is for the opponent, so their quickest loss is best and their slowest win least bad
+        if result is None or result.wdl == DRAW:
+            rank = (1, 0)
+        elif result.wdl == LOSS:
+            rank = (0, result.dtm)
+        else:
+            rank = (2, -result.dtm)
+        if best_rank is None or rank < best_rank:
+            best, best_rank = move, rank
+    return best
+
+
+def _king_square(pieces):
+    return next(square for piece, square in pieces if isinstance(piece, King))
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Generate the endgame tablebases and save them to a directory.')
+    parser.add_argument('directory', help='directory to save the tables in')
+    options = parser.parse_args(args)
+
+    os.makedirs(options.directory, exist_ok=True)
+    for piece_type in (Queen, Rook, Pawn):
+        start = time.perf_counter()
+        table = get_table(piece_type)
+        table.save(options.directory)
+        wins = sum(1 for index in range(len(table.wdl) // 2) if table.wdl[index] == WIN)
+        print('{}: {} positions won for white to move, longest mate {} plies, {:.1f}s'.format(
+            table.name, wins, max(table.dtm), time.perf_counter() - start), file=sys.stderr)
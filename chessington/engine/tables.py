@@ -0,0 +1,66 @@
+"""
+Move tables for every square of the board, computed once when the module is imported. Each table is a list
+indexed by square.index, holding the squares a piece standing there could reach on an empty board.
+"""
+
+from chessington.engine.data import Player, Square, BOARD_SIZE
+
+ORTHOGONAL_STEPS = [(1, 0), (-1, 0), (0, -1), (0, 1)]
+DIAGONAL_STEPS = [(1, -1), (1, 1), (-1, -1), (-1, 1)]
+KNIGHT_JUMPS = [(2, -1), (2, 1), (-2, -1), (-2, 1), (1, -2), (-1, -2), (1, 2), (-1, 2)]
+
+PAWN_DIRECTIONS = {Player.WHITE: 1, Player.BLACK: -1}
+PAWN_START_ROWS = {Player.WHITE: 1, Player.BLACK: 6}
+
+
+def _on_board(row, col):
+    return 0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE
+
+
+def _all_squares():
+    return [Square.from_index(index) for index in range(BOARD_SIZE * BOARD_SIZE)]
+
+
+def _jump_table(jumps):
+    return [tuple(Square.at(square.row + row_step, square.col + col_step)
+                  for row_step, col_step in jumps if _on_board(square.row + row_step, square.col + col_step))
+            for square in _all_squares()]
+
+
+def _ray(square, row_step, col_step):
+    ray = []
+    row, col = square.row + row_step, square.col + col_step
+    while _on_board(row, col):
+        ray.append(Square.at(row, col))
+        row, col = row + row_step, col + col_step
+    return tuple(ray)
+
+
+def _pawn_pushes(player, square):
+    direction = PAWN_DIRECTIONS[player]
+    if not _on_board(square.row + direction, square.col):
+        return ()
+    if square.row == PAWN_START_ROWS[player]:
+        return Square.at(square.row + direction, square.col), Square.at(square.row + 2 * direction, square.col)
+    return Square.at(square.row + direction, square.col),
+
+
+def _pawn_captures(player, square):
+    direction = PAWN_DIRECTIONS[player]
+    return tuple(Square.at(square.row + direction, square.col + col_step)
+                 for col_step in (-1, 1) if _on_board(square.row + direction, square.col + col_step))
+
+
+# Squares a knight or king can jump to
+KNIGHT_TARGETS = _jump_table(KNIGHT_JUMPS)
+KING_TARGETS = _jump_table(ORTHOGONAL_STEPS + DIAGONAL_STEPS)
+
+# Rays of squares moving outwards from each square, keyed by the (row, col) step of the ray
+RAYS = {step: [_ray(square, *step) for square in _all_squares()] for step in ORTHOGONAL_STEPS + DIAGONAL_STEPS}
+ROOK_RAYS = [tuple(RAYS[step][index] for step in ORTHOGONAL_STEPS) for index in range(BOARD_SIZE * BOARD_SIZE)]
+BISHOP_RAYS = [tuple(RAYS[step][index] for step in DIAGONAL_STEPS) for index in range(BOARD_SIZE * BOARD_SIZE)]
+QUEEN_RAYS = [ROOK_RAYS[index] + BISHOP_RAYS[index] for index in range(BOARD_SIZE * BOARD_SIZE)]
+
+# Squares a pawn can advance to (including the double step from its starting row) or capture on
+PAWN_PUSHES = {player: [_pawn_pushes(player, square) for square in _all_squares()] for player in Player}
+PAWN_CAPTURES = {player: [_pawn_captures(player, square) for square in _all_squares()] for player in Player}
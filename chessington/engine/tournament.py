@@ -0,0 +1,223 @@
+"""
+Playing the computer against itself to measure changes in strength and speed. Two engine settings play a match,
+the games shared out across a pool of processes. Each game starts with a few random moves, and every opening is
+played twice with the colours swapped so that neither side is favoured by the luck of the draw.
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from chessington.engine.board import Board
+from chessington.engine.data import Player
+from chessington.engine.notation import move_to_uci
+from chessington.engine.pieces import Pawn, Rook, Queen
+from chessington.engine.search import search, MAX_DEPTH
+from chessington.engine.transposition import TranspositionTable
+
+WHITE_WINS = '1-0'
+BLACK_WINS = '0-1'
+DRAW = '1/2-1/2'
+
+# A game is given up as lost once both engines agree one side is this far ahead for this many moves in a row
+RESIGN_SCORE = 1000
+RESIGN_MOVES = 4
+
+# How one side of the match plays: its name, the seconds it may think per move, how deep it may look, and its
+# transposition table size in megabytes (or None for no table)
+EngineSettings = namedtuple('EngineSettings', 'name time_limit max_depth hash_mb',
+                            defaults=(1.0, MAX_DEPTH, 16))
+
+# The outcome of one game: its number, the names of the players, the result, why the game ended, the moves played,
+# and for each of white and black the nodes searched and seconds spent thinking
+GameRecord = namedtuple('GameRecord', 'index white black result reason moves nodes search_time')
+
+# Summary figures for a match, from the first engine's point of view. The Elo difference comes with the margin of
+# its 95% confidence interval, and the speeds are in nodes per second
+MatchSummary = namedtuple('MatchSummary', 'games wins losses draws score elo elo_margin first_nps second_nps')
+
+
+def play_game(index, first, second, opening_plies=4, seed=0, max_plies=200):
+    """
+    Plays one game of the match. The first engine has white in even-numbered games, and each pair of games shares
+    the same random opening. Games are adjudicated as drawn by the fifty move rule, threefold repetition, lack of
+    material or reaching the move limit, and as won once both engines agree one side is clearly winning.
+    """
+    white, black = (first, second) if index % 2 == 0 else (second, first)
+    engines = {Player.WHITE: white, Player.BLACK: black}
+    tables = {player: TranspositionTable(settings.hash_mb) if settings.hash_mb else None
+              for player, settings in engines.items()}
+    nodes = {Player.WHITE: 0, Player.BLACK: 0}
+    search_time = {Player.WHITE: 0.0, Player.BLACK: 0.0}
+
+    board = Board.at_starting_position()
+    moves = _play_opening(board, opening_plies, random.Random(seed + index // 2))
+    seen = {board.zobrist_key: 1}
+    white_ahead_run = black_ahead_run = 0
+
+    def record(result, reason):
+        return GameRecord(index, white.name, black.name, result, reason, moves,
+                          (nodes[Player.WHITE], nodes[Player.BLACK]),
+                          (search_time[Player.WHITE], search_time[Player.BLACK]))
+
+    while True:
+        outcome = _adjudicate(board, seen, len(moves), max_plies)
+        if outcome is not None:
+            return record(*outcome)
+
+        player = board.current_player
+        settings = engines[player]
+        result = search(board, settings.max_depth, settings.time_limit, table=tables[player])
+        nodes[player] += result.nodes
+        search_time[player] += result.elapsed
+
+        # Keep count of how long both engines have agreed that one side is winning
+        white_score = result.score if player == Player.WHITE else -result.score
+        white_ahead_run = white_ahead_run + 1 if white_score >= RESIGN_SCORE else 0
+        black_ahead_run = black_ahead_run + 1 if white_score <= -RESIGN_SCORE else 0
+        if white_ahead_run >= RESIGN_MOVES:
+            return record(WHITE_WINS, 'adjudicated')
+        if black_ahead_run >= RESIGN_MOVES:
+            return record(BLACK_WINS, 'adjudicated')
+
+        board.make_move(result.best_move)
+        moves.append(move_to_uci(result.best_move))
+        seen[board.zobrist_key] = seen.get(board.zobrist_key, 0) + 1
+
+
+def play_match(first, second, games, workers=None, opening_plies=4, seed=0, max_plies=200):
+    """
+    Plays the given number of games between the two engines across a pool of processes, yielding each GameRecord
+    as soon as its game is over.
+    """
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(play_game, index, first, second, opening_plies, seed, max_plies)
+                   for index in range(games)]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def summarise(records, first_name):
+    """
+    Totals up the games from the point of view of the engine with the given name.
+    """
+    wins = losses = draws = 0
+    nodes = {True: 0, False: 0}
+    search_time = {True: 0.0, False: 0.0}
+    for record in records:
+        first_is_white = record.white == first_name
+        if record.result == DRAW:
+            draws += 1
+        elif (record.result == WHITE_WINS) == first_is_white:
+            wins += 1
+        else:
+            losses += 1
+        nodes[first_is_white] += record.nodes[0]
+        nodes[not first_is_white] += record.nodes[1]
+        search_time[first_is_white] += record.search_time[0]
+        search_time[not first_is_white] += record.search_time[1]
+
+    games = wins + losses + draws
+    score = (wins + draws / 2) / games if games else 0.5
+    elo, elo_margin = _elo_difference(wins, losses, draws)
+    rate = (lambda side: nodes[side] / search_time[side] if search_time[side] > 0 else 0)
+    return MatchSummary(games, wins, losses, draws, score, elo, elo_margin, rate(True), rate(False))
+
+
+def _play_opening(board, plies, chooser):
+    moves = []
+    for _ in range(plies):
+        legal_moves = board.legal_moves()
+        if not legal_moves:
+            break
+        move = chooser.choice(legal_moves)
+        board.make_move(move)
+        moves.append(move_to_uci(move))
+    return moves
+
+
+def _adjudicate(board, seen, plies_played, max_plies):
+    """
+    The result and reason if the game is over, or None if it goes on.
+    """
+    if not board.legal_moves():
+        if board.is_check():
+            return (BLACK_WINS if board.current_player == Player.WHITE else WHITE_WINS), 'checkmate'
+        return DRAW, 'stalemate'
+    if board.halfmove_clock >= 100:
+        return DRAW, 'fifty move rule'
+    if seen[board.zobrist_key] >= 3:
+        return DRAW, 'repetition'
+    if _insufficient_material(board):
+        return DRAW, 'insufficient material'
+    if plies_played >= max_plies:
+        return DRAW, 'move limit'
+    return None
+
+
+def _insufficient_material(board):
+    # Only the kings and at most one bishop or knight between them
+    pieces = board.get_pieces(Player.WHITE) + board.get_pieces(Player.BLACK)
+    if any(isinstance(piece, (Pawn, Rook, Queen)) for piece in pieces):
+        return False
+    return len(pieces) <= 3
+
+
+def _elo_difference(wins, losses, draws):
+    """
+    The Elo difference implied by the score, with the margin of its 95% confidence interval. A clean sweep has no
+    finite difference, so the score is kept just short of it.
+    """
+    games = wins + losses + draws
+    if games == 0:
+        return 0.0, 0.0
+    score = (wins + draws / 2) / games
+    clamped = min(max(score, 0.5 / games), 1 - 0.5 / games)
+    elo = _elo(clamped)
+    variance = (wins * (1 - score) ** 2 + losses * score ** 2 + draws * (0.5 - score) ** 2) / games
+    deviation = math.sqrt(variance / games)
+    low = _elo(min(max(clamped - 1.96 * deviation, 0.5 / games), 1 - 0.5 / games))
+    high = _elo(min(max(clamped + 1.96 * deviation, 0.5 / games), 1 - 0.5 / games))
+    return elo, (high - low) / 2
+
+
+def _elo(score):
+    return 400 * math.log10(score / (1 - score))
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Play the computer against itself with two sets of settings.')
+    parser.add_argument('--games', type=int, default=20, help='number of games to play')
+    parser.add_argument('--workers', type=int, default=None, help='number of processes (default: one per CPU)')
+    parser.add_argument('--time', type=float, nargs=2, default=(0.1, 0.1), metavar=('FIRST', 'SECOND'),
+                        help='seconds each engine may think per move')
+    parser.add_argument('--depth', type=int, nargs=2, default=(MAX_DEPTH, MAX_DEPTH), metavar=('FIRST', 'SECOND'),
+                        help='how many moves each engine may look ahead')
+    parser.add_argument('--hash', type=float, nargs=2, default=(16, 16), metavar=('FIRST', 'SECOND'),
+                        help='transposition table size for each engine in megabytes (0 for none)')
+    parser.add_argument('--opening-plies', type=int, default=4, help='number of random moves to start each game')
+    parser.add_argument('--max-plies', type=int, default=200,
+                        help='number of moves by either side after which a game is drawn')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the random openings')
+    options = parser.parse_args(args)
+
+    first = EngineSettings('first', options.time[0], options.depth[0], options.hash[0])
+    second = EngineSettings('second', options.time[1], options.depth[1], options.hash[1])
+    records = []
+    for record in play_match(first, second, options.games, options.workers, options.opening_plies, options.seed,
+                             options.max_plies):
+        records.append(record)
+        print('Game {}: {} vs {}, {} ({}, {} moves)'.format(
+            record.index, record.white, record.black, record.result, record.reason, len(record.moves)))
+
+    summary = summarise(records, first.name)
+    print('Score: +{} -{} ={} ({:.1%}), Elo difference: {:+.0f} +/- {:.0f}'.format(
+        summary.wins, summary.losses, summary.draws, summary.score, summary.elo, summary.elo_margin),
+        file=sys.stderr)
+    print('Speed: first {:.0f} nodes/second, second {:.0f} nodes/second'.format(
+        summary.first_nps, summary.second_nps), file=sys.stderr)
@@ -0,0 +1,107 @@
+"""
+A transposition table: a fixed-size cache of search results, keyed by a hash of the position searched. The table is
+allocated in full when it is created, and never grows beyond the memory it was given.
+"""
+
+from array import array
+from collections import namedtuple
+
+from chessington.engine.data import Move, Square
+from chessington.engine.pieces import Knight, Bishop, Rook, Queen
+
+# Whether a stored score is exact, or only a lower or upper bound on the true score
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+
+# Each entry is one 64-bit key and one 64-bit word of packed data
+ENTRY_BYTES = 16
+ENTRIES_PER_BUCKET = 2
+
+SCORE_OFFSET = 1 << 17
+PROMOTION_CODES = {None: 0, Knight: 1, Bishop: 2, Rook: 3, Queen: 4}
+PROMOTION_TYPES = {code: piece_type for piece_type, code in PROMOTION_CODES.items()}
+
+TableEntry = namedtuple('TableEntry', 'depth score bound move')
+
+
+def encode_move(move):
+    """
+    Packs a move into 15 bits: 6 for each square, and 3 for the promotion piece type.
+    """
+    if move is None:
+        return 0
+    return move.from_square.index | move.to_square.index << 6 | PROMOTION_CODES[move.promotion] << 12
+
+
+def decode_move(code):
+    """
+    Unpacks a move packed by encode_move.
+    """
+    if code == 0:
+        return None
+    return Move(Square.from_index(code & 63), Square.from_index(code >> 6 & 63), PROMOTION_TYPES[code >> 12 & 7])
+
+
+class TranspositionTable:
+    """
+    A transposition table using at most the given number of megabytes. Each position hashes to a bucket of two
+    entries: the first keeps whichever result was searched deepest (or most recently, for a new search), while the
+    second is always replaced.
+    """
+
+    def __init__(self, size_mb=16):
+        entries = max(ENTRIES_PER_BUCKET, int(size_mb * 1024 * 1024) // ENTRY_BYTES)
+        self.bucket_count = entries // ENTRIES_PER_BUCKET
+        self.size = self.bucket_count * ENTRIES_PER_BUCKET
+        self.keys = array('Q', bytes(8 * self.size))
+        self.data = array('Q', bytes(8 * self.size))
+        self.age = 0
+
+    @staticmethod
+    def hash_position(board):
+        """
+        The 64-bit hash the table uses to identify the board's position.
+        """
+        return board.zobrist_key
+
+    def new_search(self):
+        """
+        Marks the start of a new search, so that deep but outdated results can make way for new ones.
+        """
+        self.age = (self.age + 1) & 63
+
+    def clear(self):
+        # Allocating new arrays is far quicker than zeroing every entry of the old ones one at a time
+        self.keys = array('Q', bytes(8 * self.size))
+        self.data = array('Q', bytes(8 * self.size))
+
+    def probe(self, key):
+        """
+        Looks up the stored result for the position with the given hash, or None if there isn't one.
+        """
+        first = (key % self.bucket_count) * ENTRIES_PER_BUCKET
+        for index in (first, first + 1):
+            data = self.data[index]
+            if data and self.keys[index] == key:
+                return TableEntry(data >> 1 & 255, (data >> 9 & 0x3FFFF) - SCORE_OFFSET, data >> 27 & 3,
+                                  decode_move(data >> 29 & 0x7FFF))
+        return None
+
+    def store(self, key, depth, score, bound, move):
+        """
+        Records the result of searching the position with the given hash to the given depth.
+        """
+        data = 1 | depth << 1 | (score + SCORE_OFFSET) << 9 | bound << 27 | encode_move(move) << 29 | self.age << 44
+        first = (key % self.bucket_count) * ENTRIES_PER_BUCKET
+        stored = self.data[first]
+        if not stored or self.keys[first] == key or depth >= (stored >> 1 & 255) or (stored >> 44) != self.age:
+            self.keys[first] = key
+            self.data[first] = data
+        else:
+            self.keys[first + 1] = key
+            self.data[first + 1] = data
+
+    def used(self):
+        """
+        The fraction of entries holding a result.
+        """
+        return sum(1 for data in self.data if data) / self.size
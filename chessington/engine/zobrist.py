@@ -0,0 +1,61 @@
+"""
+Zobrist hashing of chess positions. Every feature of a position (a piece on a square, the side to move, each
+castling right and an en passant file) has its own random 64-bit number, and a position's key is the XOR of the
+numbers for the features it has. Moving a piece then only needs a couple of XORs to update the key.
+"""
+
+import random
+
+from chessington.engine.data import Player
+from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King
+
+# A fixed seed, so that keys are the same in every process and can be stored
+_random = random.Random(20190601)
+
+PIECE_KEYS = {(player, piece_type): [_random.getrandbits(64) for _ in range(64)]
+              for player in Player for piece_type in [Pawn, Knight, Bishop, Rook, Queen, King]}
+BLACK_TO_MOVE_KEY = _random.getrandbits(64)
+_CASTLING_RIGHT_KEYS = [_random.getrandbits(64) for _ in range(4)]
+EN_PASSANT_KEYS = [_random.getrandbits(64) for _ in range(8)]
+
+
+def _castling_key(rights):
+    key = 0
+    for bit, right_key in enumerate(_CASTLING_RIGHT_KEYS):
+        if rights & (1 << bit):
+            key ^= right_key
+    return key
+
+
+# Keys for each combination of castling rights flags
+CASTLING_KEYS = [_castling_key(rights) for rights in range(16)]
+
+
+def piece_key(piece, square):
+    """
+    The key for the given piece standing on the given square.
+    """
+    return PIECE_KEYS[(piece.player, type(piece))][square.index]
+
+
+def state_key(current_player, castling_rights, en_passant_col):
+    """
+    The key for everything about a position other than where the pieces are.
+    """
+    key = CASTLING_KEYS[castling_rights]
+    if current_player == Player.BLACK:
+        key ^= BLACK_TO_MOVE_KEY
+    if en_passant_col is not None:
+        key ^= EN_PASSANT_KEYS[en_passant_col]
+    return key
+
+
+def compute_key(board):
+    """
+    Calculates the key of a board's position from scratch, without using the key the board keeps up to date.
+    """
+    key = 0
+    for player in Player:
+        for piece in board.get_pieces(player):
+            key ^= piece_key(piece, board.find_piece(piece))
+    return key ^ state_key(board.current_player, board.castling_rights(), board.en_passant_col())
@@ -0,0 +1,236 @@
+"""
+A headless game server, hosting many games at once over TCP. Clients send one JSON object per line and get one
+JSON object back per line. Every request has an "op" and may have an "id", which is echoed in the response:
+
+    {"op": "new", "fen": ...}                   start a game, optionally from a position, and get its "game" id
+    {"op": "state", "game": 1}                  the game's position, status and legal moves
+    {"op": "move", "game": 1, "move": "e2e4"}   play a move, given as a pair of squares
+    {"op": "engine", "game": 1, "time": 0.5}    have the computer choose and play a move
+    {"op": "close", "game": 1}                  end a game and forget it
+
+Successful responses have "ok": true; failed ones have "ok": false and an "error". The computer's thinking is done
+in a process pool, so the event loop is never held up by it.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+from chessington.engine import tablebase
+from chessington.engine.background import best_move
+from chessington.engine.board import Board
+from chessington.engine.book import open_book
+from chessington.engine.notation import legal_move_from_uci, move_to_uci
+
+DEFAULT_PORT = 8765
+DEFAULT_THINK_TIME = 1.0
+MAX_THINK_TIME = 30.0
+
+
+class RequestError(Exception):
+    """
+    Raised for a request that cannot be carried out, with a message to send back to the client.
+    """
+
+
+class Game:
+    """
+    A game hosted by the server. The lock stops a game being moved in while the computer is thinking about it.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.lock = asyncio.Lock()
+
+
+def game_status(board):
+    """
+    'checkmate', 'stalemate', 'check' or 'ongoing', for the player whose turn it is.
+    """
+    if board.legal_moves():
+        return 'check' if board.is_check() else 'ongoing'
+    return 'checkmate' if board.is_check() else 'stalemate'
+
+
+class GameServer:
+    """
+    Hosts any number of games, each identified by a number, for any number of connected clients.
+    """
+
+    def __init__(self, executor=None, think_time=DEFAULT_THINK_TIME, book_path=None):
+        self.executor = executor if executor is not None else ProcessPoolExecutor()
+        self.think_time = think_time
+        self.book_path = book_path
+        self.games = {}
+        self._game_ids = itertools.count(1)
+        self._handlers = {'new': self._new, 'state': self._state, 'move': self._move, 'engine': self._engine,
+                          'close': self._close}
+
+    async def start(self, host='127.0.0.1', port=DEFAULT_PORT):
+        """
+        Starts listening for connections, returning the asyncio server.
+        """
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = await self.handle_line(line)
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle_line(self, line):
+        """
+        The response to one line of the protocol.
+        """
+        try:
+            request = json.loads(line)
+        except ValueError:
+            request = None
+        if not isinstance(request, dict):
+            return {'ok': False, 'error': 'Requests must be JSON objects'}
+        response = await self.handle_request(request)
+        if 'id' in request:
+            response['id'] = request['id']
+        return response
+
+    async def handle_request(self, request):
+        handler = self._handlers.get(request.get('op'))
+        try:
+            if handler is None:
+                raise RequestError('Unknown op: {}'.format(request.get('op')))
+            return dict(ok=True, **await handler(request))
+        except (RequestError, ValueError) as error:
+            return {'ok': False, 'error': str(error)}
+        except Exception as error:
+            # Anything else going wrong fails only this request, not the connection and the client's other games
+            return {'ok': False, 'error': 'Internal error: {}: {}'.format(type(error).__name__, error)}
+
+    def _game(self, request):
+        game_id = request.get('game')
+        if not isinstance(game_id, int) or isinstance(game_id, bool):
+            raise RequestError('Expected a game id, not {}'.format(json.dumps(game_id)))
+        game = self.games.get(game_id)
+        if game is None:
+            raise RequestError('No such game: {}'.format(request.get('game')))
+        return game
+
+    @staticmethod
+    def _describe(game_id, board):
+        return {'game': game_id, 'fen': board.to_fen(), 'status': game_status(board)}
+
+    async def _new(self, request):
+        if 'fen' in request and not isinstance(request['fen'], str):
+            raise RequestError('Expected a FEN string, not {}'.format(json.dumps(request['fen'])))
+        board = Board.from_fen(request['fen']) if 'fen' in request else Board.at_starting_position()
+        game_id = next(self._game_ids)
+        self.games[game_id] = Game(board)
+        return self._describe(game_id, board)
+
+    async def _state(self, request):
+        board = self._game(request).board
+        description = self._describe(request['game'], board)
+        description['moves'] = [move_to_uci(move) for move in board.legal_moves()]
+        return description
+
+    async def _move(self, request):
+        game = self._game(request)
+        if game.lock.locked():
+            raise RequestError('The computer is thinking about this game')
+        move = legal_move_from_uci(game.board, str(request.get('move', '')))
+        game.board.make_move(move)
+        return self._describe(request['game'], game.board)
+
+    async def _engine(self, request):
+        game = self._game(request)
+        think_time = request.get('time', self.think_time)
+        if not isinstance(think_time, (int, float)) or isinstance(think_time, bool) \
+                or not (math.isfinite(think_time) and think_time > 0):
+            raise RequestError('Expected a positive number of seconds, not {}'.format(json.dumps(think_time)))
+        think_time = min(think_time, MAX_THINK_TIME)
+        async with game.lock:
+            loop = asyncio.get_running_loop()
+            move = await loop.run_in_executor(self.executor, best_move, game.board, think_time,
+                                              self.book_path)
+            if move is None:
+                raise RequestError('There are no legal moves')
+            game.board.make_move(move)
+        description = self._describe(request['game'], game.board)
+        description['move'] = move_to_uci(move)
+        return description
+
+    async def _close(self, request):
+        self._game(request)
+        del self.games[request['game']]
+        return {'game': request['game']}
+
+
+class GameClient:
+    """
+    A simple client for the game server, for trying it out and testing it.
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @staticmethod
+    async def connect(host='127.0.0.1', port=DEFAULT_PORT):
+        reader, writer = await asyncio.open_connection(host, port)
+        return GameClient(reader, writer)
+
+    async def send(self, op, **fields):
+        """
+        Sends a request and waits for its response.
+        """
+        self.writer.write(json.dumps(dict(op=op, **fields)).encode() + b'\n')
+        await self.writer.drain()
+        return json.loads(await self.reader.readline())
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def serve(host='127.0.0.1', port=DEFAULT_PORT, workers=None, think_time=DEFAULT_THINK_TIME, book_path=None,
+                tablebase_directory=None):
+    # Each worker process loads the tablebases as it starts, rather than on the first move that needs them
+    initializer, initargs = (tablebase.load_tables, (tablebase_directory,)) if tablebase_directory else (None, ())
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as executor:
+        server = await GameServer(executor, think_time, book_path).start(host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Host chess games over TCP, one JSON request per line.')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='port to listen on')
+    parser.add_argument('--workers', type=int, default=None, help='processes for the computer to think in')
+    parser.add_argument('--think-time', type=float, default=DEFAULT_THINK_TIME, help='seconds per computer move')
+    parser.add_argument('--book', default=None, help='opening book for the computer to play from')
+    parser.add_argument('--tablebases', default=None, help='directory of saved endgame tablebases to play from')
+    options = parser.parse_args(args)
+    if options.book is not None:
+        # Checked here, so that a missing book is reported at once rather than skipped over on every move
+        try:
+            open_book(options.book)
+        except OSError as error:
+            parser.error('cannot open book {}: {}'.format(options.book, error.strerror or error))
+    if options.tablebases is not None and not tablebase.load_tables(options.tablebases):
+        parser.error('no tablebases found in {}'.format(options.tablebases))
+    try:
+        asyncio.run(serve(options.host, options.port, options.workers, options.think_time, options.book,
+                          options.tablebases))
+    except KeyboardInterrupt:
+        pass
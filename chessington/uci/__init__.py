@@ -0,0 +1,278 @@
+"""
+A front-end speaking the Universal Chess Interface, so that the computer player can be used from any chess GUI or
+tournament manager. Commands are read one per line and the replies written one per line:
+
+    uci                             identify the engine and list its options
+    isready                         answered with readyok, even while searching
+    setoption name Hash value 32    set the transposition table size in megabytes
+    setoption name Threads value 4  set the number of processes to search with
+    setoption name Book value b.bin play from an opening book when it has the position, or <empty> for none
+    ucinewgame                      forget everything learnt from the last game
+    position startpos moves e2e4    set up a position, from the start or a FEN, then play the moves given
+    go depth 6                      search, also accepting movetime, wtime, btime, winc, binc, movestogo, nodes,
+                                    infinite and ponder, and answer with bestmove once done (or, for infinite and
+                                    ponder, once told to stop)
+    stop                            end the search now and answer with its best move so far
+    ponderhit                       the move pondered on was played, so answer with the best move now
+    quit                            stop searching and exit
+
+The search runs on a background thread, so commands keep being read while it thinks. Endgame tablebases saved with
+the tablebase command are loaded at startup with --tablebases DIR, and the positions they cover played from them.
+"""
+
+import argparse
+import multiprocessing
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from chessington.engine import tablebase
+from chessington.engine.board import Board
+from chessington.engine.book import open_book
+from chessington.engine.data import Player
+from chessington.engine.notation import STARTING_FEN, legal_move_from_uci, move_to_uci
+from chessington.engine.search import search, MATE_SCORE, MAX_DEPTH
+from chessington.engine.transposition import TranspositionTable
+
+ENGINE_NAME = 'Chessington'
+ENGINE_AUTHOR = 'The Chessington authors'
+
+DEFAULT_HASH_MB = 16
+MAX_HASH_MB = 1024
+DEFAULT_THREADS = 1
+MAX_THREADS = 64
+
+# With a clock, each move is given this share of the time left (plus half the increment), keeping a little back
+DEFAULT_MOVES_TO_GO = 30
+CLOCK_MARGIN_SECONDS = 0.05
+# The seconds to think for when given a clock without the time of the player to move
+DEFAULT_MOVE_SECONDS = 1.0
+
+
+class UciEngine:
+    """
+    Carries out UCI commands, passing each line of reply to the output function.
+    """
+
+    def __init__(self, output=print):
+        self.output = output
+        self.board = Board.at_starting_position()
+        self.hash_mb = DEFAULT_HASH_MB
+        self.threads = DEFAULT_THREADS
+        self.book = None
+        self.table = TranspositionTable(self.hash_mb)
+        self._search_thread = None
+        self._stop_event = threading.Event()
+        self._manager = None
+        self._executor = None
+        self._handlers = {'uci': self._uci, 'isready': self._isready, 'setoption': self._setoption,
+                          'ucinewgame': self._ucinewgame, 'position': self._position, 'go': self._go,
+                          'stop': self._stop, 'ponderhit': self._stop}
+
+    def handle(self, line):
+        """
+        Carries out one command, returning False once the engine has been told to quit. Unknown commands are
+        ignored, as the protocol asks.
+        """
+        words = line.split()
+        if not words:
+            return True
+        if words[0] == 'quit':
+            self.stop()
+            if self._manager is not None:
+                self._manager.shutdown()
+            if self._executor is not None:
+                self._executor.shutdown()
+            return False
+        handler = self._handlers.get(words[0])
+        if handler is not None:
+            try:
+                handler(words[1:])
+            except ValueError as error:
+                self.output('info string {}'.format(error))
+        return True
+
+    def stop(self):
+        """
+        Stops the search in progress, if any, waiting for it to report its best move.
+        """
+        if self._search_thread is not None:
+            self._stop_event.set()
+            self._search_thread.join()
+            self._search_thread = None
+
+    def _uci(self, _):
+        self.output('id name {}'.format(ENGINE_NAME))
+        self.output('id author {}'.format(ENGINE_AUTHOR))
+        self.output('option name Hash type spin default {} min 1 max {}'.format(DEFAULT_HASH_MB, MAX_HASH_MB))
+        self.output('option name Threads type spin default {} min 1 max {}'.format(DEFAULT_THREADS, MAX_THREADS))
+        self.output('option name Book type string default <empty>')
+        self.output('uciok')
+
+    def _isready(self, _):
+        self.output('readyok')
+
+    def _setoption(self, words):
+        if 'name' not in words or 'value' not in words:
+            raise ValueError('Expected setoption name <name> value <value>')
+        name = ' '.join(words[words.index('name') + 1:words.index('value')]).lower()
+        value = ' '.join(words[words.index('value') + 1:])
+        self.stop()
+        if name == 'hash':
+            self.hash_mb = min(max(int(value), 1), MAX_HASH_MB)
+            self.table = TranspositionTable(self.hash_mb)
+        elif name == 'threads':
+            self.threads = min(max(int(value), 1), MAX_THREADS)
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+        elif name == 'book':
+            self.book = None
+            if value not in ('', '<empty>'):
+                try:
+                    self.book = open_book(value)
+                except OSError as error:
+                    raise ValueError('Cannot open book {}: {}'.format(value, error.strerror or error))
+        else:
+            raise ValueError('Unknown option: {}'.format(name))
+
+    def _ucinewgame(self, _):
+        self.stop()
+        self.table.clear()
+        self.board = Board.at_starting_position()
+
+    def _position(self, words):
+        self.stop()
+        moves_at = words.index('moves') if 'moves' in words else len(words)
+        if words[:1] == ['startpos']:
+            fen = STARTING_FEN
+        elif words[:1] == ['fen']:
+            fen = ' '.join(words[1:moves_at])
+        else:
+            raise ValueError('Expected position startpos or position fen <fen>')
+        board = Board.from_fen(fen)
+        for text in words[moves_at + 1:]:
+            board.make_move(legal_move_from_uci(board, text))
+        self.board = board
+
+    def _go(self, words):
+        self.stop()
+        limits = _parse_go(words)
+        max_depth = limits.get('depth', MAX_DEPTH)
+        node_limit = limits.get('nodes')
+        # Infinite and ponder searches may only answer once told to stop, even if they finish sooner
+        until_stopped = 'infinite' in limits or 'ponder' in limits
+        time_limit = None if until_stopped else _time_limit(limits, self.board.current_player == Player.WHITE)
+
+        # When analysing or pondering, the book and tablebases are no use; otherwise their moves are played without
+        # searching
+        if not until_stopped:
+            move = self.book.choose(self.board) if self.book is not None else None
+            if move is None:
+                move = tablebase.best_move(self.board)
+            if move is not None:
+                self.output('bestmove {}'.format(move_to_uci(move)))
+                return
+
+        if self.threads > 1:
+            # The worker processes can only see an event shared through a manager
+            if self._manager is None:
+                self._manager = multiprocessing.Manager()
+            self._stop_event = self._manager.Event()
+            # The worker processes are started once and kept for every search, as starting them takes longer than
+            # a short search
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.threads)
+        else:
+            self._stop_event = threading.Event()
+        self._search_thread = threading.Thread(
+            target=self._search, args=(self.board, max_depth, time_limit, node_limit, self._stop_event, until_stopped),
+            daemon=True)
+        self._search_thread.start()
+
+    def _stop(self, _):
+        self.stop()
+
+    def _search(self, board, max_depth, time_limit, node_limit, stop_event, until_stopped):
+        result = search(board, max_depth, time_limit, node_limit, self.table, self.threads, stop_event,
+                        on_iteration=self._report, executor=self._executor)
+        if until_stopped:
+            stop_event.wait()
+        best_move = move_to_uci(result.best_move) if result.best_move is not None else '0000'
+        self.output('bestmove {}'.format(best_move))
+
+    def _report(self, result):
+        if result.depth == 0:
+            return
+        milliseconds = int(result.elapsed * 1000)
+        nps = int(result.nodes / result.elapsed) if result.elapsed > 0 else 0
+        self.output('info depth {} score {} nodes {} nps {} time {} pv {}'.format(
+            result.depth, _format_score(result.score), result.nodes, nps, milliseconds,
+            ' '.join(move_to_uci(move) for move in result.pv)))
+
+
+def _parse_go(words):
+    limits = {}
+    index = 0
+    while index < len(words):
+        word = words[index]
+        if word in ('infinite', 'ponder'):
+            limits[word] = True
+            index += 1
+        elif word in ('depth', 'movetime', 'wtime', 'btime', 'winc', 'binc', 'movestogo', 'nodes'):
+            if index + 1 >= len(words):
+                raise ValueError('Missing value for {}'.format(word))
+            limits[word] = int(words[index + 1])
+            index += 2
+        else:
+            index += 1
+    return limits
+
+
+def _time_limit(limits, white_to_move):
+    """
+    The seconds to think for: the move time if one was given, otherwise a share of the clock, or no limit at all if
+    there is no clock.
+    """
+    if 'movetime' in limits:
+        return limits['movetime'] / 1000
+    remaining = limits.get('wtime' if white_to_move else 'btime')
+    if remaining is None:
+        return DEFAULT_MOVE_SECONDS if 'wtime' in limits or 'btime' in limits else None
+    increment = limits.get('winc' if white_to_move else 'binc', 0)
+    # A movestogo of 0 or less means nothing, so is treated as not given
+    moves_to_go = limits.get('movestogo', 0)
+    share = remaining / (moves_to_go if moves_to_go > 0 else DEFAULT_MOVES_TO_GO) + increment / 2
+    return max(min(share, remaining) / 1000 - CLOCK_MARGIN_SECONDS, 0.01)
+
+
+def _format_score(score):
+    if abs(score) > MATE_SCORE - MAX_DEPTH:
+        plies = MATE_SCORE - abs(score)
+        moves = (plies + 1) // 2
+        return 'mate {}'.format(moves if score > 0 else -moves)
+    return 'cp {}'.format(score)
+
+
+def main(input_stream=None, output_stream=None, args=None):
+    parser = argparse.ArgumentParser(description='Speak the Universal Chess Interface on standard input and output.')
+    parser.add_argument('--tablebases', default=None, help='directory of saved endgame tablebases to play from')
+    options = parser.parse_args(args)
+    if options.tablebases is not None and not tablebase.load_tables(options.tablebases):
+        parser.error('no tablebases found in {}'.format(options.tablebases))
+
+    input_stream = input_stream or sys.stdin
+    output_stream = output_stream or sys.stdout
+    lock = threading.Lock()
+
+    def output(line):
+        # Replies come from both the command loop and the search thread
+        with lock:
+            output_stream.write(line + '\n')
+            output_stream.flush()
+
+    engine = UciEngine(output)
+    for line in input_stream:
+        if not engine.handle(line):
+            return
+    engine.handle('quit')
@@ -2,13 +2,18 @@
 A GUI chess board that can be interacted with, and pieces moved around on.
 """
 
+import argparse
 import os
+from concurrent.futures import ProcessPoolExecutor
 
 import PySimpleGUI as psg
 
+from chessington.engine import tablebase
 from chessington.engine.board import Board, BOARD_SIZE
 from chessington.engine.data import Player, Square
 from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King
+from chessington.engine.background import BackgroundWorker, legal_destinations, best_move
+from chessington.engine.movegen import PROMOTION_TYPES
 
 IMAGES_BASE_DIRECTORY = 'images'
 
@@ -17,13 +22,22 @@ WHITE_SQUARE_COLOUR = '#F0D9B5'
 FROM_SQUARE_COLOUR = '#33A1FF'
 TO_SQUARE_COLOUR = '#B633FF'
 
+# How often the window checks for finished background work, and how long the computer thinks for
+POLL_INTERVAL_MS = 50
+THINK_TIME_SECONDS = 2.0
+HINT_KEY = 'hint'
+
+BLANK_IMAGE = os.path.join(IMAGES_BASE_DIRECTORY, 'blank.png')
+PIECE_IMAGES = {
+    (piece_class, player): os.path.join(IMAGES_BASE_DIRECTORY, piece_name + colour_suffix + '.png')
+    for piece_class, piece_name in { Pawn: 'pawn', Knight: 'knight', Bishop: 'bishop', Rook: 'rook', Queen: 'queen', King: 'king' }.items()
+    for player, colour_suffix in { Player.WHITE: 'w', Player.BLACK: 'b' }.items()
+}
+
 def get_image_name_from_piece(piece):
     if piece is None:
-        return os.path.join(IMAGES_BASE_DIRECTORY, 'blank.png')
-    class_to_piece_name = { Pawn: 'pawn', Knight: 'knight', Bishop: 'bishop', Rook: 'rook', Queen: 'queen', King: 'king' }
-    player_to_colour_suffix = { Player.WHITE: 'w', Player.BLACK: 'b' }
-    image_name = class_to_piece_name[piece.__class__] + player_to_colour_suffix[piece.player] + '.png'
-    return os.path.join(IMAGES_BASE_DIRECTORY, image_name)
+        return BLANK_IMAGE
+    return PIECE_IMAGES[(piece.__class__, piece.player)]
 
 def get_key_from_square(square):
     return (square.row, square.col)
@@ -41,68 +55,171 @@ def render_square(board, square):
 def render_board(board):
     return [[render_square(board, Square.at(row, col)) for col in range(BOARD_SIZE)] for row in range(BOARD_SIZE - 1, -1, -1)]
 
-def update_pieces(window, board):
+def get_square_states(board, from_square, to_squares):
+    """
+    The image and colour each square should be showing, keyed by the square's element key.
+    """
+    states = {}
     for row in range(BOARD_SIZE):
         for col in range(BOARD_SIZE):
-            image_file = get_image_name_from_piece(board.get_piece(Square.at(row, col)))
-            element = window.FindElement(key=(row, col))
-            element.Update(image_filename=image_file)
-
-def set_square_colour(window, square, colour):
-    element = window.FindElement(key=(square.row, square.col))
-    element.Update(button_color=('white', colour))
-
-def reset_square_colours(window):
-    for row in range(BOARD_SIZE):
-        for col in range(BOARD_SIZE):
-            colour = get_square_colour(Square.at(row, col))
-            element = window.FindElement(key=(row, col))
-            element.Update(button_color=('white', colour))
-
-def highlight_squares(window, from_square, to_squares):
-    reset_square_colours(window)
+            square = Square.at(row, col)
+            states[get_key_from_square(square)] = (get_image_name_from_piece(board.get_piece(square)), get_square_colour(square))
     if from_square is not None:
-        set_square_colour(window, from_square, FROM_SQUARE_COLOUR)
+        key = get_key_from_square(from_square)
+        states[key] = (states[key][0], FROM_SQUARE_COLOUR)
     for square in to_squares:
-        set_square_colour(window, square, TO_SQUARE_COLOUR)
-
-def play_game():
+        key = get_key_from_square(square)
+        states[key] = (states[key][0], TO_SQUARE_COLOUR)
+    return states
+
+def update_squares(window, rendered, states):
+    """
+    Updates only those squares whose image or colour differs from what was last rendered, recording the new state.
+    """
+    for key, (image_file, colour) in states.items():
+        rendered_image, rendered_colour = rendered[key]
+        changes = {}
+        if image_file != rendered_image:
+            changes['image_filename'] = image_file
+        if colour != rendered_colour:
+            changes['button_color'] = ('white', colour)
+        if changes:
+            window.FindElement(key=key).Update(**changes)
+            rendered[key] = (image_file, colour)
+
+def choose_promotion():
+    """
+    Asks which piece a pawn should be promoted to, with a button for each. Closing the window chooses a queen.
+    """
+    layout = [[psg.Text('Promote the pawn to:')],
+              [psg.Button(piece_type.__name__, key=piece_type) for piece_type in PROMOTION_TYPES]]
+    window = psg.Window('Promotion').Layout(layout)
+    try:
+        button, _ = window.Read()
+    finally:
+        window.Close()
+    return button if button in PROMOTION_TYPES else Queen
+
+def choose_move(board, from_square, to_square):
+    """
+    The legal move between the two squares, asking which piece to promote to if there is a choice.
+    """
+    moves = [move for move in board.legal_moves() if move.from_square == from_square and move.to_square == to_square]
+    if len(moves) == 1:
+        return moves[0]
+    promotion = choose_promotion()
+    return next(move for move in moves if move.promotion is promotion)
+
+def get_game_over_message(board):
+    """
+    What to tell the players once the player to move has no legal moves, or None while the game goes on.
+    """
+    if board.legal_moves():
+        return None
+    if board.is_check():
+        return 'Checkmate - Player ' + board.current_player.opponent().name + ' wins!'
+    return 'Stalemate - the game is drawn.'
+
+def play_game(computer_player=None, think_time=THINK_TIME_SECONDS, tablebase_directory=None):
     psg.ChangeLookAndFeel('GreenTan')
 
     board = Board.at_starting_position()
-    board_layout = render_board(board)
+    board_layout = render_board(board) + [[psg.Button('Hint', key=HINT_KEY)]]
     window = psg.Window('Chessington', default_button_element_size=(12, 1), auto_size_buttons=False).Layout(board_layout)
+    if tablebase_directory is not None:
+        # The worker process loads the tablebases as it starts, rather than on the first move that needs them
+        worker = BackgroundWorker(ProcessPoolExecutor(max_workers=1, initializer=tablebase.load_tables,
+                                                      initargs=(tablebase_directory,)))
+    else:
+        worker = BackgroundWorker()
 
     from_square = None
     to_squares = []
+    game_over = False
+    rendered = get_square_states(board, from_square, to_squares)
+
+    def start_computer_move():
+        if board.current_player == computer_player:
+            worker.submit('reply', best_move, board, think_time, stoppable=True)
+
+    def check_game_over():
+        nonlocal game_over
+        message = get_game_over_message(board)
+        if message is not None:
+            game_over = True
+            update_squares(window, rendered, get_square_states(board, from_square, to_squares))
+            psg.Popup(message, title='Game over')
+        return game_over
 
     def handle_click(row, col):
 
         nonlocal window, board, from_square, to_squares
         clicked_piece = board.get_piece(Square.at(row, col))
 
+        # Leave the board alone once the game is over, or while the computer is thinking about its move
+        if game_over or board.current_player == computer_player:
+            return
+
         # If making an allowed move, then make it
         if from_square is not None and any(s.row == row and s.col == col for s in to_squares):
-            board.get_piece(from_square).move_to(board, Square.at(row, col))
+            worker.cancel()
+            board.make_move(choose_move(board, from_square, Square.at(row, col)))
             from_square, to_squares = None, []
+            if not check_game_over():
+                start_computer_move()
 
-        # If clicking on a piece whose turn it is, get its allowed moves
+        # If clicking on a piece whose turn it is, work out its allowed moves in the background
         elif clicked_piece is not None and clicked_piece.player == board.current_player:
             from_square = Square.at(row, col)
-            to_squares = clicked_piece.get_available_moves(board)
+            to_squares = []
+            worker.submit('moves', legal_destinations, board, from_square)
 
         # Otherwise reset everthing to default
         else:
+            worker.cancel()
             from_square, to_squares = None, []
 
-    while True:
-
-        # Check for a square being clicked on and react appropriately
-        button, _ = window.Read()
-        if button is not None:
-            handle_click(*button)
-
-        # Update the UI
-        highlight_squares(window, from_square, to_squares)
-        update_pieces(window, board)
-
+    def handle_result(kind, result):
+
+        nonlocal from_square, to_squares
+        if kind == 'moves':
+            to_squares = result
+        elif kind == 'hint' and result is not None:
+            from_square, to_squares = result.from_square, [result.to_square]
+        elif kind == 'reply' and result is not None:
+            board.make_move(result)
+            from_square, to_squares = result.from_square, [result.to_square]
+            check_game_over()
+
+    try:
+        while True:
+
+            # Check for a square being clicked on, or background work finishing, and react appropriately
+            button, _ = window.Read(timeout=POLL_INTERVAL_MS)
+            if button is None:
+                break
+            if button == HINT_KEY and not game_over and board.current_player != computer_player:
+                from_square, to_squares = None, []
+                worker.submit('hint', best_move, board, think_time, stoppable=True)
+            elif isinstance(button, tuple):
+                handle_click(*button)
+            finished = worker.poll()
+            if finished is not None:
+                handle_result(*finished)
+
+            # Update the UI
+            update_squares(window, rendered, get_square_states(board, from_square, to_squares))
+    finally:
+        worker.shutdown()
+        window.Close()
+
+def main(args=None, computer_player=None):
+    parser = argparse.ArgumentParser(description='Play chess in a window.')
+    parser.add_argument('--tablebases', default=None, help='directory of saved endgame tablebases to play from')
+    options = parser.parse_args(args)
+    if options.tablebases is not None and not tablebase.load_tables(options.tablebases):
+        parser.error('no tablebases found in {}'.format(options.tablebases))
+    play_game(computer_player=computer_player, tablebase_directory=options.tablebases)
+
+def play_against_computer(args=None):
+    main(args, computer_player=Player.BLACK)
@@ -0,0 +1,104 @@
+import random
+
+from chessington.engine.attacks import AttackMap
+from chessington.engine.board import Board
+from chessington.engine.data import Player, Square, Move
+from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King
+from chessington.engine.tables import RAYS, ORTHOGONAL_STEPS, DIAGONAL_STEPS, KNIGHT_TARGETS, KING_TARGETS, \
+    PAWN_CAPTURES
+
+SLIDER_STEPS = {Rook: ORTHOGONAL_STEPS, Bishop: DIAGONAL_STEPS, Queen: ORTHOGONAL_STEPS + DIAGONAL_STEPS}
+
+def attacked_squares(board, player):
+    # Worked out from scratch by following every piece's attacks, to check the attack map against
+    attacked = set()
+    for piece in board.get_pieces(player):
+        index = board.find_piece(piece).index
+        piece_type = type(piece)
+        if piece_type is Pawn:
+            attacked.update(PAWN_CAPTURES[player][index])
+        elif piece_type is Knight:
+            attacked.update(KNIGHT_TARGETS[index])
+        elif piece_type is King:
+            attacked.update(KING_TARGETS[index])
+        else:
+            for step in SLIDER_STEPS[piece_type]:
+                for square in RAYS[step][index]:
+                    attacked.add(square)
+                    if board.get_piece(square) is not None:
+                        break
+    return attacked
+
+def test_starting_position_attacks():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    third_row_attacked = [board.is_attacked(Square.at(2, col), Player.WHITE) for col in range(8)]
+    middle_attacked = board.is_attacked(Square.at(3, 4), Player.WHITE)
+
+    # Assert
+    assert all(third_row_attacked)
+    assert not middle_attacked
+    assert board.attackers(Square.at(2, 5)) == [Square.at(0, 6), Square.at(1, 4), Square.at(1, 6)]
+
+def test_moving_a_piece_opens_and_closes_lines():
+
+    # Arrange
+    board = Board.at_starting_position()
+    board.attackers(Square.at(0, 0))
+
+    # Act
+    board.make_move(Move(Square.at(1, 4), Square.at(3, 4)))
+    after_opening = board.attackers(Square.at(4, 7))
+    board.make_move(Move(Square.at(6, 4), Square.at(4, 4)))
+    board.make_move(Move(Square.at(0, 6), Square.at(2, 5)))
+    after_closing = board.attackers(Square.at(4, 7))
+
+    # Assert
+    assert after_opening == [Square.at(0, 3)]
+    assert after_closing == []
+
+def test_attacks_stay_up_to_date_through_random_games():
+
+    # Arrange
+    chooser = random.Random(24)
+    board = Board.at_starting_position()
+    board.attackers(Square.at(0, 0))
+    mismatches = 0
+
+    # Act
+    for _ in range(300):
+        moves = board.legal_moves()
+        if not moves:
+            board = Board.at_starting_position()
+            board.attackers(Square.at(0, 0))
+            continue
+        board.make_move(chooser.choice(moves))
+        if chooser.random() < 0.2:
+            board.unmake_move()
+        fresh = AttackMap(board)
+        if (fresh.attackers, fresh.counts) != (board._attack_map.attackers, board._attack_map.counts):
+            mismatches += 1
+        for player in Player:
+            if attacked_squares(board, player) != {square for square in map(Square.from_index, range(64))
+                                                   if board.is_attacked(square, player)}:
+                mismatches += 1
+
+    # Assert
+    assert mismatches == 0
+
+def test_forks_keep_their_own_attacks():
+
+    # Arrange
+    board = Board.at_starting_position(backend='bitboard')
+    board.attackers(Square.at(0, 0))
+    fork = board.fork()
+
+    # Act
+    fork.make_move(Move(Square.at(1, 3), Square.at(3, 3)))
+
+    # Assert
+    assert fork.is_attacked(Square.at(5, 7), Player.WHITE)
+    assert not board.is_attacked(Square.at(5, 7), Player.WHITE)
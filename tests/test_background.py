@@ -0,0 +1,76 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from chessington.engine.board import Board
+from chessington.engine.data import Square
+from chessington.engine.background import BackgroundWorker, legal_destinations, best_move
+
+def wait_for(worker):
+    for _ in range(200):
+        finished = worker.poll()
+        if finished is not None:
+            return finished
+        time.sleep(0.01)
+    raise AssertionError('Background job did not finish')
+
+def test_legal_destinations_of_a_knight():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    squares = legal_destinations(board, Square.at(0, 1))
+
+    # Assert
+    assert squares == [Square.at(2, 0), Square.at(2, 2)]
+
+def test_worker_returns_the_result_of_its_job():
+
+    # Arrange
+    worker = BackgroundWorker()
+    board = Board.at_starting_position()
+
+    # Act
+    worker.submit('reply', best_move, board, 0.1)
+    kind, move = wait_for(worker)
+    worker.shutdown()
+
+    # Assert
+    assert kind == 'reply'
+    assert move in board.legal_moves()
+
+def test_only_the_latest_job_is_returned():
+
+    # Arrange
+    worker = BackgroundWorker(ThreadPoolExecutor(max_workers=1))
+    board = Board.at_starting_position()
+
+    # Act
+    worker.submit('moves', legal_destinations, board, Square.at(1, 0))
+    worker.submit('moves', legal_destinations, board, Square.at(1, 7))
+    kind, squares = wait_for(worker)
+
+    # Assert
+    assert squares == [Square.at(2, 7), Square.at(3, 7)]
+    assert worker.poll() is None
+    assert worker.busy_with is None
+
+def test_cancelling_a_search_frees_the_worker_for_the_next_job():
+
+    # Arrange
+    worker = BackgroundWorker()
+    board = Board.at_starting_position()
+    worker.submit('reply', best_move, board, 10.0, None, stoppable=True)
+    time.sleep(0.5)
+
+    # Act
+    start = time.perf_counter()
+    worker.submit('moves', legal_destinations, board, Square.at(0, 1))
+    kind, squares = wait_for(worker)
+    elapsed = time.perf_counter() - start
+    worker.shutdown()
+
+    # Assert
+    assert kind == 'moves'
+    assert squares == [Square.at(2, 0), Square.at(2, 2)]
+    assert elapsed < 1.0
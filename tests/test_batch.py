@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from chessington.engine.batch import to_planes, white_to_move, planes_from_encoded, evaluate_batch, mobility
+from chessington.engine.board import Board
+from chessington.engine.data import Player, Square
+from chessington.engine.encoding import encode_all, PIECE_CODES
+from chessington.engine.evaluation import evaluate
+from chessington.engine.pieces import Pawn, King
+
+def random_boards(count, seed=25):
+    chooser = random.Random(seed)
+    boards = []
+    for _ in range(count):
+        board = Board.at_starting_position()
+        for _ in range(chooser.randrange(60)):
+            moves = board.legal_moves()
+            if not moves:
+                break
+            board.make_move(chooser.choice(moves))
+        boards.append(board)
+    return boards
+
+def test_planes_mark_each_piece_on_its_square():
+
+    # Act
+    planes = to_planes([Board.at_starting_position()])
+
+    # Assert
+    assert planes.shape == (1, 12, 64)
+    assert planes.dtype == np.uint8
+    assert planes.sum() == 32
+    assert planes[0, PIECE_CODES[(Player.WHITE, King)], Square.at(0, 4).index] == 1
+    assert planes[0, PIECE_CODES[(Player.BLACK, Pawn)]].sum() == 8
+
+def test_planes_can_be_read_straight_from_encoded_positions():
+
+    # Arrange
+    boards = random_boards(20)
+
+    # Act
+    planes, to_move = planes_from_encoded(encode_all(boards))
+
+    # Assert
+    assert (planes == to_planes(boards)).all()
+    assert (to_move == white_to_move(boards)).all()
+
+def test_material_and_piece_squares_match_the_single_board_evaluation():
+
+    # Arrange
+    boards = random_boards(30)
+
+    # Act
+    scores = evaluate_batch(boards)
+
+    # Assert
+    assert list(scores.material + scores.piece_square) == [evaluate(board) for board in boards]
+
+def test_mobility_counts_the_moves_of_every_piece_but_pawns():
+
+    # Arrange
+    boards = [Board.at_starting_position(), Board.from_fen('4k3/8/8/8/8/8/8/R3K3 w - - 0 1')]
+
+    # Act
+    balance = mobility(to_planes(boards))
+
+    # Assert
+    assert list(balance) == [0, (10 + 5) - 5]
+
+def test_scores_are_from_the_point_of_view_of_the_player_to_move():
+
+    # Arrange
+    white = Board.from_fen('4k3/8/8/8/8/8/8/R3K3 w - - 0 1')
+    black = Board.from_fen('4k3/8/8/8/8/8/8/R3K3 b - - 0 1')
+
+    # Act
+    scores = evaluate_batch([white, black])
+
+    # Assert
+    assert scores.total[0] == -scores.total[1] > 0
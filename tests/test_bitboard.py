@@ -0,0 +1,79 @@
+from chessington.engine.bitboard import BitBoard, square_bit
+from chessington.engine.board import Board
+from chessington.engine.data import Player, Square, Move
+from chessington.engine.pieces import Pawn, Knight
+
+def test_bitboard_backend_can_be_chosen_at_starting_position():
+
+    # Arrange
+    board = Board.at_starting_position(backend='bitboard')
+
+    # Act
+    white_pawns = board.pieces_mask(Player.WHITE, Pawn)
+
+    # Assert
+    assert isinstance(board, BitBoard)
+    assert white_pawns == 0xFF00
+    assert board.occupied == 0xFFFF00000000FFFF
+
+def test_bitboard_tracks_moved_pieces():
+
+    # Arrange
+    board = Board.at_starting_position(backend='bitboard')
+    from_square = Square.at(0, 1)
+    to_square = Square.at(2, 2)
+
+    # Act
+    board.move_piece(from_square, to_square)
+
+    # Assert
+    assert board.square_is_empty(from_square)
+    assert not board.square_is_empty(to_square)
+    assert board.pieces_mask(Player.WHITE, Knight) == square_bit(to_square) | square_bit(Square.at(0, 6))
+
+def test_bitboard_answers_enemy_and_friend_queries():
+
+    # Arrange
+    board = Board.empty(backend='bitboard')
+    board.set_piece(Square.at(3, 3), Pawn(Player.WHITE))
+    board.set_piece(Square.at(4, 4), Pawn(Player.BLACK))
+
+    # Act
+    friend = board.has_friend(Square.at(3, 3))
+    enemy = board.has_enemy(Square.at(4, 4))
+
+    # Assert
+    assert friend and enemy
+    assert not board.has_enemy(Square.at(3, 3))
+    assert not board.has_friend(Square.at(8, 3))
+
+def test_bitboard_forks_keep_their_own_occupancy():
+
+    # Arrange
+    board = Board.at_starting_position(backend='bitboard')
+    fork = board.fork()
+
+    # Act
+    fork.make_move(Move(Square.at(1, 4), Square.at(3, 4)))
+
+    # Assert
+    assert board.square_is_empty(Square.at(3, 4))
+    assert not fork.square_is_empty(Square.at(3, 4))
+    assert board.pieces_mask(Player.WHITE, Pawn) != fork.pieces_mask(Player.WHITE, Pawn)
+
+def test_bitboard_attacks_match_the_list_board():
+
+    # Arrange
+    fen = 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1'
+    board = Board.from_fen(fen)
+    bitboard = Board.from_fen(fen, backend='bitboard')
+    squares = [Square.at(row, col) for row in range(8) for col in range(8)]
+
+    # Act
+    attacks = [(square, player, bitboard.is_attacked(square, player)) for square in squares for player in Player]
+    attackers = [set(bitboard.attackers(square)) for square in squares]
+
+    # Assert
+    assert attacks == [(square, player, board.is_attacked(square, player)) for square in squares for player in Player]
+    assert attackers == [set(board.attackers(square)) for square in squares]
+    assert set(bitboard.legal_moves()) == set(board.legal_moves())
@@ -1,5 +1,10 @@
-from chessington.engine.board import Board
-from chessington.engine.data import Player, Square
+import pickle
+
+import pytest
+
+from chessington.engine.board import Board, WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE
+from chessington.engine.data import Player, Square, Move
+from chessington.engine.pieces import Pawn, Knight, Rook, King
 
 def test_new_board_has_white_pieces_at_bottom():
 
@@ -35,4 +40,241 @@ def test_pieces_can_be_moved_on_the_board():
     board.move_piece(from_square, to_square)
 
     assert board.get_piece(from_square) is None
-    assert board.get_piece(to_square) is piece
\ No newline at end of file
+    assert board.get_piece(to_square) is piece
+
+def test_moved_pieces_can_be_found_at_their_new_square():
+
+    # Arrange
+    board = Board.at_starting_position()
+    from_square = Square.at(1, 4)
+    piece = board.get_piece(from_square)
+
+    # Act
+    to_square = Square.at(3, 4)
+    board.move_piece(from_square, to_square)
+
+    # Assert
+    assert board.find_piece(piece) == to_square
+
+def test_new_board_lists_sixteen_pieces_per_player():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    white_pieces = board.get_pieces(Player.WHITE)
+    black_pawns = board.get_pieces(Player.BLACK, Pawn)
+
+    # Assert
+    assert len(white_pieces) == 16
+    assert len(black_pawns) == 8
+
+def test_captured_pieces_are_no_longer_listed():
+
+    # Arrange
+    board = Board.empty()
+    attacker = Rook(Player.WHITE)
+    victim = Pawn(Player.BLACK)
+    board.set_piece(Square.at(0, 0), attacker)
+    board.set_piece(Square.at(5, 0), victim)
+
+    # Act
+    board.move_piece(Square.at(0, 0), Square.at(5, 0))
+
+    # Assert
+    assert board.get_pieces(Player.BLACK) == []
+    assert board.find_piece(attacker) == Square.at(5, 0)
+
+def test_unmaking_a_capture_restores_both_pieces():
+
+    # Arrange
+    board = Board.empty()
+    attacker = Rook(Player.WHITE)
+    victim = Pawn(Player.BLACK)
+    board.set_piece(Square.at(0, 0), attacker)
+    board.set_piece(Square.at(5, 0), victim)
+    board.make_move(Move(Square.at(0, 0), Square.at(5, 0)))
+
+    # Act
+    board.unmake_move()
+
+    # Assert
+    assert board.get_piece(Square.at(0, 0)) is attacker
+    assert board.get_piece(Square.at(5, 0)) is victim
+    assert board.current_player == Player.WHITE
+
+def test_castling_moves_the_rook_and_can_be_unmade():
+
+    # Arrange
+    board = Board.empty()
+    king = King(Player.WHITE)
+    rook = Rook(Player.WHITE)
+    board.set_piece(Square.at(0, 4), king)
+    board.set_piece(Square.at(0, 7), rook)
+
+    # Act
+    board.make_move(Move(Square.at(0, 4), Square.at(0, 6)))
+    castled_rook_square = board.find_piece(rook)
+    rights_after_castling = board.castling_rights()
+    board.unmake_move()
+
+    # Assert
+    assert castled_rook_square == Square.at(0, 5)
+    assert rights_after_castling == 0
+    assert board.get_piece(Square.at(0, 7)) is rook
+    assert board.get_piece(Square.at(0, 4)) is king
+    assert board.castling_rights() == WHITE_KINGSIDE
+
+def test_en_passant_captures_the_passed_pawn_and_can_be_unmade():
+
+    # Arrange
+    board = Board.empty()
+    pawn = Pawn(Player.WHITE)
+    enemy = Pawn(Player.BLACK)
+    board.set_piece(Square.at(4, 4), pawn)
+    board.set_piece(Square.at(6, 3), enemy)
+    board.current_player = Player.BLACK
+    board.make_move(Move(Square.at(6, 3), Square.at(4, 3)))
+
+    # Act
+    board.make_move(Move(Square.at(4, 4), Square.at(5, 3)))
+    captured = board.square_is_empty(Square.at(4, 3))
+    board.unmake_move()
+
+    # Assert
+    assert captured
+    assert board.get_piece(Square.at(4, 3)) is enemy
+    assert board.en_passant == Square.at(4, 3)
+
+def test_promotion_needs_no_input_and_can_be_unmade(monkeypatch):
+
+    # Arrange
+    board = Board.empty()
+    pawn = Pawn(Player.WHITE)
+    board.set_piece(Square.at(6, 0), pawn)
+    monkeypatch.setattr('builtins.input', lambda prompt: pytest.fail('make_move asked for input'))
+
+    # Act
+    board.make_move(Move(Square.at(6, 0), Square.at(7, 0), Knight))
+    promoted = board.get_piece(Square.at(7, 0))
+    board.unmake_move()
+
+    # Assert
+    assert isinstance(promoted, Knight)
+    assert board.get_piece(Square.at(6, 0)) is pawn
+    assert board.square_is_empty(Square.at(7, 0))
+    assert board.get_pieces(Player.WHITE) == [pawn]
+
+def test_moving_a_rook_loses_only_its_castling_right():
+
+    # Arrange
+    board = Board.at_starting_position()
+    board.set_piece(Square.at(1, 7), None)
+
+    # Act
+    board.make_move(Move(Square.at(0, 7), Square.at(2, 7)))
+    board.make_move(Move(Square.at(6, 0), Square.at(5, 0)))
+    board.make_move(Move(Square.at(2, 7), Square.at(0, 7)))
+
+    # Assert
+    assert board.castling_rights() == WHITE_QUEENSIDE | BLACK_KINGSIDE | BLACK_QUEENSIDE
+
+def test_pieces_have_no_instance_dictionary():
+
+    # Arrange
+    pawn = Pawn(Player.WHITE)
+
+    # Act / Assert
+    assert not hasattr(pawn, '__dict__')
+    with pytest.raises(AttributeError):
+        pawn.has_moved = True
+
+def test_forks_share_rows_until_one_board_changes():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    fork = board.fork()
+    shared_before = fork.board[1] is board.board[1]
+    fork.make_move(Move(Square.at(1, 4), Square.at(3, 4)))
+
+    # Assert
+    assert shared_before
+    assert fork.board[1] is not board.board[1]
+    assert fork.board[0] is board.board[0]
+    assert isinstance(board.get_piece(Square.at(1, 4)), Pawn)
+    assert board.square_is_empty(Square.at(3, 4))
+    assert board.to_fen() == Board.at_starting_position().to_fen()
+
+def test_changing_the_original_board_leaves_a_snapshot_alone():
+
+    # Arrange
+    board = Board.at_starting_position()
+    board.make_move(Move(Square.at(1, 4), Square.at(3, 4)))
+    snapshot = board.snapshot()
+
+    # Act
+    board.make_move(Move(Square.at(6, 3), Square.at(4, 3)))
+    board.make_move(Move(Square.at(3, 4), Square.at(4, 3)))
+
+    # Assert
+    assert snapshot.current_player == Player.BLACK
+    assert len(snapshot.get_pieces(Player.BLACK)) == 16
+    assert snapshot.zobrist_key != board.zobrist_key
+    assert snapshot.find_piece(snapshot.get_piece(Square.at(3, 4))) == Square.at(3, 4)
+
+def test_forks_can_take_back_moves_made_before_the_fork():
+
+    # Arrange
+    board = Board.at_starting_position()
+    starting_key = board.zobrist_key
+    board.make_move(Move(Square.at(1, 4), Square.at(3, 4)))
+
+    # Act
+    fork = board.fork()
+    fork.unmake_move()
+
+    # Assert
+    assert fork.zobrist_key == starting_key
+    assert board.get_piece(Square.at(3, 4)) is not None
+    assert len(board.legal_moves()) == 20
+
+def test_forks_share_the_piece_index_until_one_board_changes():
+
+    # Arrange
+    board = Board.at_starting_position()
+    for _ in range(20):
+        board.make_move(board.legal_moves()[0])
+        board.make_move(board.legal_moves()[-1])
+
+    # Act
+    fork = board.fork()
+    shared_before = fork._squares is board._squares and fork._undo_stack is board._undo_stack
+    board.unmake_move()
+    fork.make_move(fork.legal_moves()[0])
+
+    # Assert
+    assert shared_before
+    assert fork._squares is not board._squares
+    assert fork._undo_stack[1] is not board._undo_stack
+    fork.unmake_move()
+    fork.unmake_move()
+    assert fork.to_fen() == board.to_fen()
+
+def test_boards_with_long_games_can_be_pickled():
+
+    # Arrange
+    board = Board.at_starting_position()
+    knight_moves = [Move(Square.at(0, 6), Square.at(2, 5)), Move(Square.at(7, 6), Square.at(5, 5)),
+                    Move(Square.at(2, 5), Square.at(0, 6)), Move(Square.at(5, 5), Square.at(7, 6))]
+    for ply in range(2000):
+        board.make_move(knight_moves[ply % 4])
+
+    # Act
+    copied = pickle.loads(pickle.dumps(board))
+    for _ in range(2000):
+        copied.unmake_move()
+
+    # Assert
+    assert copied.to_fen() == Board.at_starting_position().to_fen()
@@ -0,0 +1,137 @@
+import io
+import random
+
+from chessington.engine.background import best_move
+from chessington.engine.board import Board
+from chessington.engine.book import BookBuilder, OpeningBook, RECORD, MAX_WEIGHT
+from chessington.engine.data import Move, Square
+from chessington.engine.pgn import read_games
+
+PGN = '''[Event "One"]
+[Result "1-0"]
+
+1. e4 e5 2. Nf3 Nc6 1-0
+
+[Event "Two"]
+[Result "0-1"]
+
+1. e4 c5 0-1
+
+[Event "Three"]
+[Result "1/2-1/2"]
+
+1. d4 d5 1/2-1/2
+'''
+
+E2E4 = Move(Square.at(1, 4), Square.at(3, 4))
+D2D4 = Move(Square.at(1, 3), Square.at(3, 3))
+
+def build_book(path, plies=20):
+    builder = BookBuilder()
+    for game in read_games(io.StringIO(PGN)):
+        builder.add_game(game, plies)
+    builder.write(str(path))
+    return OpeningBook(str(path))
+
+def test_moves_are_weighted_by_how_the_game_went(tmp_path):
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    with build_book(tmp_path / 'book.bin') as book:
+        entries = book.entries(board)
+
+    # Assert
+    assert sorted(entries) == sorted([(E2E4, 2), (D2D4, 1)])
+
+def test_losing_moves_are_left_out(tmp_path):
+
+    # Arrange
+    board = Board.at_starting_position()
+    board.make_move(E2E4)
+
+    # Act
+    with build_book(tmp_path / 'book.bin') as book:
+        moves = [entry.move for entry in book.entries(board)]
+
+    # Assert
+    assert moves == [Move(Square.at(6, 2), Square.at(4, 2))]
+
+def test_records_are_sorted_by_key(tmp_path):
+
+    # Arrange
+    path = tmp_path / 'book.bin'
+    build_book(path).close()
+
+    # Act
+    data = path.read_bytes()
+    keys = [RECORD.unpack_from(data, offset)[0] for offset in range(0, len(data), RECORD.size)]
+
+    # Assert
+    assert len(data) % RECORD.size == 0
+    assert keys == sorted(keys)
+
+def test_positions_not_in_the_book_have_no_move(tmp_path):
+
+    # Arrange
+    board = Board.from_fen('4k3/8/8/8/8/8/8/4K3 w - - 0 1')
+
+    # Act
+    with build_book(tmp_path / 'book.bin') as book:
+        move = book.choose(board)
+
+    # Assert
+    assert move is None
+
+def test_weights_too_large_to_store_are_scaled_down(tmp_path):
+
+    # Arrange
+    board = Board.at_starting_position()
+    builder = BookBuilder()
+    builder.add(board, E2E4, 4 * MAX_WEIGHT)
+    builder.add(board, D2D4, 2 * MAX_WEIGHT)
+    builder.write(str(tmp_path / 'book.bin'))
+
+    # Act
+    with OpeningBook(str(tmp_path / 'book.bin')) as book:
+        weights = dict(book.entries(board))
+
+    # Assert
+    assert weights == {E2E4: MAX_WEIGHT, D2D4: MAX_WEIGHT // 2}
+
+def test_empty_book_can_be_opened(tmp_path):
+
+    # Arrange
+    BookBuilder().write(str(tmp_path / 'book.bin'))
+
+    # Act
+    with OpeningBook(str(tmp_path / 'book.bin')) as book:
+        move = book.choose(Board.at_starting_position(), random.Random(1))
+
+    # Assert
+    assert len(book) == 0
+    assert move is None
+
+def test_computer_plays_from_the_book_without_searching(tmp_path):
+
+    # Arrange
+    path = tmp_path / 'book.bin'
+    build_book(path, plies=1).close()
+
+    # Act
+    move = best_move(Board.at_starting_position(), 0.0, str(path))
+
+    # Assert
+    assert move in (E2E4, D2D4)
+
+def test_computer_searches_when_the_book_cannot_be_read(tmp_path):
+
+    # Arrange
+    board = Board.from_fen('6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1')
+
+    # Act
+    move = best_move(board, 0.5, str(tmp_path / 'missing.bin'))
+
+    # Assert
+    assert move == Move(Square.at(0, 0), Square.at(7, 0))
@@ -0,0 +1,31 @@
+from chessington.engine.data import Square
+
+def test_squares_on_the_board_are_shared():
+
+    # Act
+    first = Square.at(3, 4)
+    second = Square.at(3, 4)
+
+    # Assert
+    assert first is second
+
+def test_squares_can_be_converted_to_and_from_an_index():
+
+    # Arrange
+    square = Square.at(7, 6)
+
+    # Act
+    index = square.index
+
+    # Assert
+    assert index == 62
+    assert Square.from_index(index) is square
+    assert Square.from_index(0) == Square.at(0, 0)
+
+def test_squares_off_the_board_can_still_be_created():
+
+    # Act
+    square = Square.at(8, -1)
+
+    # Assert
+    assert square.row == 8 and square.col == -1
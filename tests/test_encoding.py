@@ -0,0 +1,41 @@
+from chessington.engine.board import Board
+from chessington.engine.encoding import encode, decode, encode_all, decode_all, POSITION_BYTES
+
+def test_positions_encode_to_a_fixed_width():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    data = encode(board)
+
+    # Assert
+    assert len(data) == POSITION_BYTES <= 32
+
+def test_decoded_position_matches_the_original():
+
+    # Arrange
+    fen = 'rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w Kq f6 0 1'
+    board = Board.from_fen(fen)
+
+    # Act
+    decoded = decode(encode(board))
+
+    # Assert
+    assert decoded.to_fen() == fen
+    assert decoded.zobrist_key == board.zobrist_key
+
+def test_many_positions_can_be_encoded_together():
+
+    # Arrange
+    fens = ['8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+            'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R b KQkq - 0 1']
+    boards = [Board.from_fen(fen) for fen in fens]
+
+    # Act
+    data = encode_all(boards)
+    decoded = list(decode_all(data, backend='bitboard'))
+
+    # Assert
+    assert len(data) == 2 * POSITION_BYTES
+    assert [board.to_fen() for board in decoded] == fens
@@ -0,0 +1,97 @@
+from chessington.engine.board import Board
+from chessington.engine.data import Player, Square, Move
+from chessington.engine.pieces import Pawn, Bishop, Rook, Queen, King
+
+def test_starting_position_has_twenty_legal_moves():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    moves = board.legal_moves()
+
+    # Assert
+    assert len(moves) == 20
+
+def test_pinned_pieces_can_only_move_along_the_pin():
+
+    # Arrange
+    board = Board.empty()
+    board.set_piece(Square.at(0, 4), King(Player.WHITE))
+    board.set_piece(Square.at(2, 4), Rook(Player.WHITE))
+    board.set_piece(Square.at(7, 4), Rook(Player.BLACK))
+    board.set_piece(Square.at(7, 0), King(Player.BLACK))
+
+    # Act
+    rook_moves = [move.to_square for move in board.legal_moves() if move.from_square == Square.at(2, 4)]
+
+    # Assert
+    assert sorted(rook_moves) == [Square.at(row, 4) for row in (1, 3, 4, 5, 6, 7)]
+
+def test_check_must_be_answered():
+
+    # Arrange
+    board = Board.empty()
+    board.set_piece(Square.at(0, 4), King(Player.WHITE))
+    board.set_piece(Square.at(1, 0), Rook(Player.WHITE))
+    board.set_piece(Square.at(4, 4), Queen(Player.BLACK))
+    board.set_piece(Square.at(7, 7), King(Player.BLACK))
+
+    # Act
+    moves = board.legal_moves()
+
+    # Assert
+    assert board.is_check()
+    assert Move(Square.at(1, 0), Square.at(1, 4)) in moves
+    assert Move(Square.at(1, 0), Square.at(2, 0)) not in moves
+    assert Move(Square.at(0, 4), Square.at(1, 4)) not in moves
+
+def test_castling_through_an_attacked_square_is_not_allowed():
+
+    # Arrange
+    board = Board.empty()
+    board.set_piece(Square.at(0, 4), King(Player.WHITE))
+    board.set_piece(Square.at(0, 7), Rook(Player.WHITE))
+    board.set_piece(Square.at(0, 0), Rook(Player.WHITE))
+    board.set_piece(Square.at(5, 0), Bishop(Player.BLACK))
+    board.set_piece(Square.at(7, 4), King(Player.BLACK))
+
+    # Act
+    moves = board.legal_moves()
+
+    # Assert
+    assert Move(Square.at(0, 4), Square.at(0, 6)) not in moves
+    assert Move(Square.at(0, 4), Square.at(0, 2)) in moves
+
+def test_back_rank_mate_is_checkmate():
+
+    # Arrange
+    board = Board.empty()
+    board.set_piece(Square.at(0, 6), King(Player.WHITE))
+    for col in (5, 6, 7):
+        board.set_piece(Square.at(1, col), Pawn(Player.WHITE))
+    board.set_piece(Square.at(0, 0), Rook(Player.BLACK))
+    board.set_piece(Square.at(7, 6), King(Player.BLACK))
+
+    # Act
+    checkmate = board.is_checkmate()
+
+    # Assert
+    assert checkmate
+    assert not board.is_stalemate()
+
+def test_king_with_no_moves_but_not_in_check_is_stalemate():
+
+    # Arrange
+    board = Board.empty()
+    board.current_player = Player.BLACK
+    board.set_piece(Square.at(7, 0), King(Player.BLACK))
+    board.set_piece(Square.at(5, 1), Queen(Player.WHITE))
+    board.set_piece(Square.at(0, 4), King(Player.WHITE))
+
+    # Act
+    stalemate = board.is_stalemate()
+
+    # Assert
+    assert stalemate
+    assert not board.is_checkmate()
@@ -0,0 +1,88 @@
+import pytest
+
+from chessington.engine.board import Board, WHITE_KINGSIDE, BLACK_QUEENSIDE
+from chessington.engine.data import Player, Square, Move
+from chessington.engine.notation import parse_square, square_name, move_from_uci, move_to_uci, STARTING_FEN
+from chessington.engine.pieces import Queen, King
+
+def test_squares_are_named_by_file_and_rank():
+
+    # Arrange
+    square = Square.at(3, 4)
+
+    # Act
+    name = square_name(square)
+
+    # Assert
+    assert name == 'e4'
+    assert parse_square(name) == square
+
+def test_moves_can_be_written_as_pairs_of_squares():
+
+    # Arrange
+    move = Move(Square.at(6, 0), Square.at(7, 0), Queen)
+
+    # Act
+    text = move_to_uci(move)
+
+    # Assert
+    assert text == 'a7a8q'
+    assert move_from_uci(text) == move
+    with pytest.raises(ValueError):
+        move_from_uci('a7a8k')
+
+def test_fen_of_starting_position():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    fen = board.to_fen()
+
+    # Assert
+    assert fen == STARTING_FEN
+
+@pytest.mark.parametrize('fen', [
+    'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+    'rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8',
+    'rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w Kq f6 0 3',
+])
+def test_fen_survives_a_round_trip(fen):
+
+    # Act
+    board = Board.from_fen(fen)
+
+    # Assert
+    assert board.to_fen() == fen
+
+def test_fen_sets_up_side_to_move_castling_and_en_passant():
+
+    # Act
+    board = Board.from_fen('rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w Kq f6 0 3')
+
+    # Assert
+    assert board.current_player == Player.WHITE
+    assert board.en_passant == Square.at(4, 5)
+    assert Move(Square.at(4, 4), Square.at(5, 5)) in board.legal_moves()
+    assert board.castling_rights() == WHITE_KINGSIDE | BLACK_QUEENSIDE
+
+def test_move_counters_follow_the_game():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    board.make_move(move_from_uci('g1f3'))
+    board.make_move(move_from_uci('g8f6'))
+    fen = board.to_fen()
+    board.unmake_move()
+
+    # Assert
+    assert fen.endswith(' 2 2')
+    assert board.to_fen().endswith(' 1 1')
+
+def test_invalid_fen_is_rejected():
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        Board.from_fen('rnbqkbnr/pppppppp/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1')
@@ -0,0 +1,81 @@
+import pytest
+
+from chessington.engine.board import Board
+from chessington.engine.data import Player
+from chessington.engine.perft import perft, divide, main
+
+POSITION_THREE = '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1'
+
+@pytest.mark.parametrize('depth, nodes', [(1, 20), (2, 400), (3, 8902)])
+def test_perft_from_starting_position(depth, nodes):
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    count = perft(board, depth)
+
+    # Assert
+    assert count == nodes
+
+@pytest.mark.parametrize('fen, depth, nodes', [
+    ('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1', 2, 2039),
+    (POSITION_THREE, 3, 2812),
+    ('r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1', 3, 9467),
+    ('rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8', 2, 1486),
+    ('r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10', 2, 2079),
+])
+def test_perft_of_standard_positions(fen, depth, nodes):
+
+    # Arrange
+    board = Board.from_fen(fen)
+
+    # Act
+    count = perft(board, depth)
+
+    # Assert
+    assert count == nodes
+
+def test_perft_leaves_the_board_unchanged():
+
+    # Arrange
+    board = Board.at_starting_position(backend='bitboard')
+    key = board.zobrist_key
+
+    # Act
+    perft(board, 3)
+
+    # Assert
+    assert board.zobrist_key == key
+    assert len(board.get_pieces(Player.BLACK)) == 16
+
+def test_divide_counts_sum_to_perft():
+
+    # Arrange
+    board = Board.from_fen(POSITION_THREE)
+
+    # Act
+    counts = divide(board, 2)
+
+    # Assert
+    assert len(counts) == 14
+    assert sum(counts.values()) == 191
+
+def test_command_line_reports_nodes_and_speed(capsys):
+
+    # Act
+    main(['2', '--divide'])
+
+    # Assert
+    output = capsys.readouterr().out
+    assert 'e2e4: 20' in output
+    assert 'Nodes: 400' in output
+    assert 'Nodes/second' in output
+
+def test_command_line_accepts_a_fen(capsys):
+
+    # Act
+    main(['1', '--fen', POSITION_THREE])
+
+    # Assert
+    assert 'Nodes: 14' in capsys.readouterr().out
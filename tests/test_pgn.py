@@ -0,0 +1,81 @@
+import io
+
+import pytest
+
+from chessington.engine.board import Board
+from chessington.engine.data import Square, Move
+from chessington.engine.pgn import read_games, replay, positions, parse_san
+from chessington.engine.pieces import Queen
+
+PGN = '''[Event "Casual game"]
+[White "Anderssen"]
+[Black "Kieseritzky"]
+[Result "1-0"]
+
+1. e4 e5 2. f4 exf4 3. Bc4 Qh4+ {Black gives check} 4. Kf1 b5 (4... Nf6 5. Nc3)
+5. Bxb5 Nf6 6. Nf3 Qh6 $1 7. d3 Nh5 1-0
+
+[Event "Short game"]
+[Result "0-1"]
+
+1. f3 e5 2. g4 Qh4# 0-1
+'''
+
+def test_games_are_read_with_their_headers_and_moves():
+
+    # Act
+    games = list(read_games(io.StringIO(PGN)))
+
+    # Assert
+    assert len(games) == 2
+    assert games[0].headers['White'] == 'Anderssen'
+    assert games[0].moves[:6] == ['e4', 'e5', 'f4', 'exf4', 'Bc4', 'Qh4+']
+    assert len(games[0].moves) == 14
+    assert games[1].result == '0-1'
+
+def test_games_are_read_lazily():
+
+    # Arrange
+    lines = iter(PGN.splitlines(keepends=True))
+
+    # Act
+    first_game = next(read_games(lines))
+
+    # Assert
+    assert first_game.headers['Event'] == 'Casual game'
+    assert next(lines).startswith('[Result "0-1"]')
+
+def test_replaying_a_game_reaches_its_final_position():
+
+    # Arrange
+    game = list(read_games(io.StringIO(PGN)))[1]
+
+    # Act
+    boards = [board.to_fen() for _, board in replay(game)]
+
+    # Assert
+    assert len(boards) == 4
+    assert boards[-1].startswith('rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w')
+
+def test_positions_yields_a_board_after_every_move():
+
+    # Act
+    count = sum(1 for _ in positions(io.StringIO(PGN)))
+
+    # Assert
+    assert count == 18
+
+def test_san_moves_are_disambiguated_and_promoted():
+
+    # Arrange
+    board = Board.from_fen('4k3/P7/8/8/8/8/8/R3K2R w KQ - 0 1')
+
+    # Act
+    promotion = parse_san(board, 'a8=Q+')
+    castling = parse_san(board, 'O-O')
+
+    # Assert
+    assert promotion == Move(Square.at(6, 0), Square.at(7, 0), Queen)
+    assert castling == Move(Square.at(0, 4), Square.at(0, 6))
+    with pytest.raises(ValueError):
+        parse_san(board, 'Rd1d2')
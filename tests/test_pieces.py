@@ -1,6 +1,6 @@
 from chessington.engine.board import Board
 from chessington.engine.data import Player, Square
-from chessington.engine.pieces import Pawn, King
+from chessington.engine.pieces import Pawn, Knight, Queen, King
 
 class TestPawns:
 
@@ -348,4 +348,46 @@ class TestKings:
         moves = king.get_available_moves(board)
 
         # Assert
-        assert Square.at(3, 4) in moves
\ No newline at end of file
+        assert Square.at(3, 4) in moves
+
+class TestKnights:
+
+    @staticmethod
+    def test_knights_cannot_move_onto_friendly_pieces():
+
+        # Arrange
+        board = Board.empty()
+        knight = Knight(Player.WHITE)
+        board.set_piece(Square.at(0, 1), knight)
+        friendly_square = Square.at(2, 2)
+        board.set_piece(friendly_square, Pawn(Player.WHITE))
+
+        # Act
+        moves = knight.get_available_moves(board)
+
+        # Assert
+        assert friendly_square not in moves
+        assert sorted(moves) == [Square.at(1, 3), Square.at(2, 0)]
+
+
+class TestQueens:
+
+    @staticmethod
+    def test_queens_slide_until_blocked():
+
+        # Arrange
+        board = Board.empty()
+        queen = Queen(Player.BLACK)
+        board.set_piece(Square.at(0, 0), queen)
+        board.set_piece(Square.at(0, 3), Pawn(Player.WHITE))
+        board.set_piece(Square.at(3, 0), Pawn(Player.BLACK))
+
+        # Act
+        moves = queen.get_available_moves(board)
+
+        # Assert
+        assert Square.at(0, 3) in moves
+        assert Square.at(0, 4) not in moves
+        assert Square.at(3, 0) not in moves
+        assert Square.at(7, 7) in moves
+        assert len(moves) == 12
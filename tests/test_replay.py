@@ -0,0 +1,67 @@
+from chessington.engine.replay import replay_game, replay_games, main
+
+GAMES = [
+    'f2f3 e7e5 g2g4 d8h4',
+    'e2e4 e7e5 e1e3',
+    '',
+    'e2e4 d7d5 e4d5 c7c5 d5c6 b8c6 a2a4 g8f6 a4a5 e7e6 a5a6 f8e7 a6b7 e8g8 b7a8',
+]
+
+def test_legal_game_is_replayed_to_its_final_position():
+
+    # Act
+    result = replay_game(0, GAMES[0])
+
+    # Assert
+    assert result.error is None
+    assert result.moves_played == 4
+    assert result.final_fen.startswith('rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w')
+
+def test_replay_stops_at_the_first_illegal_move():
+
+    # Act
+    result = replay_game(1, GAMES[1])
+
+    # Assert
+    assert result.moves_played == 2
+    assert result.error == 'Illegal move: e1e3'
+
+def test_promotion_without_a_piece_becomes_a_queen():
+
+    # Act
+    result = replay_game(3, GAMES[3])
+
+    # Assert
+    assert result.error is None
+    assert result.final_fen.startswith('Q')
+
+def test_games_are_replayed_across_processes_in_order():
+
+    # Act
+    results = list(replay_games(GAMES, workers=2, chunk_size=1))
+
+    # Assert
+    assert [result.index for result in results] == [0, 1, 3]
+    assert [result.error is None for result in results] == [True, False, True]
+
+def test_unordered_replay_returns_every_game():
+
+    # Act
+    results = list(replay_games(GAMES * 3, workers=2, chunk_size=2, ordered=False))
+
+    # Assert
+    assert sorted(result.index for result in results) == [0, 1, 3, 4, 5, 7, 8, 9, 11]
+
+def test_file_replay_writes_results_and_statistics(tmpdir, capsys):
+
+    # Arrange
+    path = tmpdir.join('games.txt')
+    path.write('\n'.join(GAMES) + '\n')
+
+    # Act
+    main([str(path), '--workers', '1'])
+
+    # Assert
+    output = capsys.readouterr()
+    assert output.out.splitlines()[1].startswith('1\t2\tIllegal move: e1e3\t')
+    assert 'Games: 3 (1 with errors), moves: 21' in output.err
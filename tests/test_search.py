@@ -0,0 +1,150 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from chessington.engine.board import Board
+from chessington.engine.data import Player, Square, Move
+from chessington.engine.evaluation import evaluate
+from chessington.engine.pieces import Pawn, Knight, Rook, Queen, King
+from chessington.engine.search import Searcher, search, parallel_search, MATE_SCORE
+
+def back_rank_board():
+    board = Board.empty()
+    board.set_piece(Square.at(0, 6), King(Player.WHITE))
+    board.set_piece(Square.at(0, 0), Rook(Player.WHITE))
+    board.set_piece(Square.at(7, 6), King(Player.BLACK))
+    for col in (5, 6, 7):
+        board.set_piece(Square.at(6, col), Pawn(Player.BLACK))
+    return board
+
+def test_evaluation_of_starting_position_is_level():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    score = evaluate(board)
+
+    # Assert
+    assert score == 0
+
+def test_search_finds_mate_in_one():
+
+    # Arrange
+    board = back_rank_board()
+
+    # Act
+    result = search(board, max_depth=3)
+
+    # Assert
+    assert result.best_move == Move(Square.at(0, 0), Square.at(7, 0))
+    assert result.score == MATE_SCORE - 1
+    assert result.pv[0] == result.best_move
+
+def test_search_captures_an_undefended_queen():
+
+    # Arrange
+    board = Board.empty()
+    board.set_piece(Square.at(0, 4), King(Player.WHITE))
+    board.set_piece(Square.at(2, 2), Knight(Player.WHITE))
+    board.set_piece(Square.at(4, 3), Queen(Player.BLACK))
+    board.set_piece(Square.at(7, 4), King(Player.BLACK))
+
+    # Act
+    result = search(board, max_depth=2)
+
+    # Assert
+    assert result.best_move == Move(Square.at(2, 2), Square.at(4, 3))
+
+def test_en_passant_is_searched_as_a_capture():
+
+    # Arrange
+    board = Board.from_fen('4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1')
+    searcher = Searcher(board)
+    en_passant = Move(Square.at(4, 4), Square.at(5, 3))
+
+    # Act
+    is_capture = searcher._is_capture(en_passant)
+    first_move = searcher._order(board.legal_moves(), None)[0]
+
+    # Assert
+    assert is_capture
+    assert first_move == en_passant
+
+def test_search_stops_within_its_node_budget_and_leaves_the_board_unchanged():
+
+    # Arrange
+    board = Board.at_starting_position()
+    key = board.zobrist_key
+
+    # Act
+    result = search(board, node_limit=500)
+
+    # Assert
+    assert result.best_move in board.legal_moves()
+    assert result.nodes <= 501
+    assert board.zobrist_key == key
+    assert board.current_player == Player.WHITE
+
+def test_search_stops_when_its_time_runs_out():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    result = search(board, time_limit=0.2)
+
+    # Assert
+    assert result.best_move is not None
+    assert result.elapsed < 1.0
+
+def test_parallel_search_finds_mate_in_one():
+
+    # Arrange
+    board = back_rank_board()
+
+    # Act
+    result = search(board, max_depth=2, workers=2)
+
+    # Assert
+    assert result.best_move == Move(Square.at(0, 0), Square.at(7, 0))
+    assert result.score == MATE_SCORE - 1
+
+def test_parallel_search_can_use_a_given_executor():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    with ProcessPoolExecutor(max_workers=3) as executor:
+        result = parallel_search(board, 3, max_depth=2, executor=executor)
+
+    # Assert
+    assert result.depth == 2
+    assert result.best_move in board.legal_moves()
+
+def test_a_share_ending_on_a_mate_does_not_hold_back_the_depth():
+
+    # Arrange
+    board = Board.from_fen('rnbqkbnr/pppp1ppp/8/4p3/8/5P2/PPPPP1PP/RNBQKBNR w KQkq - 0 2')
+    workers = len(board.legal_moves())
+
+    # Act
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        result = parallel_search(board, workers, max_depth=4, executor=executor)
+
+    # Assert
+    assert result.depth == 4
+    assert result.best_move != Move(Square.at(1, 6), Square.at(3, 6))
+
+def test_parallel_search_reports_its_result_and_keeps_to_its_time():
+
+    # Arrange
+    board = Board.at_starting_position()
+    reported = []
+
+    # Act
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        result = search(board, time_limit=0.3, workers=2, on_iteration=reported.append, executor=executor)
+
+    # Assert
+    assert reported == [result]
+    assert result.elapsed < 0.6
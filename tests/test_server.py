@@ -0,0 +1,142 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from chessington.server import GameServer, GameClient, main
+
+@pytest.fixture(scope='module')
+def executor():
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        yield pool
+
+def run_with_server(executor, scenario):
+    async def run():
+        server = await GameServer(executor, think_time=0.05).start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return await scenario(port)
+    return asyncio.run(run())
+
+def test_moves_are_validated_and_played(executor):
+
+    # Arrange
+    async def scenario(port):
+        client = await GameClient.connect(port=port)
+        game = await client.send('new', id='a')
+        played = await client.send('move', game=game['game'], move='e2e4')
+        illegal = await client.send('move', game=game['game'], move='e2e4')
+        await client.close()
+        return game, played, illegal
+
+    # Act
+    game, played, illegal = run_with_server(executor, scenario)
+
+    # Assert
+    assert game['ok'] and game['id'] == 'a'
+    assert played['fen'].startswith('rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b')
+    assert illegal == {'ok': False, 'error': 'Illegal move: e2e4'}
+
+def test_computer_replies_with_a_legal_move(executor):
+
+    # Arrange
+    async def scenario(port):
+        client = await GameClient.connect(port=port)
+        game = await client.send('new', fen='6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1')
+        reply = await client.send('engine', game=game['game'], time=0.5)
+        state = await client.send('state', game=game['game'])
+        await client.close()
+        return reply, state
+
+    # Act
+    reply, state = run_with_server(executor, scenario)
+
+    # Assert
+    assert reply['move'] == 'a1a8'
+    assert reply['status'] == 'checkmate'
+    assert state['moves'] == []
+
+def test_many_games_are_hosted_at_once(executor):
+
+    # Arrange
+    async def play(port):
+        client = await GameClient.connect(port=port)
+        game = await client.send('new')
+        for move in ['g1f3', 'g8f6', 'f3g1', 'f6g8']:
+            await client.send('move', game=game['game'], move=move)
+        state = await client.send('state', game=game['game'])
+        closed = await client.send('close', game=game['game'])
+        await client.close()
+        return state, closed
+
+    async def scenario(port):
+        return await asyncio.gather(*(play(port) for _ in range(50)))
+
+    # Act
+    results = run_with_server(executor, scenario)
+
+    # Assert
+    assert len({closed['game'] for _, closed in results}) == 50
+    assert all(state['fen'] == 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 4 3' for state, _ in results)
+
+def test_bad_requests_get_errors(executor):
+
+    # Arrange
+    server = GameServer(executor)
+
+    # Act
+    not_json = asyncio.run(server.handle_line(b'not json'))
+    not_object = asyncio.run(server.handle_line(b'[1, 2]'))
+    unknown = asyncio.run(server.handle_line(b'{"op": "dance", "id": 7}'))
+    no_game = asyncio.run(server.handle_line(b'{"op": "state", "game": 99}'))
+
+    # Assert
+    assert not not_json['ok'] and not not_object['ok']
+    assert unknown == {'ok': False, 'error': 'Unknown op: dance', 'id': 7}
+    assert no_game['error'] == 'No such game: 99'
+
+def test_fields_of_the_wrong_type_get_errors(executor):
+
+    # Arrange
+    server = GameServer(executor)
+    game_id = asyncio.run(server.handle_line(b'{"op": "new"}'))['game']
+    lines = [b'{"op": "new", "fen": 5}', b'{"op": "state", "game": [1]}', b'{"op": "state", "game": true}']
+    lines += [b'{"op": "engine", "game": %d, "time": %s}' % (game_id, time)
+              for time in (b'null', b'NaN', b'Infinity', b'-1', b'0', b'"1"')]
+
+    # Act
+    responses = [asyncio.run(server.handle_line(line)) for line in lines]
+
+    # Assert
+    assert all(not response['ok'] and response['error'] for response in responses)
+    assert server.games[game_id].board.to_fen().startswith('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w')
+
+def test_a_book_that_cannot_be_opened_stops_the_server_starting(tmp_path, capsys):
+
+    # Arrange
+    args = ['--port', '0', '--book', str(tmp_path / 'missing.bin')]
+
+    # Act
+    with pytest.raises(SystemExit):
+        main(args)
+
+    # Assert
+    assert 'cannot open book' in capsys.readouterr().err
+
+def test_unexpected_errors_fail_only_the_request(executor):
+
+    # Arrange
+    server = GameServer(executor)
+    game_id = asyncio.run(server.handle_line(b'{"op": "new"}'))['game']
+
+    async def broken(request):
+        raise RuntimeError('Worker died')
+    server._handlers['engine'] = broken
+
+    # Act
+    failed = asyncio.run(server.handle_line(b'{"op": "engine", "game": %d}' % game_id))
+    state = asyncio.run(server.handle_line(b'{"op": "state", "game": %d}' % game_id))
+
+    # Assert
+    assert failed == {'ok': False, 'error': 'Internal error: RuntimeError: Worker died'}
+    assert state['ok']
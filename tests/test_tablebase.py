@@ -0,0 +1,190 @@
+import random
+
+import pytest
+
+from chessington.engine import tablebase
+from chessington.engine.board import Board
+from chessington.engine.data import Player, Square
+from chessington.engine.pieces import King, Queen, Rook, Pawn
+from chessington.engine.tablebase import Tablebase, TablebaseResult, get_table, load_tables, best_move, WIN, DRAW, \
+    LOSS
+
+@pytest.fixture(scope='module', autouse=True)
+def tables():
+    # Only tables already loaded or generated are probed
+    for piece_type in (Queen, Rook, Pawn):
+        get_table(piece_type)
+
+def random_ending(chooser, piece_type):
+    while True:
+        strong = chooser.choice(list(Player))
+        white_king, piece, black_king = chooser.sample(range(64), 3)
+        if piece_type is Pawn and not 0 < piece // 8 < 7:
+            continue
+        if abs(white_king // 8 - black_king // 8) <= 1 and abs(white_king % 8 - black_king % 8) <= 1:
+            continue
+        board = Board.empty()
+        board.set_castling_rights(0)
+        board.set_piece(Square.from_index(white_king), King(strong))
+        board.set_piece(Square.from_index(piece), piece_type(strong))
+        board.set_piece(Square.from_index(black_king), King(strong.opponent()))
+        # A king in check must be the one to move
+        board.current_player = strong.opponent()
+        if not board.is_check():
+            board.current_player = chooser.choice(list(Player))
+        return board
+
+def expected_result(board):
+    results = []
+    for move in board.legal_moves():
+        board.make_move(move)
+        results.append(board.probe_tablebase())
+        board.unmake_move()
+    if not results:
+        return TablebaseResult(LOSS if board.is_check() else DRAW, 0)
+    losses = [result.dtm for result in results if result.wdl == LOSS]
+    if losses:
+        return TablebaseResult(WIN, min(losses) + 1)
+    if all(result.wdl == WIN for result in results):
+        return TablebaseResult(LOSS, max(result.dtm for result in results) + 1)
+    return TablebaseResult(DRAW, 0)
+
+def test_checkmate_is_lost_in_no_moves():
+
+    # Arrange
+    board = Board.from_fen('k7/Q7/1K6/8/8/8/8/8 b - - 0 1')
+
+    # Act
+    result = board.probe_tablebase()
+
+    # Assert
+    assert result == TablebaseResult(LOSS, 0)
+
+def test_longest_mates_are_as_long_as_known():
+
+    # Act
+    longest = {piece_type: max(get_table(piece_type).dtm) for piece_type in (Queen, Rook, Pawn)}
+
+    # Assert
+    assert longest == {Queen: 20, Rook: 32, Pawn: 56}
+
+def test_king_in_front_of_its_pawn_wins():
+
+    # Arrange
+    board = Board.from_fen('3k4/8/3K4/3P4/8/8/8/8 b - - 0 1')
+
+    # Act
+    result = board.probe_tablebase()
+
+    # Assert
+    assert result.wdl == LOSS
+
+def test_rook_pawn_against_a_king_in_the_corner_is_drawn():
+
+    # Arrange
+    board = Board.from_fen('k7/8/8/8/8/8/P7/1K6 w - - 0 1')
+
+    # Act
+    result = board.probe_tablebase()
+
+    # Assert
+    assert result == TablebaseResult(DRAW, 0)
+
+def test_black_with_the_extra_piece_is_looked_up_turned_round():
+
+    # Arrange
+    white_rook = Board.from_fen('8/8/8/8/4k3/8/5R2/K7 w - - 0 1')
+    black_rook = Board.from_fen('k7/5r2/8/4K3/8/8/8/8 b - - 0 1')
+
+    # Act
+    results = white_rook.probe_tablebase(), black_rook.probe_tablebase()
+
+    # Assert
+    assert results[0] == results[1] == TablebaseResult(WIN, 31)
+
+def test_results_agree_with_the_results_after_each_move():
+
+    # Arrange
+    chooser = random.Random(2019)
+    boards = [random_ending(chooser, piece_type) for piece_type in (Queen, Rook, Pawn) for _ in range(100)]
+
+    # Act
+    mismatches = [board.to_fen() for board in boards if board.probe_tablebase() != expected_result(board)]
+
+    # Assert
+    assert mismatches == []
+
+def test_best_moves_mate_in_the_number_of_plies_given():
+
+    # Arrange
+    board = Board.from_fen('8/8/8/8/4k3/8/5R2/K7 w - - 0 1')
+    plies = board.probe_tablebase().dtm
+
+    # Act
+    for _ in range(plies):
+        board.make_move(best_move(board))
+
+    # Assert
+    assert board.is_checkmate()
+
+def test_positions_with_more_pieces_are_not_covered():
+
+    # Act
+    result = Board.at_starting_position().probe_tablebase()
+
+    # Assert
+    assert result is None
+
+def test_positions_without_both_kings_are_not_covered():
+
+    # Arrange
+    boards = [Board.from_fen('8/8/8/8/8/8/8/KQ5q w - - 0 1'), Board.from_fen('8/8/8/8/8/8/8/QQ5k w - - 0 1')]
+
+    # Act
+    results = [board.probe_tablebase() for board in boards]
+    moves = [best_move(board) for board in boards]
+
+    # Assert
+    assert results == [None, None]
+    assert moves == [None, None]
+
+def test_saved_tables_load_unchanged(tmp_path):
+
+    # Arrange
+    table = get_table(Queen)
+    table.save(str(tmp_path))
+
+    # Act
+    loaded = Tablebase.load(str(tmp_path), Queen)
+
+    # Assert
+    assert loaded.wdl == table.wdl
+    assert loaded.dtm == table.dtm
+
+def test_tables_not_loaded_are_not_probed(monkeypatch):
+
+    # Arrange
+    monkeypatch.setattr(tablebase, '_TABLES', {})
+    board = Board.from_fen('8/8/8/8/4k3/8/5R2/K7 w - - 0 1')
+
+    # Act
+    result = board.probe_tablebase()
+    move = best_move(board)
+
+    # Assert
+    assert result is None
+    assert move is None
+
+def test_tables_saved_in_a_directory_are_loaded(tmp_path, monkeypatch):
+
+    # Arrange
+    get_table(Rook).save(str(tmp_path))
+    monkeypatch.setattr(tablebase, '_TABLES', {})
+
+    # Act
+    loaded = load_tables(str(tmp_path))
+
+    # Assert
+    assert loaded == ['KRK']
+    assert Board.from_fen('8/8/8/8/4k3/8/5R2/K7 w - - 0 1').probe_tablebase() == TablebaseResult(WIN, 31)
+    assert Board.from_fen('8/8/8/8/4k3/8/5Q2/K7 w - - 0 1').probe_tablebase() is None
@@ -0,0 +1,41 @@
+from chessington.engine.data import Player, Square
+from chessington.engine.tables import KNIGHT_TARGETS, KING_TARGETS, QUEEN_RAYS, PAWN_PUSHES, \
+    PAWN_CAPTURES
+
+def test_corner_squares_have_few_jump_targets():
+
+    # Arrange
+    corner = Square.at(0, 0).index
+
+    # Act
+    knight_targets = KNIGHT_TARGETS[corner]
+    king_targets = KING_TARGETS[corner]
+
+    # Assert
+    assert sorted(knight_targets) == [Square.at(1, 2), Square.at(2, 1)]
+    assert len(king_targets) == 3
+
+def test_queen_rays_from_centre_cover_twenty_seven_squares():
+
+    # Arrange
+    centre = Square.at(3, 3).index
+
+    # Act
+    rays = QUEEN_RAYS[centre]
+
+    # Assert
+    assert sum(len(ray) for ray in rays) == 27
+
+def test_pawn_tables_depend_on_colour():
+
+    # Arrange
+    square = Square.at(6, 4).index
+
+    # Act
+    white_pushes = PAWN_PUSHES[Player.WHITE][square]
+    black_pushes = PAWN_PUSHES[Player.BLACK][square]
+
+    # Assert
+    assert white_pushes == (Square.at(7, 4),)
+    assert black_pushes == (Square.at(5, 4), Square.at(4, 4))
+    assert PAWN_CAPTURES[Player.WHITE][Square.at(1, 0).index] == (Square.at(2, 1),)
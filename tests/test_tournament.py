@@ -0,0 +1,66 @@
+from chessington.engine.tournament import EngineSettings, GameRecord, play_game, play_match, summarise, DRAW, \
+    WHITE_WINS, BLACK_WINS
+
+FIRST = EngineSettings('first', time_limit=None, max_depth=1, hash_mb=None)
+SECOND = EngineSettings('second', time_limit=None, max_depth=2, hash_mb=1)
+
+def make_record(index, white, black, result, nodes=(100, 100), search_time=(1.0, 1.0)):
+    return GameRecord(index, white, black, result, 'checkmate', [], nodes, search_time)
+
+def test_paired_games_share_an_opening_with_colours_swapped():
+
+    # Act
+    game = play_game(0, FIRST, SECOND, opening_plies=4, seed=7, max_plies=10)
+    return_game = play_game(1, FIRST, SECOND, opening_plies=4, seed=7, max_plies=10)
+
+    # Assert
+    assert (game.white, game.black) == ('first', 'second')
+    assert (return_game.white, return_game.black) == ('second', 'first')
+    assert game.moves[:4] == return_game.moves[:4]
+
+def test_game_is_drawn_at_the_move_limit():
+
+    # Act
+    game = play_game(0, FIRST, SECOND, opening_plies=0, max_plies=6)
+
+    # Assert
+    assert game.result == DRAW
+    assert game.reason == 'move limit'
+    assert len(game.moves) == 6
+    assert game.nodes[0] > 0 and game.nodes[1] > 0
+
+def test_match_plays_every_game_across_processes():
+
+    # Act
+    records = list(play_match(FIRST, SECOND, games=4, workers=2, max_plies=6))
+
+    # Assert
+    assert sorted(record.index for record in records) == [0, 1, 2, 3]
+
+def test_summary_scores_from_the_first_engines_point_of_view():
+
+    # Arrange
+    records = [
+        make_record(0, 'first', 'second', WHITE_WINS, nodes=(300, 100)),
+        make_record(1, 'second', 'first', BLACK_WINS, nodes=(100, 300)),
+        make_record(2, 'first', 'second', DRAW, nodes=(300, 100)),
+        make_record(3, 'second', 'first', WHITE_WINS, nodes=(100, 300)),
+    ]
+
+    # Act
+    summary = summarise(records, 'first')
+
+    # Assert
+    assert (summary.games, summary.wins, summary.losses, summary.draws) == (4, 2, 1, 1)
+    assert summary.score == 0.625
+    assert round(summary.elo) == 89
+    assert summary.elo_margin > 0
+    assert (summary.first_nps, summary.second_nps) == (300, 100)
+
+def test_even_match_has_no_elo_difference():
+
+    # Act
+    summary = summarise([make_record(0, 'first', 'second', DRAW)], 'first')
+
+    # Assert
+    assert summary.elo == 0
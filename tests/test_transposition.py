@@ -0,0 +1,77 @@
+from chessington.engine.board import Board
+from chessington.engine.data import Square, Move
+from chessington.engine.pieces import Queen
+from chessington.engine.search import search
+from chessington.engine.transposition import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+
+def test_stored_results_can_be_probed():
+
+    # Arrange
+    table = TranspositionTable(size_mb=1)
+    move = Move(Square.at(6, 0), Square.at(7, 0), Queen)
+
+    # Act
+    table.store(12345, 5, -250, LOWER_BOUND, move)
+    entry = table.probe(12345)
+
+    # Assert
+    assert entry == (5, -250, LOWER_BOUND, move)
+    assert table.probe(54321) is None
+
+def test_table_size_is_fixed_by_its_memory_limit():
+
+    # Arrange
+    table = TranspositionTable(size_mb=1)
+
+    # Act
+    for key in range(1, 3 * table.size):
+        table.store(key, 1, 0, EXACT, None)
+
+    # Assert
+    assert table.size == 1024 * 1024 // 16
+    assert len(table.keys) == len(table.data) == table.size
+
+def test_cleared_table_has_no_results():
+
+    # Arrange
+    table = TranspositionTable(size_mb=1)
+    table.store(12345, 5, -250, LOWER_BOUND, None)
+
+    # Act
+    table.clear()
+
+    # Assert
+    assert table.probe(12345) is None
+    assert len(table.keys) == len(table.data) == table.size
+
+def test_deeper_results_are_kept_over_shallower_ones_in_the_same_bucket():
+
+    # Arrange
+    table = TranspositionTable(size_mb=1)
+    deep_key = 7
+    shallow_keys = [7 + table.bucket_count, 7 + 2 * table.bucket_count]
+
+    # Act
+    table.store(deep_key, 8, 10, EXACT, None)
+    for key in shallow_keys:
+        table.store(key, 2, 20, UPPER_BOUND, None)
+
+    # Assert
+    assert table.probe(deep_key).depth == 8
+    assert table.probe(shallow_keys[0]) is None
+    assert table.probe(shallow_keys[1]).depth == 2
+
+def test_search_with_a_table_searches_fewer_nodes_for_the_same_result():
+
+    # Arrange
+    board = Board.at_starting_position()
+    table = TranspositionTable(size_mb=1)
+
+    # Act
+    without_table = search(board, max_depth=3)
+    with_table = search(board, max_depth=3, table=table)
+
+    # Assert
+    assert with_table.score == without_table.score
+    assert with_table.nodes < without_table.nodes
+    assert table.probe(TranspositionTable.hash_position(board)).move == with_table.best_move
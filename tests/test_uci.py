@@ -0,0 +1,178 @@
+import time
+
+from chessington.engine import tablebase
+from chessington.engine.board import Board
+from chessington.engine.book import BookBuilder
+from chessington.engine.data import Move, Player, Square
+from chessington.engine.pieces import Pawn, Rook
+from chessington.uci import UciEngine, DEFAULT_MOVE_SECONDS, _time_limit
+
+def make_engine():
+    lines = []
+    return UciEngine(lines.append), lines
+
+def test_uci_lists_options_and_says_uciok():
+
+    # Arrange
+    engine, lines = make_engine()
+
+    # Act
+    engine.handle('uci')
+    engine.handle('isready')
+
+    # Assert
+    assert lines[0] == 'id name Chessington'
+    assert 'option name Hash type spin default 16 min 1 max 1024' in lines
+    assert 'option name Threads type spin default 1 min 1 max 64' in lines
+    assert lines[-2:] == ['uciok', 'readyok']
+
+def test_position_plays_the_moves_given():
+
+    # Arrange
+    engine, _ = make_engine()
+
+    # Act
+    engine.handle('position startpos moves e2e4 e7e5')
+
+    # Assert
+    assert engine.board.current_player == Player.WHITE
+    assert isinstance(engine.board.get_piece(Square.at(3, 4)), Pawn)
+    assert isinstance(engine.board.get_piece(Square.at(4, 4)), Pawn)
+
+def test_go_answers_with_the_mating_move():
+
+    # Arrange
+    engine, lines = make_engine()
+    engine.handle('position fen 6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1')
+
+    # Act
+    engine.handle('go depth 3')
+    engine.stop()
+
+    # Assert
+    assert lines[-1] == 'bestmove a1a8'
+    assert any(line.startswith('info depth') and 'score mate 1' in line for line in lines)
+
+def test_stop_ends_an_infinite_search_promptly():
+
+    # Arrange
+    engine, lines = make_engine()
+    engine.handle('position startpos')
+    engine.handle('go infinite')
+    time.sleep(0.2)
+
+    # Act
+    start = time.perf_counter()
+    engine.handle('stop')
+    elapsed = time.perf_counter() - start
+
+    # Assert
+    assert elapsed < 0.5
+    assert lines[-1].startswith('bestmove ')
+
+def test_infinite_search_waits_for_stop_even_after_finding_mate():
+
+    # Arrange
+    engine, lines = make_engine()
+    engine.handle('position fen 6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1')
+
+    # Act
+    engine.handle('go infinite')
+    time.sleep(0.3)
+    answered_early = any(line.startswith('bestmove') for line in lines)
+    engine.handle('stop')
+
+    # Assert
+    assert not answered_early
+    assert lines[-1] == 'bestmove a1a8'
+
+def test_illegal_moves_are_reported_not_played():
+
+    # Arrange
+    engine, lines = make_engine()
+
+    # Act
+    engine.handle('position startpos moves e2e5')
+
+    # Assert
+    assert lines == ['info string Illegal move: e2e5']
+    assert engine.board.current_player == Player.WHITE
+
+def test_clock_time_is_shared_between_the_moves_left():
+
+    # Arrange
+    limits = {'wtime': 60000, 'btime': 1000, 'winc': 1000, 'movestogo': 20}
+
+    # Act
+    white_time = _time_limit(limits, white_to_move=True)
+    black_time = _time_limit(limits, white_to_move=False)
+
+    # Assert
+    assert abs(white_time - 3.45) < 1e-9
+    assert black_time == 0.01
+    assert _time_limit({'movetime': 250}, white_to_move=True) == 0.25
+
+def test_a_default_time_is_used_without_the_clock_of_the_player_to_move():
+
+    # Act
+    time_limit = _time_limit({'wtime': 60000}, white_to_move=False)
+    no_clock = _time_limit({'depth': 4}, white_to_move=False)
+
+    # Assert
+    assert time_limit == DEFAULT_MOVE_SECONDS
+    assert no_clock is None
+
+def test_no_moves_to_go_is_treated_as_not_given():
+
+    # Act
+    zero = _time_limit({'wtime': 60000, 'movestogo': 0}, white_to_move=True)
+    negative = _time_limit({'wtime': 60000, 'movestogo': -3}, white_to_move=True)
+
+    # Assert
+    assert zero == negative == _time_limit({'wtime': 60000}, white_to_move=True)
+
+def test_book_moves_are_played_without_searching(tmp_path):
+
+    # Arrange
+    builder = BookBuilder()
+    builder.add(Board.at_starting_position(), Move(Square.at(1, 2), Square.at(3, 2)))
+    builder.write(str(tmp_path / 'book.bin'))
+    engine, lines = make_engine()
+    engine.handle('setoption name Book value {}'.format(tmp_path / 'book.bin'))
+
+    # Act
+    engine.handle('position startpos')
+    engine.handle('go wtime 1000 btime 1000')
+
+    # Assert
+    assert lines == ['bestmove c2c4']
+
+def test_a_book_that_cannot_be_opened_is_reported_and_left_out(tmp_path):
+
+    # Arrange
+    engine, lines = make_engine()
+    engine.handle('setoption name Book value {}'.format(tmp_path / 'missing.bin'))
+
+    # Act
+    engine.handle('position fen 6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1')
+    engine.handle('go depth 2')
+    engine.stop()
+
+    # Assert
+    assert lines[0].startswith('info string Cannot open book')
+    assert engine.book is None
+    assert lines[-1] == 'bestmove a1a8'
+
+def test_loaded_tablebases_are_played_from_without_searching(monkeypatch):
+
+    # Arrange
+    monkeypatch.setattr(tablebase, '_TABLES', {Rook: tablebase.get_table(Rook)})
+    engine, lines = make_engine()
+    engine.handle('position fen 8/8/8/8/4k3/8/5R2/K7 w - - 0 1')
+
+    # Act
+    engine.handle('go wtime 1000 btime 1000')
+
+    # Assert
+    assert len(lines) == 1
+    assert lines[0].startswith('bestmove ')
@@ -0,0 +1,60 @@
+from chessington.engine.board import Board, BLACK_KINGSIDE, BLACK_QUEENSIDE
+from chessington.engine.data import Player, Square, Move
+from chessington.engine.zobrist import compute_key
+
+def test_key_matches_a_key_computed_from_scratch_after_moves():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    board.make_move(Move(Square.at(1, 4), Square.at(3, 4)))
+    board.make_move(Move(Square.at(6, 3), Square.at(4, 3)))
+    board.make_move(Move(Square.at(3, 4), Square.at(4, 3)))
+
+    # Assert
+    assert board.zobrist_key == compute_key(board)
+
+def test_transposed_positions_have_the_same_key():
+
+    # Arrange
+    board = Board.at_starting_position()
+    starting_key = board.zobrist_key
+
+    # Act
+    board.make_move(Move(Square.at(0, 6), Square.at(2, 5)))
+    board.make_move(Move(Square.at(7, 6), Square.at(5, 5)))
+    board.make_move(Move(Square.at(2, 5), Square.at(0, 6)))
+    board.make_move(Move(Square.at(5, 5), Square.at(7, 6)))
+
+    # Assert
+    assert board.zobrist_key == starting_key
+
+def test_key_depends_on_side_to_move_and_castling_rights():
+
+    # Arrange
+    board = Board.at_starting_position()
+    starting_key = board.zobrist_key
+
+    # Act
+    board.current_player = Player.BLACK
+    black_to_move_key = board.zobrist_key
+    board.current_player = Player.WHITE
+    board.set_castling_rights(BLACK_KINGSIDE | BLACK_QUEENSIDE)
+    no_white_castling_key = board.zobrist_key
+
+    # Assert
+    assert len({starting_key, black_to_move_key, no_white_castling_key}) == 3
+
+def test_unmaking_a_move_restores_the_key():
+
+    # Arrange
+    board = Board.at_starting_position()
+    starting_key = board.zobrist_key
+
+    # Act
+    board.make_move(Move(Square.at(1, 3), Square.at(3, 3)))
+    board.unmake_move()
+
+    # Assert
+    assert board.zobrist_key == starting_key